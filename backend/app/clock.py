@@ -0,0 +1,43 @@
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    """Real time: monotonic seconds for intervals, UTC wall time for timestamps."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def utcnow(self) -> datetime:
+        return datetime.utcnow()
+
+
+class ManualClock(SystemClock):
+    """
+    Clock that only moves when advanced.
+
+    Lets the controller replay weeks of a fermentation profile in seconds;
+    both readings move together, starting from `start`.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.start = start or datetime.utcnow()
+        self.elapsed = 0.0
+
+    def advance(self, seconds: float):
+        self.elapsed += seconds
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+    def utcnow(self) -> datetime:
+        return self.start + timedelta(seconds=self.elapsed)
+
+
+system_clock = SystemClock()
+
+
+# Dependency to get the current clock; override it to run the API on a ManualClock
+def get_clock() -> SystemClock:
+    return system_clock
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Literal
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,8 +7,31 @@ class Settings(BaseSettings):
     environment: Literal["development", "production"] = "development"
     debug: bool = True
     
+    # Logging
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"  # DEBUG includes every mock relay switch
+    log_format: Literal["text", "json"] = "text"  # json: one object per line for log shippers
+    log_error_repeat_interval: float = 300.0  # seconds; a repeating error is logged once per interval
+    
+    # Sampling profiler (/api/system/profiler, and ?profile=true when enabled)
+    profiler_interval: float = 0.005  # seconds between stack samples
+    profiler_max_seconds: float = 300.0  # longest profiling session allowed
+    profiler_request_enabled: bool = False  # allow ?profile=true on requests (admin token still required)
+    
     # Hardware
     hardware_mode: Literal["mock", "real"] = "mock"
+    relay_backend: Literal["rpi_gpio", "gpiod"] = "rpi_gpio"  # real mode relay driver
+    gpio_chip: str = "/dev/gpiochip0"  # gpiod backend character device
+    max_fermenters: int = 64
+    gpio_expanders: str = ""  # comma-separated MCP23017 I2C addresses, e.g. "0x20,0x21"
+    expander_i2c_bus: int = 1
+    expander_pin_base: int = 100  # relay pins from here up are on expanders, 16 per chip
+    mock_sensor_count: int = 4  # simulated DS18B20 probes in mock mode
+    simulation_time_scale: float = 1.0  # simulated seconds per real second in mock mode
+    simulation_ambient_temp: float = 20.0
+    simulation_ua_factor: float = 1.0  # heat loss to ambient, W/K per liter^(2/3)
+    simulation_exotherm_watts_per_liter: float = 0.5  # fermentation heat at its peak
+    simulation_exotherm_peak_hours: float = 36.0
+    simulation_noise: float = 0.05  # sensor noise standard deviation, degrees C
     
     # Database
     database_url: str = "sqlite:///./brewbuddy.db"
@@ -26,9 +49,58 @@ class Settings(BaseSettings):
     smtp_from: str = "brewbuddy@localhost"
     
     # Control Loop
-    control_loop_interval: int = 10
+    control_loop_interval: int = 10  # seconds between sensor reads / control decisions
     hysteresis_temp: float = 0.5
     sensor_timeout: int = 60
+    sensor_cache_ttl: float = 15.0  # API requests reuse readings younger than this
+    sensor_read_retries: int = 2  # extra attempts after a failed read, within SENSOR_READ_TIMEOUT
+    sensor_retry_delay: float = 0.1  # seconds before a retry, jittered +/-50%
+    sensor_backoff_after: int = 5  # consecutive failures before a sensor is skipped
+    sensor_backoff_max: float = 300.0  # longest a failing sensor is skipped, in seconds
+    sensor_filter_window: int = 3  # median over this many accepted samples
+    sensor_max_rate: float = 2.0  # degrees C per minute; faster changes are rejected as glitches (0 disables)
+    sensor_ema_alpha: float = 0.0  # exponential smoothing after the median (0 disables)
+    w1_base_dir: str = "/sys/bus/w1/devices/"
+    w1_bulk_read: bool = True  # convert all DS18B20s at once via therm_bulk_read when available
+    w1_bulk_read_timeout: float = 1.5  # seconds to wait for a bulk conversion
+    w1_rescan_interval: float = 30.0  # seconds between sensor directory rescans (besides inotify)
+    registry_reconcile_interval: int = 60  # seconds between active batch consistency checks
+    sensor_read_workers: int = 4  # sensors read concurrently
+    sensor_read_timeout: float = 5.0  # seconds a tick waits for slow sensors
+    
+    # Controller process
+    controller_mode: Literal["embedded", "external"] = "embedded"  # external: run app.controller_service
+    controller_lock_path: str = "/tmp/brewbuddy-controller.lock"
+    controller_socket_path: str = "/tmp/brewbuddy-controller.sock"
+    controller_shm_name: str = "brewbuddy_state"
+    controller_shm_size: int = 1048576
+    relay_stats_flush_interval: int = 300  # seconds between relay stats writes
+    
+    # Controller fleet (node agents run only the fermenters assigned to them)
+    node_id: Optional[str] = None  # set on node agents, run with app.node_agent
+    coordinator_url: str = "http://localhost:8000"  # API instance node agents report to
+    node_token: str = ""  # shared secret; node endpoints are disabled while empty
+    node_sync_interval: int = 10  # seconds between node assignment syncs
+    node_outbox_limit: int = 1000  # reading batches a node queues while the coordinator is down
+    
+    # Temperature logging
+    persist_interval: int = 30  # seconds between batched log writes
+    log_mode: Literal["fixed", "adaptive"] = "fixed"
+    log_interval: int = 10  # fixed mode: seconds between rows per batch
+    log_deadband_temp: float = 0.1  # adaptive mode: change that forces a row
+    log_max_interval: int = 300  # adaptive mode: longest gap between rows
+    
+    # PID control (used by fermenters with control_mode="pid")
+    pid_window_seconds: int = 600  # time-proportioning window
+    pid_min_on_seconds: int = 30  # shorter pulses are skipped
+    pid_default_kp: float = 0.5
+    pid_default_ki: float = 0.0002
+    pid_default_kd: float = 0.0
+    
+    # Energy
+    default_heater_watts: float = 50.0
+    default_chiller_watts: float = 120.0
+    energy_cost_per_kwh: float = 0.15
     
     # External APIs
     brewfather_api_key: str = ""
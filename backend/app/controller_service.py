@@ -0,0 +1,38 @@
+"""
+Run the temperature controller as its own process.
+
+Start the API with CONTROLLER_MODE=external so no API worker drives the
+relays itself; the workers then read live state from shared memory and
+forward batch changes here over a Unix socket. Run with:
+
+    python -m app.controller_service
+"""
+import signal
+import sys
+import threading
+from .database import init_db
+from .controllers.temperature_controller import temperature_controller
+from .logging_config import get_logger
+
+logger = get_logger("app.controller_service")  # __name__ is "__main__" under python -m
+
+
+def run_controller():
+    """Start the controller and block until SIGINT/SIGTERM."""
+    init_db()
+    
+    if not temperature_controller.start():
+        logger.error("Another controller already owns the relays, exiting")
+        sys.exit(1)
+    
+    shutdown = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: shutdown.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+    
+    logger.info("Controller service running, press Ctrl+C to stop")
+    shutdown.wait()
+    temperature_controller.stop()
+
+
+if __name__ == "__main__":
+    run_controller()
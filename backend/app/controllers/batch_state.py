@@ -0,0 +1,51 @@
+import threading
+from datetime import datetime
+from typing import Optional
+from .registry import ActiveBatchRecord
+from .strategies import create_strategy
+
+
+class BatchControlState:
+    """
+    Mutable control state for one active batch.
+
+    Each batch has its own lock so stopping or inspecting one fermenter never
+    waits on another. The record is immutable and swapped whole on refresh.
+    """
+
+    def __init__(self, record: ActiveBatchRecord):
+        self.lock = threading.Lock()
+        self.record = record
+        self.strategy = _create_strategy(record)
+        self.actual_temp: Optional[float] = None
+        self.target_temp: Optional[float] = None
+        self.control_state = "idle"
+        self.heating = False
+        self.cooling = False
+        self.last_reading_at: Optional[float] = None  # monotonic seconds
+        self.last_reading_time: Optional[datetime] = None  # wall clock, for display
+
+    def apply_record(self, record: ActiveBatchRecord):
+        """
+        Swap in a refreshed record for the same batch.
+
+        Control state survives edits that do not affect it (phases, names,
+        relay power): the strategy is only rebuilt when its settings change,
+        and readings are only dropped when the sensor changes.
+        """
+        old = self.record
+        self.record = record
+        if _control_settings(old) != _control_settings(record):
+            self.strategy = _create_strategy(record)
+        if old.sensor_id != record.sensor_id:
+            self.actual_temp = None
+            self.last_reading_at = None
+            self.last_reading_time = None
+
+
+def _control_settings(record: ActiveBatchRecord) -> tuple:
+    return record.control_mode, record.pid_kp, record.pid_ki, record.pid_kd
+
+
+def _create_strategy(record: ActiveBatchRecord):
+    return create_strategy(record.control_mode, record.pid_kp, record.pid_ki, record.pid_kd)
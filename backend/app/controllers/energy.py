@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, Optional
+from ..config import settings
+from ..clock import system_clock
+
+
+class EnergyAccumulator:
+    """Integrates relay on-time into running per-batch energy and cost totals."""
+
+    def __init__(self, clock=system_clock):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.batches: Dict[int, dict] = {}  # batch_id -> running totals
+
+    def start_batch(self, batch_id: int, energy_wh: float = 0.0):
+        """Begin tracking a batch, seeded with energy already recorded for it."""
+        with self.lock:
+            self.batches[batch_id] = {
+                'energy_wh': energy_wh,
+                'pending_wh': 0.0,  # not yet attached to a log row
+                'heating': False,
+                'cooling': False,
+                'last_update': None,
+            }
+
+    def is_tracking(self, batch_id: int) -> bool:
+        """Check whether a batch is being tracked."""
+        with self.lock:
+            return batch_id in self.batches
+
+    def integrate(
+        self,
+        batch_id: int,
+        heater_watts: float,
+        chiller_watts: float,
+        heating: bool,
+        cooling: bool
+    ) -> float:
+        """
+        Account for the energy used since the last update and record the new relay state.
+
+        The interval since the previous call is charged at the relay state that
+        was held during it, so this must be called on every relay command.
+        """
+        now = self.clock.monotonic()
+
+        with self.lock:
+            entry = self.batches.get(batch_id)
+            if entry is None:
+                return 0.0
+
+            energy_wh = 0.0
+            if entry['last_update'] is not None:
+                elapsed_hours = (now - entry['last_update']) / 3600
+                if entry['heating']:
+                    energy_wh += heater_watts * elapsed_hours
+                if entry['cooling']:
+                    energy_wh += chiller_watts * elapsed_hours
+
+            entry['energy_wh'] += energy_wh
+            entry['pending_wh'] += energy_wh
+            entry['heating'] = heating
+            entry['cooling'] = cooling
+            entry['last_update'] = now
+            return energy_wh
+
+    def take_pending(self, batch_id: int) -> float:
+        """Return and reset the energy accumulated since the last log row."""
+        with self.lock:
+            entry = self.batches.get(batch_id)
+            if entry is None:
+                return 0.0
+            pending = entry['pending_wh']
+            entry['pending_wh'] = 0.0
+            return pending
+
+    def get_totals(self, batch_id: int) -> Optional[dict]:
+        """Get running energy and cost for a batch, or None if not tracked."""
+        with self.lock:
+            entry = self.batches.get(batch_id)
+            if entry is None:
+                return None
+            energy_wh = entry['energy_wh']
+
+        return {
+            'energy_wh': round(energy_wh, 3),
+            'cost': round(energy_cost(energy_wh), 4),
+        }
+
+    def get_all_totals(self) -> Dict[int, dict]:
+        """Get running totals for every tracked batch."""
+        with self.lock:
+            batch_ids = list(self.batches.keys())
+        return {batch_id: self.get_totals(batch_id) for batch_id in batch_ids}
+
+    def stop_batch(self, batch_id: int) -> Optional[dict]:
+        """Stop tracking a batch and return its final totals."""
+        totals = self.get_totals(batch_id)
+        with self.lock:
+            self.batches.pop(batch_id, None)
+        return totals
+
+
+def energy_cost(energy_wh: float) -> float:
+    """Convert watt-hours to cost using the configured tariff."""
+    return energy_wh / 1000 * settings.energy_cost_per_kwh
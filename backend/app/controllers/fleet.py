@@ -0,0 +1,249 @@
+"""
+Controller fleet: node agents that each drive the fermenters assigned to them.
+
+- CoordinatorStore: the controller store used on a node agent. Assignments are
+  pulled from the coordinator (the central API instance) on a fixed interval,
+  and buffered logs/counters are pushed back as gzip-compressed JSON batches,
+  both from a background thread off the control loop.
+- NodeLiveState: the coordinator's in-memory view of what each node reported
+  on its last sync, merged into the controller's live state.
+"""
+import gzip
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+import httpx
+from ..config import settings
+from ..logging_config import get_logger
+from .registry import ActiveBatchRegistry, record_from_dict
+
+logger = get_logger(__name__)
+
+
+def encode_payload(data: dict) -> bytes:
+    """Serialize and compress a fleet message."""
+    return gzip.compress(json.dumps(data, separators=(",", ":"), default=_json_default).encode())
+
+
+def decode_payload(body: bytes, content_encoding: Optional[str]) -> dict:
+    """Inverse of encode_payload; also accepts uncompressed bodies."""
+    if content_encoding == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body) if body else {}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class CoordinatorStore:
+    """
+    Controller store that talks to the coordinator instead of a database.
+
+    All coordinator traffic runs on one background thread, so a slow or
+    unreachable coordinator never holds up the control loop. From the tick,
+    reconcile() only wakes that thread, load_energy() returns a value it
+    fetched with the assignments, and the save_* methods queue a payload.
+    Queued payloads stay queued until the coordinator accepts them.
+    """
+
+    def __init__(self, node_id: str, base_url: str, token: str, status: Callable[[], dict]):
+        self.node_id = node_id
+        self.status = status  # called on each sync to report live state
+        self.prefix = f"/api/nodes/{node_id}"
+        self.client = httpx.Client(
+            base_url=base_url,
+            headers={
+                "X-Node-Token": token,
+                "Content-Encoding": "gzip",
+                "Content-Type": "application/json",
+            },
+            timeout=10.0
+        )
+        self.registry: Optional[ActiveBatchRegistry] = None
+        self.energy_wh: Dict[int, float] = {}  # batch_id -> energy the coordinator has logged
+        self.lock = threading.Lock()
+        self.outbox: Deque[dict] = deque()  # payloads for /readings, oldest first
+        self.sync_requested = False
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def reconcile_interval(self) -> float:
+        return settings.node_sync_interval
+
+    def _post(self, path: str, data: dict) -> dict:
+        response = self.client.post(self.prefix + path, content=encode_payload(data))
+        response.raise_for_status()
+        return response.json()
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="coordinator-sync", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.wake.wait()
+            self.wake.clear()
+            if self.stop_event.is_set():
+                break
+            with self.lock:
+                sync, self.sync_requested = self.sync_requested, False
+            if sync:
+                self.sync(self.registry)
+            self.push()
+
+    def reconcile(self, registry: ActiveBatchRegistry):
+        """Ask the sync thread to report live state and pick up this node's batch assignments."""
+        # Counts as reconciled now: the tick must not ask again while a sync is in flight
+        registry.mark_reconciled()
+        with self.lock:
+            self.registry = registry
+            self.sync_requested = True
+        self._start()
+        self.wake.set()
+
+    def refresh(self, registry: ActiveBatchRegistry, kind: str, entity_id: int):
+        """Node agents have no local change notifications; resync everything."""
+        self.reconcile(registry)
+
+    def sync(self, registry: ActiveBatchRegistry):
+        """One sync with the coordinator; runs on the sync thread."""
+        try:
+            result = self._post("/sync", self.status())
+        except Exception as e:
+            # Keep controlling with the last known assignments until the coordinator is back
+            logger.warning("Node sync with coordinator failed: %s", e)
+            return
+
+        # Energy first: the controller seeds new batches from it once they appear in the registry
+        self.energy_wh = {int(batch_id): wh for batch_id, wh in result.get('energy', {}).items()}
+        registry.replace_all({
+            data['batch_id']: record_from_dict(data)
+            for data in result.get('records', [])
+        })
+
+    def push(self) -> bool:
+        """Send queued payloads in order; returns False if some are left for a later attempt."""
+        while True:
+            with self.lock:
+                if not self.outbox:
+                    return True
+                payload = self.outbox[0]
+            try:
+                self._post("/readings", payload)
+            except Exception as e:
+                logger.warning("Pushing readings to coordinator failed, %d batch(es) queued: %s", len(self.outbox), e)
+                return False
+            with self.lock:
+                self.outbox.popleft()
+
+    def _queue(self, payload: dict):
+        with self.lock:
+            self.outbox.append(payload)
+            if len(self.outbox) > settings.node_outbox_limit:
+                self.outbox.popleft()
+                logger.error("Coordinator unreachable for too long, dropped the oldest queued readings")
+        self._start()
+        self.wake.set()
+
+    def load_relay_pins(self) -> List[int]:
+        """Relay pins of every fermenter assigned to this node."""
+        response = self.client.get(f"{self.prefix}/pins")
+        response.raise_for_status()
+        return response.json().get('pins', [])
+
+    def load_energy(self, batch_id: int) -> float:
+        """Energy the coordinator has already recorded for a batch, as of the last sync."""
+        return self.energy_wh.get(batch_id, 0.0)
+
+    def save_energy_costs(self, costs: Dict[int, float]):
+        if costs:
+            self._queue({'energy_costs': costs})
+
+    def save_logs(self, rows: List[dict]):
+        self._queue({'logs': rows})
+
+    def save_relay_stats(self, pending: Dict[int, tuple]):
+        self._queue({'relay_stats': pending})
+
+    def close(self):
+        """Stop the sync thread and make a last attempt to deliver queued readings."""
+        self.stop_event.set()
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=15)
+            self.thread = None
+        if not self.push():
+            logger.error("Exiting with %d batch(es) of readings not delivered to the coordinator", len(self.outbox))
+        self.client.close()
+
+
+class NodeLiveState:
+    """Latest live state reported by each node, kept in memory on the coordinator."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.nodes: Dict[str, dict] = {}  # node_id -> last report
+
+    def update(self, node_id: str, status: dict):
+        with self.lock:
+            self.nodes[node_id] = {
+                'received_at': time.monotonic(),
+                'batches': status.get('batches', []),
+                'energy': status.get('energy', {}),
+                'loop': status.get('loop', {}),
+            }
+
+    def _fresh(self) -> List[tuple]:
+        """(age, report) for nodes heard from within three sync intervals."""
+        now = time.monotonic()
+        max_age = settings.node_sync_interval * 3
+        with self.lock:
+            reports = list(self.nodes.values())
+        return [
+            (now - report['received_at'], report)
+            for report in reports
+            if now - report['received_at'] <= max_age
+        ]
+
+    def get_batches(self) -> List[dict]:
+        """Live batch entries from all reachable nodes, with sensor ages brought up to date."""
+        result = []
+        for age, report in self._fresh():
+            for entry in report['batches']:
+                item = dict(entry)
+                if item.get('sensor_age_seconds') is not None:
+                    item['sensor_age_seconds'] = round(item['sensor_age_seconds'] + age, 1)
+                result.append(item)
+        return result
+
+    def get_energy(self, batch_id: int) -> Optional[dict]:
+        for _, report in self._fresh():
+            totals = report['energy'].get(str(batch_id))
+            if totals:
+                return totals
+        return None
+
+    def get_node(self, node_id: str) -> Optional[dict]:
+        """Last report from one node, with its age in seconds."""
+        with self.lock:
+            report = self.nodes.get(node_id)
+        if report is None:
+            return None
+        return {
+            'age_seconds': round(time.monotonic() - report['received_at'], 1),
+            'batches': len(report['batches']),
+            'loop': report['loop'],
+        }
+
+
+# Reports received by this API process
+node_live_state = NodeLiveState()
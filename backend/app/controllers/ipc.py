@@ -0,0 +1,241 @@
+"""
+Inter-process plumbing for running the controller outside the API process.
+
+- LeaderLock: an exclusive file lock so only one process drives the relays.
+- SharedStateWriter/Reader: the controller's live state in a shared memory
+  segment, guarded by a sequence counter so readers never see a torn write,
+  and stamped with its publish time so readers notice a dead controller.
+- NotificationListener/send_notification: API workers tell the controller
+  about batch/fermenter/profile changes over a Unix datagram socket.
+"""
+import os
+import json
+import time
+import fcntl
+import socket
+import struct
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# POSIX shared memory segments appear here as files (Linux)
+SHM_DIR = "/dev/shm"
+
+# Segment layout: sequence counter (odd while writing), payload length, JSON payload
+HEADER = struct.Struct("<QI")
+LENGTH = struct.Struct("<I")
+
+
+class LeaderLock:
+    """Exclusive, non-blocking file lock held for the life of the controller."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """Try to become the leader. Returns False if another process holds the lock."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+    def release(self):
+        """Give up leadership."""
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+
+
+class SharedStateWriter:
+    """Publishes JSON state into a named shared memory segment."""
+
+    def __init__(self, name: str, size: int):
+        try:
+            # New segments are zero-filled: sequence 0, nothing published yet
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.sequence = 0
+        except FileExistsError:
+            # Left behind by a previous controller that did not shut down cleanly.
+            # Continue past its sequence: starting over could repeat a number a
+            # reader saw before this write, and that reader would accept a torn
+            # state. Odd hides the stale state until the first publish.
+            self.shm = shared_memory.SharedMemory(name=name)
+            previous = HEADER.unpack_from(self.shm.buf, 0)[0]
+            self.sequence = previous + 2 - previous % 2
+            self._write_header(self.sequence + 1, 0)
+
+    def _write_sequence(self, sequence: int):
+        # One 8-byte copy; struct.pack_into zeroes a field before filling it in
+        self.shm.buf[:8] = sequence.to_bytes(8, "little")
+
+    def _write_header(self, sequence: int, length: int):
+        """Mark a write in progress (odd sequence), then set the payload length while readers are held off."""
+        self._write_sequence(sequence)
+        LENGTH.pack_into(self.shm.buf, 8, length)
+
+    def publish(self, state: dict) -> bool:
+        """Write a new state, stamped with published_at. Returns False if it does not fit in the segment."""
+        # CLOCK_MONOTONIC is system-wide, so readers in other processes can compare it
+        payload = json.dumps({**state, 'published_at': time.monotonic()}, separators=(",", ":")).encode()
+        if HEADER.size + len(payload) > self.shm.size:
+            return False
+
+        self.sequence += 1  # odd: write in progress
+        self._write_header(self.sequence, len(payload))
+        self.shm.buf[HEADER.size:HEADER.size + len(payload)] = payload
+        self.sequence += 1  # even: stable
+        self._write_sequence(self.sequence)
+        return True
+
+    def close(self):
+        """Close and remove the segment."""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedStateReader:
+    """
+    Reads the latest state published by a SharedStateWriter in another process.
+
+    A restarted controller publishes into a new segment while the old one
+    stays mapped here, unlinked, with its last state. So before each read
+    the reader checks that its mapping is still the segment under that
+    name, and attaches again if not.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.path = os.path.join(SHM_DIR, name.lstrip("/"))
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.inode: Optional[int] = None
+
+    def _attach(self) -> bool:
+        if self.shm is not None:
+            return True
+        try:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        self.inode = os.fstat(self.shm._fd).st_ino
+        # Readers must not unlink the writer's segment when they exit
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        return True
+
+    def _is_current(self) -> bool:
+        """Whether the mapped segment is still the one linked under this name."""
+        try:
+            return os.stat(self.path).st_ino == self.inode
+        except OSError:
+            return False
+
+    def _detach(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def read(self, retries: int = 5, max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        Return the latest consistent state, or None if none is available.
+
+        States published more than max_age seconds ago count as unavailable.
+        """
+        if self.shm is not None and not self._is_current():
+            self._detach()
+        if not self._attach():
+            return None
+        state = self._read_segment(retries)
+        if state is None:
+            return None
+        if max_age is not None and time.monotonic() - state.get('published_at', 0.0) > max_age:
+            return None
+        return state
+
+    def _read_segment(self, retries: int) -> Optional[dict]:
+        buf = self.shm.buf
+        for _ in range(retries):
+            sequence, length = HEADER.unpack_from(buf, 0)
+            if sequence == 0:
+                return None
+            if sequence % 2:
+                # Writer is mid-update
+                time.sleep(0.001)
+                continue
+
+            payload = bytes(buf[HEADER.size:HEADER.size + length])
+            if HEADER.unpack_from(buf, 0)[0] != sequence:
+                continue
+            return json.loads(payload)
+        return None
+
+
+class NotificationListener:
+    """Receives change notifications from API processes on a Unix datagram socket."""
+
+    def __init__(self, path: str, handler: Callable[..., None]):
+        self.path = path
+        self.handler = handler
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.sock: Optional[socket.socket] = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.settimeout(1.0)
+        self.running = True
+        self.thread = threading.Thread(target=self._listen, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _listen(self):
+        while self.running:
+            try:
+                data = self.sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            try:
+                message = json.loads(data)
+                self.handler(message["kind"], int(message["id"]), message.get("value"))
+            except Exception as e:
+                logger.error("Error handling controller notification: %s", e, exc_info=True)
+
+
+def send_notification(path: str, kind: str, entity_id: int, value=None) -> bool:
+    """Best-effort notification to the controller process. Returns False if it is not listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(json.dumps({"kind": kind, "id": entity_id, "value": value}).encode(), path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
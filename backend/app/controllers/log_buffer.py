@@ -0,0 +1,108 @@
+import threading
+from typing import Dict, List
+from ..config import settings
+from ..clock import system_clock
+
+
+class LogSampler:
+    """Decides which control ticks are worth storing as TemperatureLog rows."""
+
+    def __init__(self):
+        self.last_logged: Dict[int, dict] = {}  # batch_id -> last stored sample
+
+    def should_log(
+        self,
+        batch_id: int,
+        actual_temp: float,
+        target_temp: float,
+        control_state: str,
+        now: float
+    ) -> bool:
+        """Check a sample against the configured logging mode. `now` is monotonic seconds."""
+        last = self.last_logged.get(batch_id)
+        if last is None:
+            return True
+
+        elapsed = now - last['time']
+
+        if settings.log_mode == "adaptive":
+            # Store only what changes the shape of the chart
+            if control_state != last['control_state'] or target_temp != last['target_temp']:
+                return True
+            if abs(actual_temp - last['actual_temp']) > settings.log_deadband_temp:
+                return True
+            return elapsed >= settings.log_max_interval
+
+        return elapsed >= settings.log_interval
+
+    def mark_logged(
+        self,
+        batch_id: int,
+        actual_temp: float,
+        target_temp: float,
+        control_state: str,
+        now: float
+    ):
+        """Remember the sample that was stored."""
+        self.last_logged[batch_id] = {
+            'actual_temp': actual_temp,
+            'target_temp': target_temp,
+            'control_state': control_state,
+            'time': now,
+        }
+
+    def forget(self, batch_id: int):
+        """Drop sampling state for a batch that is no longer active."""
+        self.last_logged.pop(batch_id, None)
+
+
+class LogBuffer:
+    """Buffers TemperatureLog rows in memory until the next batched write."""
+
+    def __init__(self, clock=system_clock):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.rows: List[dict] = []
+        self.last_flush = clock.monotonic()
+
+    def add(
+        self,
+        batch_id: int,
+        actual_temp: float,
+        target_temp: float,
+        control_state: str,
+        power_consumed_wh: float
+    ):
+        """Queue a row, stamped now rather than at commit time."""
+        row = {
+            'batch_id': batch_id,
+            'timestamp': self.clock.utcnow(),
+            'actual_temp': actual_temp,
+            'target_temp': target_temp,
+            'control_state': control_state,
+            'power_consumed_wh': power_consumed_wh,
+        }
+        with self.lock:
+            self.rows.append(row)
+
+    def pending_count(self) -> int:
+        """Number of rows waiting to be written."""
+        with self.lock:
+            return len(self.rows)
+
+    def flush_due(self, interval: float) -> bool:
+        """Check whether the persistence interval has elapsed."""
+        return self.clock.monotonic() - self.last_flush >= interval
+
+    def take(self) -> List[dict]:
+        """Remove and return all buffered rows."""
+        with self.lock:
+            rows = self.rows
+            self.rows = []
+            self.last_flush = self.clock.monotonic()
+        return rows
+
+    def restore(self, rows: List[dict]):
+        """Put back rows that failed to persist, ahead of anything newer."""
+        with self.lock:
+            self.rows = rows + self.rows
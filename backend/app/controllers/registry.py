@@ -0,0 +1,252 @@
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from ..models import Batch, Fermenter, ProfilePhase
+from ..config import settings
+from ..clock import system_clock
+
+
+@dataclass(frozen=True)
+class PhaseRecord:
+    """One step of a fermentation profile."""
+    duration_hours: float
+    target_temp: float
+
+
+@dataclass(frozen=True)
+class ActiveBatchRecord:
+    """Immutable snapshot of everything the controller needs for one active batch."""
+    batch_id: int
+    batch_number: str
+    profile_id: int
+    fermenter_id: int
+    sensor_id: str
+    heater_gpio: int
+    chiller_gpio: int
+    size_liters: float
+    heater_watts: float
+    chiller_watts: float
+    control_mode: str
+    pid_kp: Optional[float]
+    pid_ki: Optional[float]
+    pid_kd: Optional[float]
+    start_time: Optional[datetime]
+    phases: tuple[PhaseRecord, ...]
+
+    def elapsed_hours(self, now: datetime) -> Optional[float]:
+        """Hours since the batch started, or None if it has no start time."""
+        if not self.start_time:
+            return None
+        return (now - self.start_time).total_seconds() / 3600
+
+    def current_phase(self, now: datetime) -> tuple[Optional[int], float]:
+        """Return (phase index, percent progress through that phase)."""
+        elapsed_hours = self.elapsed_hours(now)
+        if elapsed_hours is None or not self.phases:
+            return None, 0
+
+        cumulative_hours = 0
+        for i, phase in enumerate(self.phases):
+            if phase.duration_hours <= 0:
+                continue  # zero-length phases are over as soon as they start
+            phase_end = cumulative_hours + phase.duration_hours
+            if elapsed_hours <= phase_end:
+                phase_progress = ((elapsed_hours - cumulative_hours) / phase.duration_hours) * 100
+                return i, min(100, max(0, phase_progress))
+            cumulative_hours = phase_end
+
+        # Past all phases
+        return len(self.phases) - 1, 100
+
+    def target_temperature(self, now: datetime) -> Optional[float]:
+        """Target temperature for the current phase."""
+        phase_index, _ = self.current_phase(now)
+        if phase_index is None:
+            return None
+        return self.phases[phase_index].target_temp
+
+
+def build_record(batch: Batch, fermenter: Fermenter, phases: list[ProfilePhase]) -> ActiveBatchRecord:
+    """Copy the ORM state the controller needs into an immutable record."""
+    return ActiveBatchRecord(
+        batch_id=batch.id,
+        batch_number=batch.batch_number,
+        profile_id=batch.profile_id,
+        fermenter_id=fermenter.id,
+        sensor_id=fermenter.sensor_id,
+        heater_gpio=fermenter.heater_gpio,
+        chiller_gpio=fermenter.chiller_gpio,
+        size_liters=fermenter.size_liters,
+        heater_watts=fermenter.heater_watts or settings.default_heater_watts,
+        chiller_watts=fermenter.chiller_watts or settings.default_chiller_watts,
+        control_mode=fermenter.control_mode or "hysteresis",
+        pid_kp=fermenter.pid_kp,
+        pid_ki=fermenter.pid_ki,
+        pid_kd=fermenter.pid_kd,
+        start_time=batch.start_time,
+        phases=tuple(
+            PhaseRecord(duration_hours=phase.duration_hours, target_temp=phase.target_temp_celsius)
+            for phase in phases
+        ),
+    )
+
+
+def record_to_dict(record: ActiveBatchRecord) -> dict:
+    """JSON-safe form of a record, for shipping to node agents."""
+    data = asdict(record)
+    data['start_time'] = record.start_time.isoformat() if record.start_time else None
+    return data
+
+
+def record_from_dict(data: dict) -> ActiveBatchRecord:
+    """Rebuild a record produced by record_to_dict."""
+    data = dict(data)
+    data['start_time'] = datetime.fromisoformat(data['start_time']) if data['start_time'] else None
+    data['phases'] = tuple(PhaseRecord(**phase) for phase in data['phases'])
+    return ActiveBatchRecord(**data)
+
+
+def load_record(db: Session, batch_id: int, node_id: Optional[str] = None) -> Optional[ActiveBatchRecord]:
+    """Load a record for a batch, or None if it is not active on the given node."""
+    batch = db.query(Batch).filter(Batch.id == batch_id, Batch.status == "active").first()
+    if not batch:
+        return None
+
+    fermenter = db.query(Fermenter).filter(
+        Fermenter.id == batch.fermenter_id,
+        Fermenter.node_id == node_id
+    ).first()
+    if not fermenter:
+        return None
+
+    phases = db.query(ProfilePhase).filter(
+        ProfilePhase.profile_id == batch.profile_id
+    ).order_by(ProfilePhase.sequence_order).all()
+
+    return build_record(batch, fermenter, phases)
+
+
+def load_records(db: Session, node_id: Optional[str] = None) -> Dict[int, ActiveBatchRecord]:
+    """Load records for every active batch on the given node."""
+    batch_ids = _active_batch_ids(db, node_id)
+    records = {}
+    for batch_id in batch_ids:
+        record = load_record(db, batch_id, node_id)
+        if record:
+            records[batch_id] = record
+    return records
+
+
+def _active_batch_ids(db: Session, node_id: Optional[str]) -> set:
+    rows = db.query(Batch.id).join(Fermenter, Fermenter.id == Batch.fermenter_id).filter(
+        Batch.status == "active",
+        Fermenter.node_id == node_id
+    ).all()
+    return set(batch_id for (batch_id,) in rows)
+
+
+class ActiveBatchRegistry:
+    """
+    Copy-on-write map of active batch records.
+
+    Writers replace the whole dict under a lock; readers just take a reference
+    to the current dict, which is never mutated afterwards.
+    """
+
+    def __init__(self, clock=system_clock):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.records: Dict[int, ActiveBatchRecord] = {}
+        self.version = 0  # bumped on every change, used to discard stale reconciles
+        self.last_reconcile: Optional[float] = None
+
+    def snapshot(self) -> Dict[int, ActiveBatchRecord]:
+        """Current records. The returned dict must not be modified."""
+        return self.records
+
+    def _replace(self, batch_id: int, record: Optional[ActiveBatchRecord]):
+        with self.lock:
+            if self.records.get(batch_id) == record:
+                return  # unchanged: keep the current record so control state is not reset
+            records = dict(self.records)
+            if record is None:
+                records.pop(batch_id, None)
+            else:
+                records[batch_id] = record
+            self.records = records
+            self.version += 1
+
+    def replace_all(self, records: Dict[int, ActiveBatchRecord]):
+        """
+        Swap in a full set of records fetched elsewhere (node agents).
+
+        Unchanged records keep their identity so control state is not reset.
+        """
+        self.mark_reconciled()
+        with self.lock:
+            current = self.records
+            merged = {
+                batch_id: current[batch_id] if current.get(batch_id) == record else record
+                for batch_id, record in records.items()
+            }
+            if merged.keys() == current.keys() and all(merged[i] is current[i] for i in merged):
+                return
+            self.records = merged
+            self.version += 1
+
+    def refresh_batch(self, db: Session, batch_id: int):
+        """Reload one batch after it was started, stopped or edited."""
+        self._replace(batch_id, load_record(db, batch_id))
+
+    def refresh_fermenter(self, db: Session, fermenter_id: int):
+        """Reload any active batch running on a fermenter."""
+        for batch_id, record in self.records.items():
+            if record.fermenter_id == fermenter_id:
+                self.refresh_batch(db, batch_id)
+
+    def refresh_profile(self, db: Session, profile_id: int):
+        """Reload any active batch following a profile."""
+        for batch_id, record in self.records.items():
+            if record.profile_id == profile_id:
+                self.refresh_batch(db, batch_id)
+
+    def mark_reconciled(self):
+        """Start the reconcile interval over, also after a pass that could not run."""
+        self.last_reconcile = self.clock.monotonic()
+
+    def reconcile_due(self, interval: float) -> bool:
+        """Check whether a reconciliation pass is due."""
+        return self.last_reconcile is None or self.clock.monotonic() - self.last_reconcile >= interval
+
+    def reconcile(self, db: Session):
+        """
+        Catch changes made without a notification (other processes, direct DB edits).
+
+        Only batch ids are queried; full records are loaded just for new batches.
+        Batches on fermenters assigned to a node agent are left to that node.
+        """
+        version = self.version
+        active_ids = _active_batch_ids(db, None)
+        self.mark_reconciled()
+
+        current = self.records
+        added = {}
+        for batch_id in active_ids - set(current.keys()):
+            record = load_record(db, batch_id)
+            if record:
+                added[batch_id] = record
+
+        removed = set(current.keys()) - active_ids
+        if not added and not removed:
+            return
+
+        with self.lock:
+            if self.version != version:
+                # A notification landed while we were querying; it is newer than our view
+                return
+            records = {batch_id: record for batch_id, record in self.records.items() if batch_id not in removed}
+            records.update(added)
+            self.records = records
+            self.version += 1
@@ -0,0 +1,99 @@
+import threading
+from typing import Dict
+from ..clock import system_clock
+from ..metrics import RELAY_TRANSITIONS
+
+
+class RelayStatsTracker:
+    """Counts relay transitions and on-time in memory until the next batched write."""
+
+    def __init__(self, clock=system_clock):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.relays: Dict[int, dict] = {}  # gpio_pin -> counters
+        self.last_flush = clock.monotonic()
+
+    def record(self, fermenter_id: int, gpio_pin: int, relay_type: str, is_on: bool):
+        """Record the commanded state of a relay for this tick."""
+        now = self.clock.monotonic()
+
+        with self.lock:
+            relay = self.relays.get(gpio_pin)
+            if relay is None:
+                # Relays start de-energized, so a first observation of "on" is a cycle
+                relay = {
+                    'fermenter_id': fermenter_id,
+                    'relay_type': relay_type,
+                    'is_on': False,
+                    'since': now,
+                    'pending_cycles': 0,
+                    'pending_on_seconds': 0.0,
+                }
+                self.relays[gpio_pin] = relay
+
+            if relay['is_on']:
+                relay['pending_on_seconds'] += now - relay['since']
+            elif is_on:
+                relay['pending_cycles'] += 1
+            if is_on != relay['is_on']:
+                RELAY_TRANSITIONS.labels(relay_type, "on" if is_on else "off").inc()
+
+            relay['fermenter_id'] = fermenter_id
+            relay['relay_type'] = relay_type
+            relay['is_on'] = is_on
+            relay['since'] = now
+
+    def get_pending(self, gpio_pin: int) -> dict:
+        """Get counters accumulated since the last flush."""
+        now = self.clock.monotonic()
+
+        with self.lock:
+            relay = self.relays.get(gpio_pin)
+            if relay is None:
+                return {'cycles': 0, 'on_seconds': 0.0}
+
+            on_seconds = relay['pending_on_seconds']
+            if relay['is_on']:
+                on_seconds += now - relay['since']
+            return {'cycles': relay['pending_cycles'], 'on_seconds': on_seconds}
+
+    def flush_due(self, interval: float) -> bool:
+        """Check whether the flush interval has elapsed."""
+        return self.clock.monotonic() - self.last_flush >= interval
+
+    def take_pending(self) -> Dict[int, tuple]:
+        """
+        Remove and return counters accumulated since the last flush.
+
+        Returns gpio_pin -> (fermenter_id, relay_type, cycles, on_seconds).
+        """
+        now = self.clock.monotonic()
+
+        pending = {}
+        with self.lock:
+            for gpio_pin, relay in self.relays.items():
+                on_seconds = relay['pending_on_seconds']
+                if relay['is_on']:
+                    on_seconds += now - relay['since']
+                    relay['since'] = now
+
+                if relay['pending_cycles'] or on_seconds:
+                    pending[gpio_pin] = (
+                        relay['fermenter_id'],
+                        relay['relay_type'],
+                        relay['pending_cycles'],
+                        on_seconds,
+                    )
+                relay['pending_cycles'] = 0
+                relay['pending_on_seconds'] = 0.0
+            self.last_flush = now
+        return pending
+
+    def restore(self, pending: Dict[int, tuple]):
+        """Put back counters that failed to persist so the next flush retries them."""
+        with self.lock:
+            for gpio_pin, (_, _, cycles, on_seconds) in pending.items():
+                relay = self.relays.get(gpio_pin)
+                if relay is not None:
+                    relay['pending_cycles'] += cycles
+                    relay['pending_on_seconds'] += on_seconds
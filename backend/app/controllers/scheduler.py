@@ -0,0 +1,101 @@
+import math
+import threading
+from typing import Optional
+from ..clock import system_clock
+
+
+class TickScheduler:
+    """
+    Fixed-rate scheduler on the monotonic clock.
+
+    Ticks are aimed at absolute deadlines (start + n * interval), so processing
+    time does not stretch the period. If a tick runs past one or more
+    deadlines, the missed ticks are skipped rather than run back to back.
+    """
+
+    def __init__(self, interval: float, clock=system_clock):
+        self.interval = interval
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.next_deadline: Optional[float] = None
+        self.tick_started: Optional[float] = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.last_jitter = 0.0
+        self.max_jitter = 0.0
+        self.jitter_sum = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.duration_sum = 0.0
+
+    def start(self):
+        """Arm the scheduler so the first tick fires immediately."""
+        self.stop_event.clear()
+        with self.lock:
+            self._reset_stats()
+        self.next_deadline = self.clock.monotonic()
+
+    def stop(self):
+        """Wake a waiting loop and make it exit."""
+        self.stop_event.set()
+
+    def wait_for_tick(self) -> bool:
+        """Block until the next deadline. Returns False once stopped."""
+        delay = self.next_deadline - self.clock.monotonic()
+        if delay > 0 and self.stop_event.wait(delay):
+            return False
+        if self.stop_event.is_set():
+            return False
+
+        now = self.clock.monotonic()
+        jitter = now - self.next_deadline
+        with self.lock:
+            self.ticks += 1
+            self.last_jitter = jitter
+            self.max_jitter = max(self.max_jitter, jitter)
+            self.jitter_sum += jitter
+        self.tick_started = now
+        return True
+
+    def end_tick(self) -> int:
+        """Record the tick's duration and schedule the next one. Returns ticks skipped."""
+        now = self.clock.monotonic()
+        duration = now - self.tick_started
+        self.next_deadline += self.interval
+
+        skipped = 0
+        if now >= self.next_deadline:
+            # Overran at least one deadline; jump to the next one still in the future
+            skipped = math.floor((now - self.next_deadline) / self.interval) + 1
+            self.next_deadline += skipped * self.interval
+
+        with self.lock:
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration, duration)
+            self.duration_sum += duration
+            if skipped:
+                self.overruns += 1
+                self.skipped_ticks += skipped
+        return skipped
+
+    def get_stats(self) -> dict:
+        """Get jitter and overrun statistics for monitoring."""
+        with self.lock:
+            ticks = self.ticks
+            return {
+                "interval_seconds": self.interval,
+                "ticks": ticks,
+                "overruns": self.overruns,
+                "skipped_ticks": self.skipped_ticks,
+                "last_jitter_ms": round(self.last_jitter * 1000, 3),
+                "max_jitter_ms": round(self.max_jitter * 1000, 3),
+                "mean_jitter_ms": round(self.jitter_sum / ticks * 1000, 3) if ticks else 0.0,
+                "last_duration_ms": round(self.last_duration * 1000, 3),
+                "max_duration_ms": round(self.max_duration * 1000, 3),
+                "mean_duration_ms": round(self.duration_sum / ticks * 1000, 3) if ticks else 0.0,
+            }
@@ -0,0 +1,133 @@
+from typing import Dict, List
+from sqlalchemy import func
+from ..database import SessionLocal
+from ..models import Batch, Fermenter, RelayStats, TemperatureLog
+from ..config import settings
+from .registry import ActiveBatchRegistry
+
+
+class DatabaseStore:
+    """Loads active batches from and persists controller output to the local database."""
+
+    @property
+    def reconcile_interval(self) -> float:
+        return settings.registry_reconcile_interval
+
+    def reconcile(self, registry: ActiveBatchRegistry):
+        """Sync the registry with the batches this controller owns."""
+        db = SessionLocal()
+        try:
+            registry.reconcile(db)
+        finally:
+            db.close()
+
+    def refresh(self, registry: ActiveBatchRegistry, kind: str, entity_id: int):
+        """Reload registry records after a change notification."""
+        db = SessionLocal()
+        try:
+            if kind == "batch":
+                registry.refresh_batch(db, entity_id)
+            elif kind == "fermenter":
+                registry.refresh_fermenter(db, entity_id)
+            elif kind == "profile":
+                registry.refresh_profile(db, entity_id)
+        finally:
+            db.close()
+
+    def load_relay_pins(self) -> List[int]:
+        """Relay pins of every fermenter this controller drives."""
+        db = SessionLocal()
+        try:
+            rows = db.query(Fermenter.heater_gpio, Fermenter.chiller_gpio).filter(
+                Fermenter.node_id.is_(None)
+            ).all()
+            return [gpio_pin for row in rows for gpio_pin in row]
+        finally:
+            db.close()
+
+    def load_energy(self, batch_id: int) -> float:
+        """Energy already recorded for a batch, used to seed its running total."""
+        db = SessionLocal()
+        try:
+            logged_wh = db.query(func.sum(TemperatureLog.power_consumed_wh)).filter(
+                TemperatureLog.batch_id == batch_id
+            ).scalar()
+            return logged_wh or 0.0
+        finally:
+            db.close()
+
+    def save_energy_costs(self, costs: Dict[int, float]):
+        """Write running energy costs onto their batches."""
+        if not costs:
+            return
+        db = SessionLocal()
+        try:
+            for batch in db.query(Batch).filter(Batch.id.in_(costs.keys())).all():
+                batch.cost_energy = costs[batch.id]
+            db.commit()
+        finally:
+            db.close()
+
+    def save_logs(self, rows: List[dict]):
+        """Insert buffered TemperatureLog rows in a single commit."""
+        db = SessionLocal()
+        try:
+            # Drop rows for batches deleted since they were queued
+            batch_ids = set(row['batch_id'] for row in rows)
+            existing = set(
+                batch_id for (batch_id,) in db.query(Batch.id).filter(Batch.id.in_(batch_ids)).all()
+            )
+            if existing != batch_ids:
+                rows = [row for row in rows if row['batch_id'] in existing]
+
+            db.bulk_insert_mappings(TemperatureLog, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def save_relay_stats(self, pending: Dict[int, tuple]):
+        """Add relay counters (gpio_pin -> (fermenter_id, relay_type, cycles, on_seconds)) to relay_stats."""
+        db = SessionLocal()
+        try:
+            fermenter_ids = set(fermenter_id for fermenter_id, _, _, _ in pending.values())
+            rows = db.query(RelayStats).filter(RelayStats.fermenter_id.in_(fermenter_ids)).all()
+            existing = {(row.fermenter_id, row.gpio_pin): row for row in rows}
+            fermenters = {
+                fermenter.id: fermenter
+                for fermenter in db.query(Fermenter).filter(Fermenter.id.in_(fermenter_ids)).all()
+            }
+
+            for gpio_pin, (fermenter_id, relay_type, cycles, on_seconds) in pending.items():
+                fermenter = fermenters.get(fermenter_id)
+                if fermenter is None:
+                    # Fermenter was deleted, drop its counters
+                    continue
+
+                row = existing.get((fermenter_id, gpio_pin))
+                if row is None:
+                    row = RelayStats(
+                        fermenter_id=fermenter_id,
+                        gpio_pin=gpio_pin,
+                        relay_type=relay_type,
+                        cycle_count=0,
+                        on_seconds=0.0
+                    )
+                    db.add(row)
+                    existing[(fermenter_id, gpio_pin)] = row
+
+                row.relay_type = relay_type
+                row.cycle_count = (row.cycle_count or 0) + cycles
+                row.on_seconds = (row.on_seconds or 0.0) + on_seconds
+
+                # Keep the fermenter-wide total in step for existing consumers
+                fermenter.relay_cycle_count = (fermenter.relay_cycle_count or 0) + cycles
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
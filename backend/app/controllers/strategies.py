@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from ..config import settings
+
+
+class ControlStrategy(ABC):
+    """Abstract control algorithm deciding relay states from a reading."""
+
+    @abstractmethod
+    def compute(self, actual_temp: float, target_temp: float, now: float) -> tuple[bool, bool]:
+        """Return (heating, cooling) for this tick. `now` is a monotonic timestamp in seconds."""
+        pass
+
+    def reset(self):
+        """Forget accumulated state (e.g. after a sensor dropout)."""
+        pass
+
+
+class HysteresisStrategy(ControlStrategy):
+    """Bang-bang control with a symmetric deadband around the target."""
+
+    def __init__(self, hysteresis: float):
+        self.hysteresis = hysteresis
+
+    def compute(self, actual_temp: float, target_temp: float, now: float) -> tuple[bool, bool]:
+        if actual_temp < target_temp - self.hysteresis:
+            # Too cold, heat
+            return True, False
+        if actual_temp > target_temp + self.hysteresis:
+            # Too hot, chill
+            return False, True
+        # Within deadband
+        return False, False
+
+
+class PIDStrategy(ControlStrategy):
+    """
+    PID control driving time-proportional relay duty.
+
+    The PID output is a signed duty cycle in [-1, 1] (positive heats, negative
+    chills). It is latched at the start of each window and the matching relay
+    is held on for that fraction of the window, so each relay switches at most
+    once on and once off per window.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float,
+        kd: float,
+        window_seconds: float,
+        min_on_seconds: float = 0.0
+    ):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.window_seconds = window_seconds
+        self.min_on_seconds = min_on_seconds
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.last_temp: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.window_start: Optional[float] = None
+        self.duty = 0.0
+
+    def _update_output(self, actual_temp: float, target_temp: float, now: float) -> float:
+        """Advance the PID terms and return the clamped output."""
+        error = target_temp - actual_temp
+        dt = now - self.last_time if self.last_time is not None else 0.0
+
+        # Derivative on measurement avoids a kick when the target steps between phases
+        derivative = 0.0
+        if dt > 0 and self.last_temp is not None:
+            derivative = -(actual_temp - self.last_temp) / dt
+
+        candidate_integral = self.integral + self.ki * error * dt
+        candidate_integral = max(-1.0, min(1.0, candidate_integral))
+        output = self.kp * error + candidate_integral + self.kd * derivative
+
+        # Anti-windup: only integrate when not saturated, or when the error pulls out of saturation
+        saturated_high = output > 1.0 and error > 0
+        saturated_low = output < -1.0 and error < 0
+        if not (saturated_high or saturated_low):
+            self.integral = candidate_integral
+            output = self.kp * error + self.integral + self.kd * derivative
+
+        self.last_temp = actual_temp
+        self.last_time = now
+        return max(-1.0, min(1.0, output))
+
+    def compute(self, actual_temp: float, target_temp: float, now: float) -> tuple[bool, bool]:
+        output = self._update_output(actual_temp, target_temp, now)
+
+        # Latch a new duty at the start of each window
+        if self.window_start is None or now - self.window_start >= self.window_seconds:
+            self.window_start = now
+            self.duty = output
+            if abs(self.duty) * self.window_seconds < self.min_on_seconds:
+                # Too short to be worth a relay cycle
+                self.duty = 0.0
+
+        on_seconds = abs(self.duty) * self.window_seconds
+        relay_on = now - self.window_start < on_seconds
+        return relay_on and self.duty > 0, relay_on and self.duty < 0
+
+
+def create_strategy(
+    control_mode: Optional[str],
+    kp: Optional[float] = None,
+    ki: Optional[float] = None,
+    kd: Optional[float] = None
+) -> ControlStrategy:
+    """Build the control strategy configured for a fermenter."""
+    if control_mode == "pid":
+        return PIDStrategy(
+            kp=kp if kp is not None else settings.pid_default_kp,
+            ki=ki if ki is not None else settings.pid_default_ki,
+            kd=kd if kd is not None else settings.pid_default_kd,
+            window_seconds=settings.pid_window_seconds,
+            min_on_seconds=settings.pid_min_on_seconds
+        )
+    return HysteresisStrategy(settings.hysteresis_temp)
@@ -1,210 +1,462 @@
-import time
 import threading
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Dict, Optional
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
-from ..models import Batch, Fermenter, TemperatureLog, ProfilePhase
 from ..hardware.manager import hardware_manager
+from ..hardware.filters import SensorFilterBank
 from ..config import settings
+from ..clock import system_clock
+from ..logging_config import RateLimitedLogger, get_logger
+from ..metrics import (
+    CONTROL_TICK_SECONDS,
+    CONTROLLER_REGISTRY,
+    DB_COMMIT_SECONDS,
+    LOG_BUFFER_ROWS,
+    PENDING_SENSOR_READS,
+)
+from .relay_stats import RelayStatsTracker
+from .energy import EnergyAccumulator
+from .log_buffer import LogSampler, LogBuffer
+from .scheduler import TickScheduler
+from .registry import ActiveBatchRegistry
+from .batch_state import BatchControlState
+from .store import DatabaseStore
+from .fleet import node_live_state
+from .ipc import (
+    LeaderLock,
+    NotificationListener,
+    SharedStateReader,
+    SharedStateWriter,
+    send_notification,
+)
+
+logger = get_logger(__name__)
+
+# Shared state older than this many control intervals comes from a controller that has stopped
+SHARED_STATE_MAX_TICKS = 3
 
 
 class TemperatureController:
     """Controls temperature for all active batches."""
     
-    def __init__(self):
+    def __init__(self, store=None, clock=None):
         self.running = False
+        # Where batches are loaded from and results persisted to (local DB or a coordinator)
+        self.store = store or DatabaseStore()
+        # Time source for control decisions; a ManualClock replays profiles faster than real time
+        self.clock = clock or system_clock
         self.thread: Optional[threading.Thread] = None
-        self.active_batches: Dict[int, dict] = {}  # batch_id -> control state
-        self.lock = threading.Lock()
-        self.last_sensor_reading = {}  # sensor_id -> timestamp
+        self.registry = ActiveBatchRegistry(self.clock)
+        # batch_id -> control state; replaced (never mutated) so readers need no lock
+        self.active_batches: Dict[int, BatchControlState] = {}
+        self.lock = threading.Lock()  # serializes structural changes to active_batches
+        self.read_pool: Optional[ThreadPoolExecutor] = None
+        self.pending_reads: Dict[str, Future] = {}  # sensor_id -> in-flight read, shared by a bulk read
+        self.snapshot: Dict[int, dict] = {}  # batch_id -> live values, replaced every tick
+        self.last_sensor_reading = {}  # sensor_id -> clock.monotonic() timestamp
+        self.sensor_filters = SensorFilterBank()
+        self.staged_relays: Dict[int, bool] = {}  # gpio_pin -> on, written together once per tick
+        self.scheduler = TickScheduler(settings.control_loop_interval, self.clock)
+        self.relay_stats = RelayStatsTracker(self.clock)
+        self.energy = EnergyAccumulator(self.clock)
+        self.log_sampler = LogSampler()
+        self.log_buffer = LogBuffer(self.clock)
+        self.unsaved_costs: Dict[int, float] = {}  # batch_id -> final cost of a stopped batch not yet persisted
+        # Multi-process support: only the lock holder drives relays, others read shared state
+        self.leader_lock: Optional[LeaderLock] = None
+        self.state_writer: Optional[SharedStateWriter] = None
+        self.state_reader: Optional[SharedStateReader] = None
+        self.listener: Optional[NotificationListener] = None
+        self.errors = RateLimitedLogger(logger)  # errors that would otherwise repeat every tick
         
-    def start(self):
-        """Start the temperature control loop."""
+    def start(self) -> bool:
+        """Start the temperature control loop. Returns False if another process owns the relays."""
         if self.running:
-            print("Temperature controller already running")
-            return
+            logger.info("Temperature controller already running")
+            return True
+        
+        self.leader_lock = LeaderLock(settings.controller_lock_path)
+        if not self.leader_lock.acquire():
+            logger.info("Another process owns the controller; serving its shared state instead")
+            return False
+        
+        try:
+            self.state_writer = SharedStateWriter(settings.controller_shm_name, settings.controller_shm_size)
+            self.listener = NotificationListener(settings.controller_socket_path, self._handle_notification)
+            self.listener.start()
+        except OSError as e:
+            logger.warning("Controller IPC unavailable, running without shared state: %s", e)
+        
+        # Configure every relay pin up front so none float until its batch starts
+        try:
+            hardware_manager.setup_relays(self.store.load_relay_pins())
+        except Exception as e:
+            logger.error("Error setting up relay pins: %s", e)
         
         self.running = True
+        self.read_pool = ThreadPoolExecutor(
+            max_workers=settings.sensor_read_workers,
+            thread_name_prefix="sensor-read"
+        )
+        self.scheduler.start()
         self.thread = threading.Thread(target=self._control_loop, daemon=True)
         self.thread.start()
-        print("Temperature controller started")
+        logger.info("Temperature controller started")
+        return True
     
     def stop(self):
         """Stop the temperature control loop."""
+        if not self.running:
+            return
+        
         self.running = False
+        self.scheduler.stop()
         if self.thread:
             self.thread.join(timeout=5)
         
+        if self.read_pool:
+            self.read_pool.shutdown(wait=False, cancel_futures=True)
+            self.read_pool = None
+        self.pending_reads = {}
+        
         # Turn off all relays
-        with self.lock:
-            for batch_id, state in self.active_batches.items():
-                self._deactivate_all(state['heater_gpio'], state['chiller_gpio'])
+        for state in self.active_batches.values():
+            with state.lock:
+                self._deactivate_all(state)
+        self._commit_relays()
+        self.snapshot = {}
+        
+        # Persist buffered logs, relay counters and energy totals
+        try:
+            self._flush_logs()
+            self._flush_stats()
+        except Exception as e:
+            logger.error("Error flushing controller stats: %s", e, exc_info=True)
         
         hardware_manager.cleanup()
-        print("Temperature controller stopped")
+        
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        if self.state_writer:
+            self.state_writer.close()
+            self.state_writer = None
+        self.leader_lock.release()
+        self.leader_lock = None
+        logger.info("Temperature controller stopped")
     
     def _control_loop(self):
-        """Main control loop that runs continuously."""
-        while self.running:
+        """Main control loop, ticking at fixed monotonic deadlines."""
+        while self.running and self.scheduler.wait_for_tick():
             try:
-                db = SessionLocal()
-                try:
-                    self._update_active_batches(db)
-                    self._process_batches(db)
-                finally:
-                    db.close()
+                with CONTROL_TICK_SECONDS.time():
+                    self.tick()
             except Exception as e:
-                print(f"Error in control loop: {e}")
+                self.errors.error(("control_loop", type(e)), "Error in control loop: %s", e, exc_info=True)
             
-            # Sleep for configured interval
-            time.sleep(settings.control_loop_interval)
+            skipped = self.scheduler.end_tick()
+            if skipped:
+                logger.warning("Control loop overrun, skipped %d tick(s)", skipped)
+    
+    def tick(self):
+        """Run one control cycle: read sensors, drive relays, publish, persist when due."""
+        try:
+            self._sync_batches()
+            self._process_batches()
+        finally:
+            self._commit_relays()
+        self._publish_snapshot()
+        if self.log_buffer.flush_due(settings.persist_interval):
+            self._flush_logs()
+        if self.relay_stats.flush_due(settings.relay_stats_flush_interval):
+            self._flush_stats()
     
-    def _update_active_batches(self, db: Session):
-        """Update the list of active batches."""
-        active = db.query(Batch).filter(Batch.status == "active").all()
+    def get_loop_stats(self) -> dict:
+        """Get control loop timing statistics."""
+        if not self.running:
+            return self._read_shared_state().get('loop', {"running": False})
+        return {"running": self.running, **self.scheduler.get_stats()}
+    
+    def _sync_batches(self):
+        """Bring per-batch control state in line with the active batch registry."""
+        if self.registry.reconcile_due(self.store.reconcile_interval):
+            self.store.reconcile(self.registry)
+        records = self.registry.snapshot()
+        # Seed energy totals for new batches before taking the lock; the store may do I/O
+        seed_energy = {
+            batch_id: self.store.load_energy(batch_id)
+            for batch_id in records if batch_id not in self.active_batches
+        }
         
         with self.lock:
-            current_ids = set(self.active_batches.keys())
-            new_ids = set(batch.id for batch in active)
+            current = self.active_batches
+            active_batches = {}
+            removed = [state for batch_id, state in current.items() if batch_id not in records]
+            
+            for batch_id, record in records.items():
+                state = current.get(batch_id)
+                
+                if state is None:
+                    # New batch: seed the energy total once so cost queries never scan logs
+                    self.energy.start_batch(batch_id, seed_energy.get(batch_id, 0.0))
+                    self._configure_simulation(record)
+                    state = BatchControlState(record)
+                
+                elif state.record is not record:
+                    # Record was refreshed; release old pins if the wiring changed
+                    old = state.record
+                    with state.lock:
+                        if (old.heater_gpio, old.chiller_gpio) != (record.heater_gpio, record.chiller_gpio):
+                            self._deactivate_all(state)
+                        state.apply_record(record)
+                    self._configure_simulation(record)
+                
+                active_batches[batch_id] = state
             
-            # Remove stopped batches
-            for batch_id in current_ids - new_ids:
-                state = self.active_batches[batch_id]
-                self._deactivate_all(state['heater_gpio'], state['chiller_gpio'])
-                del self.active_batches[batch_id]
+            self.active_batches = active_batches
+        
+        # Remove stopped batches; only in-memory work here, so every one is switched off
+        for state in removed:
+            batch_id = state.record.batch_id
+            with state.lock:
+                self._deactivate_all(state)
+                actual_temp, target_temp = state.actual_temp, state.target_temp
+            if actual_temp is not None and target_temp is not None:
+                # Close the log with the energy used since the batch's last row
+                self.log_buffer.add(batch_id, actual_temp, target_temp, "idle", self.energy.take_pending(batch_id))
+            self.log_sampler.forget(batch_id)
+            self.sensor_filters.forget(state.record.sensor_id)
             
-            # Add new batches
-            for batch in active:
-                if batch.id not in self.active_batches:
-                    fermenter = db.query(Fermenter).filter(Fermenter.id == batch.fermenter_id).first()
-                    if fermenter:
-                        self.active_batches[batch.id] = {
-                            'batch': batch,
-                            'fermenter': fermenter,
-                            'sensor_id': fermenter.sensor_id,
-                            'heater_gpio': fermenter.heater_gpio,
-                            'chiller_gpio': fermenter.chiller_gpio,
-                        }
-    
-    def _process_batches(self, db: Session):
+            totals = self.energy.stop_batch(batch_id)
+            if totals:
+                self.unsaved_costs[batch_id] = totals['cost']
+        
+        if removed and self.unsaved_costs:
+            try:
+                self._save_final_costs()
+            except Exception as e:
+                # Kept in unsaved_costs and retried with the next stats flush
+                self.errors.error(("final_costs", type(e)), "Error saving costs of stopped batches: %s", e)
+    
+    def _save_final_costs(self):
+        """Persist the final energy cost of stopped batches."""
+        costs = dict(self.unsaved_costs)
+        with DB_COMMIT_SECONDS.labels("energy_costs").time():
+            self.store.save_energy_costs(costs)
+        for batch_id in costs:
+            self.unsaved_costs.pop(batch_id, None)
+    
+    def _configure_simulation(self, record):
+        """Give the mock thermal simulation the fermenter's size and relay power."""
+        hardware_manager.configure_simulation(
+            record.sensor_id,
+            record.heater_gpio,
+            record.chiller_gpio,
+            record.size_liters,
+            record.heater_watts,
+            record.chiller_watts
+        )
+    
+    def notify_batch_changed(self, db: Session, batch_id: int):
+        """Called by the API after a batch is started, stopped or edited."""
+        if not self.running:
+            send_notification(settings.controller_socket_path, "batch", batch_id)
+            return
+        self.registry.refresh_batch(db, batch_id)
+    
+    def notify_fermenter_changed(self, db: Session, fermenter_id: int):
+        """Called by the API after a fermenter is edited."""
+        if not self.running:
+            send_notification(settings.controller_socket_path, "fermenter", fermenter_id)
+            return
+        self.registry.refresh_fermenter(db, fermenter_id)
+    
+    def notify_profile_changed(self, db: Session, profile_id: int):
+        """Called by the API after a profile's phases change."""
+        if not self.running:
+            send_notification(settings.controller_socket_path, "profile", profile_id)
+            return
+        self.registry.refresh_profile(db, profile_id)
+    
+    def set_manual_relay(self, gpio_pin: int, on: bool) -> bool:
+        """Switch a relay outside of batch control, via the owning process if needed."""
+        if not self.running:
+            return send_notification(settings.controller_socket_path, "relay", gpio_pin, on)
+        
+        if on:
+            hardware_manager.activate_relay(gpio_pin)
+        else:
+            hardware_manager.deactivate_relay(gpio_pin)
+        return True
+    
+    def _handle_notification(self, kind: str, entity_id: int, value=None):
+        """Apply a notification sent by an API process."""
+        if kind == "relay":
+            self.set_manual_relay(entity_id, bool(value))
+            return
+        
+        self.store.refresh(self.registry, kind, entity_id)
+    
+    def _process_batches(self):
         """Process all active batches."""
-        with self.lock:
-            for batch_id, state in self.active_batches.items():
+        states = self.active_batches
+        readings = self._read_sensors(states.values())
+        
+        # Filter glitches before they reach control and logging
+        now = self.clock.monotonic()
+        readings = {
+            sensor_id: self.sensor_filters.process(sensor_id, temp, now)
+            for sensor_id, temp in readings.items()
+        }
+        
+        for batch_id, state in states.items():
+            with state.lock:
                 try:
-                    self._process_batch(db, batch_id, state)
+                    self._process_batch(batch_id, state, readings.get(state.record.sensor_id))
                 except Exception as e:
-                    print(f"Error processing batch {batch_id}: {e}")
+                    self.errors.error(
+                        ("batch", batch_id, type(e)),
+                        "Error processing batch %s: %s", batch_id, e,
+                        exc_info=True,
+                        extra={"batch_id": batch_id}
+                    )
+    
+    def _read_sensors(self, states) -> Dict[str, Optional[float]]:
+        """
+        Read all sensors concurrently, waiting at most SENSOR_READ_TIMEOUT.
+        
+        A sensor that is still converting is left in flight and simply missing
+        from the result, so one slow probe does not hold up the others. When
+        the bus supports simultaneous conversion, all idle sensors share one
+        bulk read instead.
+        """
+        sensor_ids = set(state.record.sensor_id for state in states)
+        idle_ids = sorted(sensor_id for sensor_id in sensor_ids if sensor_id not in self.pending_reads)
+        
+        if idle_ids and hardware_manager.supports_bulk_read():
+            future = self.read_pool.submit(hardware_manager.read_temperatures, idle_ids)
+            for sensor_id in idle_ids:
+                self.pending_reads[sensor_id] = future
+        else:
+            for sensor_id in idle_ids:
+                self.pending_reads[sensor_id] = self.read_pool.submit(self._read_sensor, sensor_id)
+        
+        wait(set(self.pending_reads[sensor_id] for sensor_id in sensor_ids), timeout=settings.sensor_read_timeout)
+        
+        readings = {}
+        for sensor_id, future in list(self.pending_reads.items()):
+            if not future.done():
+                continue
+            del self.pending_reads[sensor_id]
+            if sensor_id not in sensor_ids:
+                continue
+            try:
+                readings[sensor_id] = future.result().get(sensor_id)
+            except Exception as e:
+                self.errors.error(
+                    ("sensor", sensor_id, type(e)),
+                    "Error reading sensor %s: %s", sensor_id, e,
+                    extra={"sensor_id": sensor_id}
+                )
+                readings[sensor_id] = None
+        return readings
     
-    def _process_batch(self, db: Session, batch_id: int, state: dict):
-        """Process a single batch."""
-        # Read current temperature
-        sensor_id = state['sensor_id']
-        actual_temp = hardware_manager.read_temperature(sensor_id)
+    def _read_sensor(self, sensor_id: str) -> Dict[str, Optional[float]]:
+        """Read one sensor, shaped like a bulk read result."""
+        # max_age=0: always a fresh conversion, but joins a read an API request already started
+        return {sensor_id: hardware_manager.get_temperature(sensor_id, 0)}
+    
+    def _process_batch(self, batch_id: int, state: BatchControlState, actual_temp: Optional[float]):
+        """Process a single batch. Caller holds state.lock."""
+        record = state.record
+        sensor_id = record.sensor_id
         
         if actual_temp is None:
             # Sensor timeout - turn off relays for safety
             if self._check_sensor_timeout(sensor_id):
-                print(f"Sensor timeout for batch {batch_id}, deactivating relays")
-                self._deactivate_all(state['heater_gpio'], state['chiller_gpio'])
+                self.errors.error(
+                    ("sensor_timeout", batch_id),
+                    "Sensor timeout for batch %s, deactivating relays", batch_id,
+                    extra={"batch_id": batch_id, "sensor_id": sensor_id}
+                )
+                self._deactivate_all(state)
+                state.strategy.reset()
             return
         
         # Update last reading time
-        self.last_sensor_reading[sensor_id] = datetime.utcnow()
+        now = self.clock.monotonic()
+        self.last_sensor_reading[sensor_id] = now
+        state.last_reading_at = now
+        state.last_reading_time = self.clock.utcnow()
         
         # Get target temperature for current phase
-        target_temp = self._get_target_temperature(db, state['batch'])
+        target_temp = record.target_temperature(state.last_reading_time)
         
         if target_temp is None:
             # No target temperature, turn off
-            self._deactivate_all(state['heater_gpio'], state['chiller_gpio'])
+            self._deactivate_all(state)
+            state.strategy.reset()
             control_state = "idle"
         else:
-            # Apply hysteresis control
-            control_state = self._apply_control(
-                actual_temp,
-                target_temp,
-                state['heater_gpio'],
-                state['chiller_gpio'],
-                state['fermenter']
-            )
+            # Apply the fermenter's control strategy
+            control_state = self._apply_control(actual_temp, target_temp, state)
+        
+        state.actual_temp = actual_temp
+        state.target_temp = target_temp
+        state.control_state = control_state
         
         # Log temperature
         self._log_temperature(
-            db,
             batch_id,
             actual_temp,
             target_temp or actual_temp,
             control_state
         )
-        
-        # Simulate temperature change for mock mode
-        if settings.hardware_mode == "mock" and hasattr(hardware_manager.sensor_interface, 'simulate_heating'):
-            heating = hardware_manager.get_relay_state(state['heater_gpio'])
-            cooling = hardware_manager.get_relay_state(state['chiller_gpio'])
-            hardware_manager.sensor_interface.simulate_heating(sensor_id, heating, cooling)
     
-    def _get_target_temperature(self, db: Session, batch: Batch) -> Optional[float]:
-        """Get target temperature for current phase."""
-        if not batch.start_time:
-            return None
-        
-        elapsed = datetime.utcnow() - batch.start_time
-        elapsed_hours = elapsed.total_seconds() / 3600
-        
-        # Get all phases for this batch's profile
-        phases = db.query(ProfilePhase).filter(
-            ProfilePhase.profile_id == batch.profile_id
-        ).order_by(ProfilePhase.sequence_order).all()
-        
-        if not phases:
-            return None
-        
-        # Find current phase
-        cumulative_hours = 0
-        for phase in phases:
-            cumulative_hours += phase.duration_hours
-            if elapsed_hours <= cumulative_hours:
-                return phase.target_temp_celsius
+    def _apply_control(self, actual_temp: float, target_temp: float, state: BatchControlState) -> str:
+        """Apply the batch's control strategy and drive the relays."""
+        heating, cooling = state.strategy.compute(actual_temp, target_temp, self.clock.monotonic())
+        self._set_relays(state, heating=heating, cooling=cooling)
         
-        # Past all phases, use last phase temperature
-        return phases[-1].target_temp_celsius
-    
-    def _apply_control(
-        self,
-        actual_temp: float,
-        target_temp: float,
-        heater_gpio: int,
-        chiller_gpio: int,
-        fermenter: Fermenter
-    ) -> str:
-        """Apply hysteresis control algorithm."""
-        hysteresis = settings.hysteresis_temp
-        
-        if actual_temp < target_temp - hysteresis:
-            # Too cold, activate heater
-            hardware_manager.activate_relay(heater_gpio)
-            hardware_manager.deactivate_relay(chiller_gpio)
-            self._increment_relay_cycle(fermenter, heater_gpio)
+        if heating:
             return "heating"
-        
-        elif actual_temp > target_temp + hysteresis:
-            # Too hot, activate chiller
-            hardware_manager.deactivate_relay(heater_gpio)
-            hardware_manager.activate_relay(chiller_gpio)
-            self._increment_relay_cycle(fermenter, chiller_gpio)
+        if cooling:
             return "cooling"
+        return "idle"
+    
+    def _set_relays(self, state: BatchControlState, heating: bool, cooling: bool):
+        """Stage heater and chiller relay states and record them for wear tracking."""
+        record = state.record
         
-        else:
-            # Within deadband, turn off both
-            hardware_manager.deactivate_relay(heater_gpio)
-            hardware_manager.deactivate_relay(chiller_gpio)
-            return "idle"
+        self.staged_relays[record.heater_gpio] = heating
+        self.staged_relays[record.chiller_gpio] = cooling
+        state.heating = heating
+        state.cooling = cooling
+        
+        self.relay_stats.record(record.fermenter_id, record.heater_gpio, "heater", heating)
+        self.relay_stats.record(record.fermenter_id, record.chiller_gpio, "chiller", cooling)
+        self.energy.integrate(
+            record.batch_id,
+            record.heater_watts,
+            record.chiller_watts,
+            heating,
+            cooling
+        )
     
-    def _deactivate_all(self, heater_gpio: int, chiller_gpio: int):
+    def _commit_relays(self):
+        """Write all relay states staged this tick in one hardware operation."""
+        staged = self.staged_relays
+        if not staged:
+            return
+        self.staged_relays = {}
+        try:
+            hardware_manager.apply_relays(staged)
+        except Exception as e:
+            self.errors.error(("relays", type(e)), "Error switching relays: %s", e)
+    
+    def _deactivate_all(self, state: BatchControlState):
         """Deactivate both heater and chiller."""
-        hardware_manager.deactivate_relay(heater_gpio)
-        hardware_manager.deactivate_relay(chiller_gpio)
+        self._set_relays(state, heating=False, cooling=False)
     
     def _check_sensor_timeout(self, sensor_id: str) -> bool:
         """Check if sensor has timed out."""
@@ -212,36 +464,203 @@ class TemperatureController:
             return False
         
         last_reading = self.last_sensor_reading[sensor_id]
-        timeout = timedelta(seconds=settings.sensor_timeout)
-        return datetime.utcnow() - last_reading > timeout
-    
-    def _increment_relay_cycle(self, fermenter: Fermenter, gpio_pin: int):
-        """Increment relay cycle count (do it sparingly to avoid DB overhead)."""
-        # Only increment every 100th activation to reduce DB writes
-        if fermenter.relay_cycle_count % 100 == 0:
-            fermenter.relay_cycle_count += 1
+        return self.clock.monotonic() - last_reading > settings.sensor_timeout
     
     def _log_temperature(
         self,
-        db: Session,
         batch_id: int,
         actual_temp: float,
         target_temp: float,
         control_state: str
     ):
-        """Log temperature reading to database."""
-        log = TemperatureLog(
-            batch_id=batch_id,
-            actual_temp=actual_temp,
-            target_temp=target_temp,
-            control_state=control_state,
-            power_consumed_wh=0  # TODO: Calculate based on relay state and time
+        """Queue a temperature log row if the logging policy wants this sample."""
+        now = self.clock.monotonic()
+        if not self.log_sampler.should_log(batch_id, actual_temp, target_temp, control_state, now):
+            return
+        
+        self.log_sampler.mark_logged(batch_id, actual_temp, target_temp, control_state, now)
+        self.log_buffer.add(
+            batch_id,
+            actual_temp,
+            target_temp,
+            control_state,
+            self.energy.take_pending(batch_id)
         )
-        db.add(log)
-        db.commit()
+    
+    def _flush_logs(self):
+        """Persist buffered temperature logs in one batch."""
+        rows = self.log_buffer.take()
+        if not rows:
+            return
+        try:
+            with DB_COMMIT_SECONDS.labels("logs").time():
+                self.store.save_logs(rows)
+        except Exception:
+            self.log_buffer.restore(rows)
+            raise
+    
+    def _flush_stats(self):
+        """Persist relay wear counters and running batch energy costs."""
+        pending = self.relay_stats.take_pending()
+        if pending:
+            try:
+                with DB_COMMIT_SECONDS.labels("relay_stats").time():
+                    self.store.save_relay_stats(pending)
+            except Exception:
+                self.relay_stats.restore(pending)
+                raise
+        
+        if self.unsaved_costs:
+            self._save_final_costs()
+        
+        costs = {
+            batch_id: totals['cost']
+            for batch_id, totals in self.energy.get_all_totals().items()
+            if totals
+        }
+        with DB_COMMIT_SECONDS.labels("energy_costs").time():
+            self.store.save_energy_costs(costs)
+    
+    def _publish_snapshot(self):
+        """Publish plain copies of live per-batch values for wait-free readers."""
+        now = self.clock.utcnow()
+        snapshot = {}
+        
+        for batch_id, state in self.active_batches.items():
+            with state.lock:
+                record = state.record
+                entry = {
+                    'batch_id': batch_id,
+                    'batch_number': record.batch_number,
+                    'fermenter_id': record.fermenter_id,
+                    'sensor_id': record.sensor_id,
+                    'current_temp': state.actual_temp,
+                    'target_temp': state.target_temp,
+                    'control_state': state.control_state,
+                    'heater_on': state.heating,
+                    'chiller_on': state.cooling,
+                    'last_reading': state.last_reading_time.isoformat() if state.last_reading_time else None,
+                    'last_reading_at': state.last_reading_at,
+                }
+            
+            current_phase, phase_progress = record.current_phase(now)
+            entry['current_phase'] = current_phase
+            entry['phase_progress'] = phase_progress
+            entry['elapsed_hours'] = record.elapsed_hours(now)
+            snapshot[batch_id] = entry
+        
+        self.snapshot = snapshot
+        
+        if self.state_writer:
+            state = {
+                'batches': list(snapshot.values()),
+                'loop': self.get_loop_stats(),
+                'energy': {str(batch_id): totals for batch_id, totals in self.energy.get_all_totals().items()},
+                'relays': {
+                    str(gpio_pin): self.relay_stats.get_pending(gpio_pin)
+                    for gpio_pin in list(self.relay_stats.relays.keys())
+                },
+                'sensor_filters': self.sensor_filters.get_stats(),
+                'sensor_health': hardware_manager.sensor_health.get_stats(),
+                'relay_states': {
+                    str(gpio_pin): hardware_manager.get_relay_state(gpio_pin)
+                    for gpio_pin in list(hardware_manager.setup_pins)
+                },
+                'metrics': CONTROLLER_REGISTRY.collect(),
+            }
+            if not self.state_writer.publish(state):
+                self.errors.error(("shm_size",), "Controller state exceeds CONTROLLER_SHM_SIZE, not published")
+    
+    def _read_shared_state(self) -> dict:
+        """Latest state published by the controller process; empty once it has missed a few ticks."""
+        if self.state_reader is None:
+            self.state_reader = SharedStateReader(settings.controller_shm_name)
+        try:
+            return self.state_reader.read(max_age=SHARED_STATE_MAX_TICKS * settings.control_loop_interval) or {}
+        except Exception as e:
+            self.errors.error(("shm_read", type(e)), "Error reading shared controller state: %s", e)
+            return {}
+    
+    def get_live_state(self) -> list[dict]:
+        """Live state of every active batch, served from memory without DB access."""
+        if self.running:
+            entries = self.snapshot.values()
+        else:
+            entries = self._read_shared_state().get('batches', [])
+        
+        now = self.clock.monotonic()
+        result = []
+        for entry in entries:
+            item = dict(entry)
+            last_reading_at = item.pop('last_reading_at')
+            item['sensor_age_seconds'] = round(now - last_reading_at, 1) if last_reading_at is not None else None
+            result.append(item)
+        
+        if settings.node_id is None:
+            # Coordinator: include batches driven by node agents
+            result.extend(node_live_state.get_batches())
+        return result
+    
+    def get_batch_live_state(self, batch_id: int) -> Optional[dict]:
+        """Live state of one active batch, or None if the controller is not running it."""
+        for item in self.get_live_state():
+            if item['batch_id'] == batch_id:
+                return item
+        return None
+    
+    def get_batch_energy(self, batch_id: int) -> Optional[dict]:
+        """Get running energy and cost for an active batch."""
+        if not self.running:
+            totals = self._read_shared_state().get('energy', {}).get(str(batch_id))
+        else:
+            totals = self.energy.get_totals(batch_id)
+        if totals is None and settings.node_id is None:
+            totals = node_live_state.get_energy(batch_id)
+        return totals
+    
+    def get_sensor_filter_stats(self) -> dict:
+        """Accepted and rejected sample counts per sensor."""
+        if not self.running:
+            return self._read_shared_state().get('sensor_filters', {})
+        return self.sensor_filters.get_stats()
+    
+    def get_sensor_health(self) -> dict:
+        """Read success rate, latency histogram and backoff per sensor."""
+        if not self.running:
+            return self._read_shared_state().get('sensor_health', {})
+        return hardware_manager.sensor_health.get_stats()
+    
+    def get_metrics(self) -> list[dict]:
+        """Control loop metrics from whichever process runs the loop."""
+        if not self.running:
+            return self._read_shared_state().get('metrics', [])
+        return CONTROLLER_REGISTRY.collect()
+    
+    def get_node_status(self) -> dict:
+        """Live state a node agent reports to the coordinator on each sync."""
+        return {
+            'batches': self.get_live_state(),
+            'energy': {str(batch_id): totals for batch_id, totals in self.energy.get_all_totals().items()},
+            'loop': self.get_loop_stats(),
+        }
+    
+    def get_relay_pending(self, gpio_pin: int) -> dict:
+        """Get relay counters not yet flushed to the database."""
+        if not self.running:
+            pending = self._read_shared_state().get('relays', {}).get(str(gpio_pin))
+            return pending or {'cycles': 0, 'on_seconds': 0.0}
+        return self.relay_stats.get_pending(gpio_pin)
+    
+    def get_relay_state(self, gpio_pin: int) -> bool:
+        """Get the current state of a relay as driven by the owning process."""
+        if not self.running:
+            return bool(self._read_shared_state().get('relay_states', {}).get(str(gpio_pin), False))
+        return hardware_manager.get_relay_state(gpio_pin)
 
 
 # Global controller instance
 temperature_controller = TemperatureController()
+LOG_BUFFER_ROWS.set_function(temperature_controller.log_buffer.pending_count)
+PENDING_SENSOR_READS.set_function(lambda: len(temperature_controller.pending_reads))
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -35,3 +35,26 @@ def get_db():
         db.close()
 
 
+
+
+def init_db():
+    """
+    Create missing tables and bring existing ones up to the current models.
+
+    create_all never alters a table that already exists, so columns and
+    indexes added to the models later are added here. Every step checks
+    first, so this is safe to run on each start.
+    """
+    from . import models  # noqa: F401  registers every table on Base.metadata
+    
+    Base.metadata.create_all(bind=engine)
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            columns = {column['name'] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
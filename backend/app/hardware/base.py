@@ -14,6 +14,14 @@ class SensorInterface(ABC):
     def get_all_sensors(self) -> list[str]:
         """Get list of all available sensor IDs."""
         pass
+    
+    def supports_bulk_read(self) -> bool:
+        """Whether read_many converts all sensors at once rather than one by one."""
+        return False
+    
+    def read_many(self, sensor_ids: list[str]) -> dict[str, Optional[float]]:
+        """Read several sensors. Backends with simultaneous conversion override this."""
+        return {sensor_id: self.read_temperature(sensor_id) for sensor_id in sensor_ids}
 
 
 class RelayInterface(ABC):
@@ -24,6 +32,11 @@ class RelayInterface(ABC):
         """Setup a GPIO pin as output."""
         pass
     
+    def setup_many(self, gpio_pins: list[int]):
+        """Setup several GPIO pins as outputs. Backends override this to do it in one call."""
+        for gpio_pin in gpio_pins:
+            self.setup(gpio_pin)
+    
     @abstractmethod
     def activate(self, gpio_pin: int):
         """Activate a relay (turn on)."""
@@ -34,6 +47,20 @@ class RelayInterface(ABC):
         """Deactivate a relay (turn off)."""
         pass
     
+    def apply(self, states: dict[int, bool]):
+        """
+        Set several relays at once (True = on).
+        
+        Backends override this to write all changes in a single operation;
+        callers put switch-offs first so pins written one by one never
+        energize both relays of a fermenter together.
+        """
+        for gpio_pin, on in states.items():
+            if on:
+                self.activate(gpio_pin)
+            else:
+                self.deactivate(gpio_pin)
+    
     @abstractmethod
     def get_state(self, gpio_pin: int) -> bool:
         """Get current state of a relay. True = on, False = off."""
@@ -0,0 +1,130 @@
+import os
+import time
+import select
+import ctypes
+import ctypes.util
+import subprocess
+import threading
+from typing import Optional
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def _inotify_watch(path: str) -> Optional[int]:
+    """Open a non-blocking inotify descriptor watching path, or None if unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, path.encode(), WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _load_modules():
+    """Load the 1-wire kernel modules; a no-op if they are built in or already loaded."""
+    for module in ("w1-gpio", "w1-therm"):
+        try:
+            subprocess.run(["modprobe", module], capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Could not load kernel module %s: %s", module, e)
+            return
+
+
+class SensorDiscovery:
+    """
+    Keeps the list of attached DS18B20 probes and w1 bus masters in memory.
+
+    The device directory is scanned once at start and again whenever
+    inotify reports a change. sysfs does not raise events for every
+    kernel-side change, so it is also rescanned every W1_RESCAN_INTERVAL
+    seconds, which is the only mechanism when inotify is unavailable.
+    Kernel modules are loaded on the watcher thread, off the startup path.
+    """
+
+    def __init__(self, base_dir: str, rescan_interval: float, load_modules: bool = True):
+        self.base_dir = base_dir
+        self.rescan_interval = rescan_interval
+        self.load_modules = load_modules
+        self.sensors: tuple[str, ...] = ()
+        self.bus_masters: tuple[str, ...] = ()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.rescan()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._watch, name="w1-discovery", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def rescan(self):
+        """Refresh the device lists from the directory."""
+        try:
+            names = os.listdir(self.base_dir)
+        except OSError:
+            names = []
+
+        sensors = tuple(sorted(name for name in names if name.startswith("28-")))
+        bus_masters = tuple(sorted(name for name in names if name.startswith("w1_bus_master")))
+        if sensors != self.sensors:
+            added = set(sensors) - set(self.sensors)
+            removed = set(self.sensors) - set(sensors)
+            if added:
+                logger.info("Sensors attached: %s", ", ".join(sorted(added)))
+            if removed:
+                logger.info("Sensors detached: %s", ", ".join(sorted(removed)))
+        # Tuples are replaced whole, so readers never see a partial update
+        self.sensors = sensors
+        self.bus_masters = bus_masters
+
+    def _watch(self):
+        if self.load_modules:
+            _load_modules()
+            self.rescan()
+
+        fd = _inotify_watch(self.base_dir)
+        if fd is None:
+            logger.info("inotify unavailable for sensor discovery, polling instead")
+
+        last_scan = time.monotonic()
+        try:
+            while True:
+                timeout = max(0.0, last_scan + self.rescan_interval - time.monotonic())
+                if fd is None:
+                    if self.stop_event.wait(timeout):
+                        break
+                else:
+                    # Wake at least once a second to notice stop()
+                    ready, _, _ = select.select([fd], [], [], min(1.0, timeout))
+                    if self.stop_event.is_set():
+                        break
+                    if ready:
+                        try:
+                            os.read(fd, 4096)  # drain; the events themselves are not needed
+                        except BlockingIOError:
+                            pass
+                    elif time.monotonic() - last_scan < self.rescan_interval:
+                        continue
+                self.rescan()
+                last_scan = time.monotonic()
+        finally:
+            if fd is not None:
+                os.close(fd)
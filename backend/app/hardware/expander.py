@@ -0,0 +1,163 @@
+from typing import Dict
+from .base import RelayInterface
+from .pins import split_pin
+from ..logging_config import get_logger
+
+try:
+    from smbus2 import SMBus
+    SMBUS_AVAILABLE = True
+except ImportError:
+    SMBUS_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# MCP23017 registers with IOCON.BANK=0, where each port B register follows port A
+IODIRA = 0x00
+OLATA = 0x14
+
+
+def open_i2c_bus(bus_number: int):
+    """Open the I2C bus the expanders are on."""
+    if not SMBUS_AVAILABLE:
+        raise ImportError("smbus2 not available. Install it to use GPIO_EXPANDERS.")
+    return SMBus(bus_number)
+
+
+class MockI2CBus:
+    """Records register writes in place of a real I2C bus."""
+
+    def __init__(self):
+        self.registers: Dict[tuple, int] = {}  # (address, register) -> last value
+        self.writes = 0
+
+    def write_i2c_block_data(self, address: int, register: int, data: list[int]):
+        self.writes += 1
+        for i, value in enumerate(data):
+            self.registers[(address, register + i)] = value
+
+    def close(self):
+        pass
+
+
+class MCP23017:
+    """16-pin I2C GPIO expander with every used pin driven as a relay output."""
+
+    def __init__(self, bus, address: int):
+        self.bus = bus
+        self.address = address
+        self.iodir = 0xFFFF  # power-on default: all inputs
+        self.olat = 0x0000  # output latches, bit n = pin n (port A is pins 0-7)
+
+    def _write_pair(self, register: int, value: int):
+        # Sequential addressing writes the port A register and its port B pair in one transaction
+        self.bus.write_i2c_block_data(self.address, register, [value & 0xFF, (value >> 8) & 0xFF])
+
+    def setup_outputs(self, mask: int):
+        """Drive the pins in mask low, then switch them to outputs."""
+        self.olat &= ~mask
+        self._write_pair(OLATA, self.olat)
+        self.iodir &= ~mask
+        self._write_pair(IODIRA, self.iodir)
+
+    def write(self, olat: int):
+        """Set all 16 output latches at once."""
+        self.olat = olat & 0xFFFF
+        self._write_pair(OLATA, self.olat)
+
+
+class ExpanderRelayInterface(RelayInterface):
+    """
+    Relay interface spanning native GPIO and MCP23017 expanders.
+
+    Pin numbers below EXPANDER_PIN_BASE go to the native interface; higher
+    numbers are routed to an expander (see pins.split_pin).
+    """
+
+    def __init__(self, native: RelayInterface, expanders: list[MCP23017]):
+        self.native = native
+        self.expanders = expanders
+
+    def _expander(self, index: int) -> MCP23017:
+        if index >= len(self.expanders):
+            raise ValueError(f"Expander {index} is not configured (GPIO_EXPANDERS has {len(self.expanders)})")
+        return self.expanders[index]
+
+    def setup(self, gpio_pin: int):
+        self.setup_many([gpio_pin])
+
+    def setup_many(self, gpio_pins: list[int]):
+        """Set up native pins in one call and each expander with one pair of register writes."""
+        native_pins = []
+        masks: Dict[int, int] = {}
+        for gpio_pin in gpio_pins:
+            index, pin = split_pin(gpio_pin)
+            if index is None:
+                native_pins.append(gpio_pin)
+            else:
+                masks[index] = masks.get(index, 0) | (1 << pin)
+
+        if native_pins:
+            self.native.setup_many(native_pins)
+        for index, mask in masks.items():
+            self._expander(index).setup_outputs(mask)
+
+    def _set(self, gpio_pin: int, on: bool):
+        index, pin = split_pin(gpio_pin)
+        if index is None:
+            if on:
+                self.native.activate(gpio_pin)
+            else:
+                self.native.deactivate(gpio_pin)
+            return
+
+        expander = self._expander(index)
+        if (expander.iodir >> pin) & 1:
+            # Still an input; first use without setup
+            expander.setup_outputs(1 << pin)
+        olat = expander.olat | (1 << pin) if on else expander.olat & ~(1 << pin)
+        if olat != expander.olat:
+            expander.write(olat)
+
+    def apply(self, states: dict[int, bool]):
+        """Write native pins in one call and each expander's latches in one transaction."""
+        native_states = {}
+        latches: Dict[int, int] = {}
+        for gpio_pin, on in states.items():
+            index, pin = split_pin(gpio_pin)
+            if index is None:
+                native_states[gpio_pin] = on
+                continue
+            
+            expander = self._expander(index)
+            if (expander.iodir >> pin) & 1:
+                expander.setup_outputs(1 << pin)
+            olat = latches.get(index, expander.olat)
+            latches[index] = olat | (1 << pin) if on else olat & ~(1 << pin)
+        
+        if native_states:
+            self.native.apply(native_states)
+        for index, olat in latches.items():
+            expander = self.expanders[index]
+            if olat != expander.olat:
+                expander.write(olat)
+
+    def activate(self, gpio_pin: int):
+        self._set(gpio_pin, True)
+
+    def deactivate(self, gpio_pin: int):
+        self._set(gpio_pin, False)
+
+    def get_state(self, gpio_pin: int) -> bool:
+        index, pin = split_pin(gpio_pin)
+        if index is None:
+            return self.native.get_state(gpio_pin)
+        return bool((self._expander(index).olat >> pin) & 1)
+
+    def cleanup(self):
+        """Switch every expander relay off and release native GPIO."""
+        for expander in self.expanders:
+            try:
+                expander.write(0)
+            except OSError as e:
+                logger.error("Error resetting expander 0x%02x: %s", expander.address, e)
+        self.native.cleanup()
@@ -0,0 +1,112 @@
+import threading
+from collections import deque
+from statistics import median
+from typing import Dict, Optional
+from ..config import settings
+
+# DS18B20 power-on reset value and the common "disconnected" error value
+BAD_VALUES = (85.0, -127.0)
+# DS18B20 measuring range
+MIN_TEMP = -55.0
+MAX_TEMP = 125.0
+
+
+class SensorFilter:
+    """
+    Filtering pipeline for one sensor.
+
+    Each raw sample goes through known-bad-value and range rejection, a
+    rate-of-change limit against the last accepted sample, a median over
+    the last SENSOR_FILTER_WINDOW accepted samples, and optional
+    exponential smoothing. Rejected samples return None.
+    """
+
+    def __init__(self, window: int, max_rate: float, ema_alpha: float):
+        self.samples = deque(maxlen=max(1, window))  # accepted raw values
+        self.max_rate = max_rate  # degrees C per second; 0 disables the limit
+        self.ema_alpha = ema_alpha  # 0 disables smoothing
+        self.last_value: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.rate_rejections_in_row = 0
+        self.smoothed: Optional[float] = None
+        self.counters = {
+            'accepted': 0,
+            'bad_value': 0,
+            'out_of_range': 0,
+            'rate_limited': 0,
+        }
+
+    def reset(self):
+        """Drop history, e.g. after the temperature legitimately jumped."""
+        self.samples.clear()
+        self.last_value = None
+        self.last_time = None
+        self.smoothed = None
+
+    def process(self, value: float, now: float) -> Optional[float]:
+        """Filter one raw sample taken at monotonic time now."""
+        if value in BAD_VALUES:
+            self.counters['bad_value'] += 1
+            return None
+        if not MIN_TEMP <= value <= MAX_TEMP:
+            self.counters['out_of_range'] += 1
+            return None
+
+        if self.max_rate and self.last_time is not None and now > self.last_time:
+            rate = abs(value - self.last_value) / (now - self.last_time)
+            if rate > self.max_rate:
+                self.rate_rejections_in_row += 1
+                if self.rate_rejections_in_row < max(2, self.samples.maxlen):
+                    self.counters['rate_limited'] += 1
+                    return None
+                # The new level has persisted for a full window; it is real, start over from it
+                self.reset()
+        self.rate_rejections_in_row = 0
+
+        self.counters['accepted'] += 1
+        self.samples.append(value)
+        self.last_value = value
+        self.last_time = now
+
+        filtered = median(self.samples)
+        if self.ema_alpha:
+            if self.smoothed is None:
+                self.smoothed = filtered
+            else:
+                self.smoothed += self.ema_alpha * (filtered - self.smoothed)
+            filtered = self.smoothed
+        return round(filtered, 2)
+
+
+class SensorFilterBank:
+    """Per-sensor filters with their rejection counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filters: Dict[str, SensorFilter] = {}
+
+    def process(self, sensor_id: str, value: Optional[float], now: float) -> Optional[float]:
+        """Filter a reading; None readings (failed reads) pass straight through."""
+        if value is None:
+            return None
+
+        with self.lock:
+            sensor_filter = self.filters.get(sensor_id)
+            if sensor_filter is None:
+                sensor_filter = SensorFilter(
+                    settings.sensor_filter_window,
+                    settings.sensor_max_rate / 60.0,
+                    settings.sensor_ema_alpha
+                )
+                self.filters[sensor_id] = sensor_filter
+            return sensor_filter.process(value, now)
+
+    def forget(self, sensor_id: str):
+        """Drop a sensor's history when its batch ends."""
+        with self.lock:
+            self.filters.pop(sensor_id, None)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Accepted and rejected sample counts per sensor."""
+        with self.lock:
+            return {sensor_id: dict(sensor_filter.counters) for sensor_id, sensor_filter in self.filters.items()}
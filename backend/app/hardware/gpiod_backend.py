@@ -0,0 +1,92 @@
+from .base import RelayInterface
+
+try:
+    import gpiod
+    from gpiod.line import Direction, Value
+    GPIOD_AVAILABLE = True
+except ImportError:
+    GPIOD_AVAILABLE = False
+
+
+class GpiodRelayInterface(RelayInterface):
+    """
+    Relay interface on the GPIO character device (libgpiod v2).
+
+    Lines are requested once at startup for every fermenter, so a tick's
+    changes normally go out with one set_values call. Pins added later get
+    a line request of their own: lines cannot be added to an open request,
+    and releasing it to request a larger one would drop every active relay
+    for a moment. Pins are line offsets on GPIO_CHIP, which match BCM
+    numbers on /dev/gpiochip0 of a Raspberry Pi. A gpio-sim chip can stand
+    in for real hardware on any Linux host.
+    """
+
+    def __init__(self, chip_path: str):
+        if not GPIOD_AVAILABLE:
+            raise ImportError("gpiod (libgpiod v2) not available. Install it or use RELAY_BACKEND=rpi_gpio.")
+
+        self.chip_path = chip_path
+        self.requests = {}  # gpio_pin -> line request holding it
+        self.pins = {}
+
+    def _request_lines(self, states: dict[int, bool]):
+        """Request new lines as one set, driving them straight to the given states."""
+        config = {
+            gpio_pin: gpiod.LineSettings(
+                direction=Direction.OUTPUT,
+                output_value=Value.ACTIVE if on else Value.INACTIVE
+            )
+            for gpio_pin, on in states.items()
+        }
+        request = gpiod.request_lines(self.chip_path, consumer="brewbuddy", config=config)
+        for gpio_pin in states:
+            self.requests[gpio_pin] = request
+        self.pins.update(states)
+
+    def setup(self, gpio_pin: int):
+        """Setup a line as output, starting off."""
+        self.setup_many([gpio_pin])
+
+    def setup_many(self, gpio_pins: list[int]):
+        """Request lines not held yet; done once at startup for every fermenter."""
+        new_pins = {gpio_pin: False for gpio_pin in gpio_pins if gpio_pin not in self.pins}
+        if new_pins:
+            self._request_lines(new_pins)
+
+    def apply(self, states: dict[int, bool]):
+        """Set several relays with one set_values call per line request involved."""
+        new_pins = {gpio_pin: on for gpio_pin, on in states.items() if gpio_pin not in self.pins}
+        if new_pins:
+            self._request_lines(new_pins)
+
+        by_request = {}
+        for gpio_pin, on in states.items():
+            if gpio_pin not in new_pins:
+                values = by_request.setdefault(self.requests[gpio_pin], {})
+                values[gpio_pin] = Value.ACTIVE if on else Value.INACTIVE
+        for request, values in by_request.items():
+            request.set_values(values)
+        self.pins.update(states)
+
+    def activate(self, gpio_pin: int):
+        """Activate a relay (turn on)."""
+        self.apply({gpio_pin: True})
+
+    def deactivate(self, gpio_pin: int):
+        """Deactivate a relay (turn off)."""
+        self.apply({gpio_pin: False})
+
+    def get_state(self, gpio_pin: int) -> bool:
+        """Get current state of a relay."""
+        return self.pins.get(gpio_pin, False)
+
+    def cleanup(self):
+        """Switch all relays off and release the lines."""
+        by_request = {}
+        for gpio_pin, request in self.requests.items():
+            by_request.setdefault(request, {})[gpio_pin] = Value.INACTIVE
+        for request, values in by_request.items():
+            request.set_values(values)
+            request.release()
+        self.requests.clear()
+        self.pins.clear()
@@ -0,0 +1,93 @@
+import time
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional
+from ..config import settings
+from ..metrics import SENSOR_READ_FAILURES, SENSOR_READ_SECONDS
+
+# Upper bounds (seconds) of the read latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5)
+
+
+class SensorHealth:
+    """Read outcomes and latencies for one sensor."""
+
+    def __init__(self):
+        self.reads = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.recent = deque(maxlen=50)  # True/False per read, for the success rate
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.backoff_until: Optional[float] = None  # monotonic
+        self.last_success: Optional[float] = None  # monotonic
+
+    def to_dict(self, now: float) -> dict:
+        recent = len(self.recent)
+        return {
+            "reads": self.reads,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "success_rate": round(sum(self.recent) / recent, 3) if recent else None,
+            "latency_histogram": {
+                (f"le_{bound}" if i < len(LATENCY_BUCKETS) else "inf"): count
+                for i, (bound, count) in enumerate(zip(LATENCY_BUCKETS + (None,), self.latency_counts))
+            },
+            "backoff_seconds": round(self.backoff_until - now, 1) if self.backoff_until and self.backoff_until > now else 0,
+            "last_success_age": round(now - self.last_success, 1) if self.last_success else None,
+        }
+
+
+class SensorHealthTracker:
+    """
+    Per-sensor health, and backoff for sensors that keep failing.
+
+    After SENSOR_BACKOFF_AFTER consecutive failures a sensor is skipped for
+    one control interval, doubling on each further failure up to
+    SENSOR_BACKOFF_MAX, so a dead probe stops costing bus time every tick.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sensors: Dict[str, SensorHealth] = {}
+
+    def _get(self, sensor_id: str) -> SensorHealth:
+        health = self.sensors.get(sensor_id)
+        if health is None:
+            health = self.sensors[sensor_id] = SensorHealth()
+        return health
+
+    def in_backoff(self, sensor_id: str) -> bool:
+        """Whether reads of this sensor should be skipped for now."""
+        health = self.sensors.get(sensor_id)
+        return bool(health and health.backoff_until and time.monotonic() < health.backoff_until)
+
+    def record(self, sensor_id: str, success: bool, latency: float):
+        """Record the outcome of one physical read."""
+        now = time.monotonic()
+        SENSOR_READ_SECONDS.labels(sensor_id).observe(latency)
+        if not success:
+            SENSOR_READ_FAILURES.labels(sensor_id).inc()
+        with self.lock:
+            health = self._get(sensor_id)
+            health.reads += 1
+            health.recent.append(success)
+            health.latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+            if success:
+                health.consecutive_failures = 0
+                health.backoff_until = None
+                health.last_success = now
+                return
+
+            health.failures += 1
+            health.consecutive_failures += 1
+            excess = health.consecutive_failures - settings.sensor_backoff_after
+            if excess >= 0:
+                delay = min(settings.sensor_backoff_max, settings.control_loop_interval * 2 ** min(excess, 16))
+                health.backoff_until = now + delay
+
+    def get_stats(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        with self.lock:
+            return {sensor_id: health.to_dict(now) for sensor_id, health in self.sensors.items()}
@@ -1,8 +1,18 @@
-from typing import Optional
+import time
+import random
+import threading
+from typing import Dict, Optional
 from ..config import settings
 from .base import SensorInterface, RelayInterface
 from .mock import MockSensorInterface, MockRelayInterface
 from .real import RealSensorInterface, RealRelayInterface
+from .gpiod_backend import GpiodRelayInterface
+from .expander import MCP23017, ExpanderRelayInterface, MockI2CBus, open_i2c_bus
+from .pins import expander_addresses
+from .health import SensorHealthTracker
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class HardwareManager:
@@ -11,19 +21,39 @@ class HardwareManager:
     def __init__(self):
         self.sensor_interface: SensorInterface
         self.relay_interface: RelayInterface
+        self.mock_relay: Optional[MockRelayInterface] = None  # feeds relay changes to the simulation
         
         if settings.hardware_mode == "mock":
-            print("Initializing MOCK hardware interfaces")
+            logger.info("Initializing MOCK hardware interfaces")
             mock_sensor = MockSensorInterface()
             self.sensor_interface = mock_sensor
-            self.relay_interface = MockRelayInterface(mock_sensor)
+            self.relay_interface = self.mock_relay = MockRelayInterface(mock_sensor)
         else:
-            print("Initializing REAL hardware interfaces")
+            logger.info("Initializing REAL hardware interfaces")
             self.sensor_interface = RealSensorInterface()
-            self.relay_interface = RealRelayInterface()
+            if settings.relay_backend == "gpiod":
+                self.relay_interface = GpiodRelayInterface(settings.gpio_chip)
+            else:
+                self.relay_interface = RealRelayInterface()
+        
+        # Relay pins from EXPANDER_PIN_BASE up live on MCP23017 expanders
+        addresses = expander_addresses()
+        if addresses:
+            bus = MockI2CBus() if settings.hardware_mode == "mock" else open_i2c_bus(settings.expander_i2c_bus)
+            self.relay_interface = ExpanderRelayInterface(
+                self.relay_interface,
+                [MCP23017(bus, address) for address in addresses]
+            )
+            logger.info("Using %d GPIO expander(s)", len(addresses))
         
         # Track which relays are set up
         self.setup_pins = set()
+        
+        # Latest reading per sensor, shared by the controller and API requests
+        self.cache_lock = threading.Lock()
+        self.sensor_cache: Dict[str, tuple] = {}  # sensor_id -> (temperature, monotonic timestamp)
+        self.inflight_reads: Dict[str, threading.Event] = {}  # sensor_id -> set when the read finishes
+        self.sensor_health = SensorHealthTracker()
     
     def ensure_pin_setup(self, gpio_pin: int):
         """Ensure a GPIO pin is set up before use."""
@@ -31,9 +61,140 @@ class HardwareManager:
             self.relay_interface.setup(gpio_pin)
             self.setup_pins.add(gpio_pin)
     
+    def setup_relays(self, gpio_pins):
+        """Set up many relay pins at once, e.g. every fermenter's pins at startup."""
+        new_pins = [gpio_pin for gpio_pin in set(gpio_pins) if gpio_pin not in self.setup_pins]
+        if new_pins:
+            self.relay_interface.setup_many(sorted(new_pins))
+            self.setup_pins.update(new_pins)
+    
+    def configure_simulation(
+        self,
+        sensor_id: str,
+        heater_gpio: int,
+        chiller_gpio: int,
+        volume_liters: float,
+        heater_watts: float,
+        chiller_watts: float
+    ):
+        """Describe a fermenter to the mock thermal simulation; does nothing on real hardware."""
+        if not self.mock_relay:
+            return
+        self.mock_relay.attach(sensor_id, heater_gpio, chiller_gpio)
+        self.mock_relay.sensor_interface.simulator.configure(sensor_id, volume_liters, heater_watts, chiller_watts)
+    
     def read_temperature(self, sensor_id: str) -> Optional[float]:
-        """Read temperature from a sensor."""
-        return self.sensor_interface.read_temperature(sensor_id)
+        """
+        Read temperature from a sensor and remember it in the cache.
+        
+        Failed reads (e.g. a CRC mismatch) are retried after a short jittered
+        delay, as long as another attempt fits in SENSOR_READ_TIMEOUT.
+        Sensors in backoff are not read at all.
+        """
+        temp = None
+        if not self.sensor_health.in_backoff(sensor_id):
+            started = time.monotonic()
+            temp = self._read_attempt(sensor_id)
+            if temp is None:
+                temp = self._retry_read(sensor_id, started, time.monotonic() - started)
+        
+        with self.cache_lock:
+            self.sensor_cache[sensor_id] = (temp, time.monotonic())
+        return temp
+    
+    def _read_attempt(self, sensor_id: str) -> Optional[float]:
+        """One physical read of one sensor, recorded in its health."""
+        attempt_started = time.monotonic()
+        temp = self.sensor_interface.read_temperature(sensor_id)
+        self.sensor_health.record(sensor_id, temp is not None, time.monotonic() - attempt_started)
+        return temp
+    
+    def _retry_read(self, sensor_id: str, started: float, latency: float) -> Optional[float]:
+        """
+        Retry a failed read while another attempt fits in the tick's read budget.
+        
+        started is when this tick's reading began and latency how long the
+        last attempt took, used to predict whether one more will fit.
+        """
+        for _ in range(settings.sensor_read_retries):
+            if self.sensor_health.in_backoff(sensor_id):
+                return None
+            elapsed = time.monotonic() - started
+            if elapsed + latency + settings.sensor_retry_delay * 1.5 > settings.sensor_read_timeout:
+                return None
+            time.sleep(settings.sensor_retry_delay * random.uniform(0.5, 1.5))
+            
+            attempt_started = time.monotonic()
+            temp = self._read_attempt(sensor_id)
+            latency = time.monotonic() - attempt_started
+            if temp is not None:
+                return temp
+        return None
+    
+    def supports_bulk_read(self) -> bool:
+        """Whether the sensor backend can convert all sensors at once."""
+        return self.sensor_interface.supports_bulk_read()
+    
+    def read_temperatures(self, sensor_ids: list[str]) -> Dict[str, Optional[float]]:
+        """
+        Read several sensors in one pass (simultaneous conversion where supported).
+        
+        Sensors the bulk pass could not read are retried one at a time, like
+        read_temperature, while time remains in SENSOR_READ_TIMEOUT.
+        """
+        skipped = [sensor_id for sensor_id in sensor_ids if self.sensor_health.in_backoff(sensor_id)]
+        live_ids = [sensor_id for sensor_id in sensor_ids if sensor_id not in skipped]
+        
+        started = time.monotonic()
+        readings = self.sensor_interface.read_many(live_ids) if live_ids else {}
+        latency = time.monotonic() - started
+        for sensor_id, temp in readings.items():
+            self.sensor_health.record(sensor_id, temp is not None, latency)
+        for sensor_id, temp in list(readings.items()):
+            if temp is None:
+                readings[sensor_id] = self._retry_read(sensor_id, started, latency)
+        for sensor_id in skipped:
+            readings[sensor_id] = None
+        
+        now = time.monotonic()
+        with self.cache_lock:
+            for sensor_id, temp in readings.items():
+                self.sensor_cache[sensor_id] = (temp, now)
+        return readings
+    
+    def get_temperature(self, sensor_id: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Latest temperature of a sensor, read physically only if the cached one is too old.
+        
+        max_age defaults to SENSOR_CACHE_TTL. Concurrent misses for the same
+        sensor share one physical read instead of each starting a conversion.
+        """
+        if max_age is None:
+            max_age = settings.sensor_cache_ttl
+        
+        with self.cache_lock:
+            cached = self.sensor_cache.get(sensor_id)
+            if cached and time.monotonic() - cached[1] <= max_age:
+                return cached[0]
+            
+            done = self.inflight_reads.get(sensor_id)
+            leader = done is None
+            if leader:
+                done = self.inflight_reads[sensor_id] = threading.Event()
+        
+        if not leader:
+            # Another caller is already reading this sensor; use its result
+            done.wait(settings.sensor_read_timeout)
+            with self.cache_lock:
+                cached = self.sensor_cache.get(sensor_id)
+            return cached[0] if cached else None
+        
+        try:
+            return self.read_temperature(sensor_id)
+        finally:
+            with self.cache_lock:
+                del self.inflight_reads[sensor_id]
+            done.set()
     
     def get_all_sensors(self) -> list[str]:
         """Get list of all available sensors."""
@@ -43,11 +204,34 @@ class HardwareManager:
         """Activate a relay."""
         self.ensure_pin_setup(gpio_pin)
         self.relay_interface.activate(gpio_pin)
+        if self.mock_relay:
+            self.mock_relay.simulate({gpio_pin: True})
     
     def deactivate_relay(self, gpio_pin: int):
         """Deactivate a relay."""
         self.ensure_pin_setup(gpio_pin)
         self.relay_interface.deactivate(gpio_pin)
+        if self.mock_relay:
+            self.mock_relay.simulate({gpio_pin: False})
+    
+    def apply_relays(self, states: dict[int, bool]):
+        """
+        Switch many relays in one backend operation.
+        
+        Only relays whose state changes are written, switch-offs first.
+        """
+        changes = {
+            gpio_pin: on
+            for gpio_pin, on in states.items()
+            if gpio_pin not in self.setup_pins or self.relay_interface.get_state(gpio_pin) != on
+        }
+        if not changes:
+            return
+        
+        self.setup_relays(changes.keys())
+        self.relay_interface.apply(dict(sorted(changes.items(), key=lambda item: item[1])))
+        if self.mock_relay:
+            self.mock_relay.simulate(changes)
     
     def get_relay_state(self, gpio_pin: int) -> bool:
         """Get current state of a relay."""
@@ -1,66 +1,31 @@
-import random
-import time
+import logging
+from collections import deque
 from typing import Optional
+from ..config import settings
 from .base import SensorInterface, RelayInterface
+from .simulation import ThermalSimulator
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class MockSensorInterface(SensorInterface):
-    """Mock sensor interface for development/testing."""
+    """Mock sensor interface for development/testing, backed by a thermal simulation."""
     
     def __init__(self):
-        self.sensors = {
-            "28-00000001": 18.0,
-            "28-00000002": 19.0,
-            "28-00000003": 20.0,
-            "28-00000004": 21.0,
-        }
-        # Track heating/cooling states for simulation
-        self.heating_pins = set()
-        self.cooling_pins = set()
-        self.last_update = time.time()
-    
-    def set_relay_state(self, heating: bool, cooling: bool):
-        """Called by relay interface to influence temperature simulation."""
-        pass
+        self.simulator = ThermalSimulator(settings.simulation_time_scale)
+        # 28-00000001 at 18.0, 28-00000002 at 19.0, ... cycling through 18-21
+        self.sensors = [f"28-{i:08d}" for i in range(1, settings.mock_sensor_count + 1)]
+        for i, sensor_id in enumerate(self.sensors):
+            self.simulator.add_vessel(sensor_id, 18.0 + i % 4)
     
     def read_temperature(self, sensor_id: str) -> Optional[float]:
-        """Simulate temperature reading with realistic drift."""
-        if sensor_id not in self.sensors:
-            return None
-        
-        # Simulate temperature drift
-        current_time = time.time()
-        time_delta = current_time - self.last_update
-        
-        # Add small random variation
-        variation = random.uniform(-0.1, 0.1) * time_delta
-        self.sensors[sensor_id] += variation
-        
-        # Keep in reasonable range
-        self.sensors[sensor_id] = max(0, min(40, self.sensors[sensor_id]))
-        
-        return round(self.sensors[sensor_id], 2)
+        """Read the simulated fermenter temperature, with sensor noise."""
+        return self.simulator.read(sensor_id)
     
     def get_all_sensors(self) -> list[str]:
         """Return list of mock sensor IDs."""
-        return list(self.sensors.keys())
-    
-    def simulate_heating(self, sensor_id: str, heating: bool, cooling: bool):
-        """Simulate temperature change based on heating/cooling."""
-        if sensor_id not in self.sensors:
-            return
-        
-        if heating:
-            self.sensors[sensor_id] += 0.05  # Heat up slowly
-        elif cooling:
-            self.sensors[sensor_id] -= 0.05  # Cool down slowly
-        else:
-            # Drift toward ambient (20°C)
-            ambient = 20.0
-            if self.sensors[sensor_id] > ambient:
-                self.sensors[sensor_id] -= 0.01
-            elif self.sensors[sensor_id] < ambient:
-                self.sensors[sensor_id] += 0.01
+        return list(self.sensors)
 
 
 class MockRelayInterface(RelayInterface):
@@ -69,26 +34,61 @@ class MockRelayInterface(RelayInterface):
     def __init__(self, sensor_interface: MockSensorInterface):
         self.pins = {}
         self.sensor_interface = sensor_interface
-        self.pin_to_sensor = {}  # Map GPIO pins to sensor IDs for simulation
+        self.pin_to_sensor = {}  # gpio_pin -> (sensor_id, "heater" or "chiller") for simulation
+        self.commits = deque(maxlen=100)  # recent apply() calls, for inspection
+        self.commit_count = 0
+    
+    def attach(self, sensor_id: str, heater_gpio: int, chiller_gpio: int):
+        """Route a fermenter's relays into the thermal simulation of its sensor."""
+        self.pin_to_sensor[heater_gpio] = (sensor_id, "heater")
+        self.pin_to_sensor[chiller_gpio] = (sensor_id, "chiller")
+    
+    def simulate(self, states: dict[int, bool]):
+        """Feed relay changes to the simulation, whichever backend switched them."""
+        for gpio_pin, on in states.items():
+            target = self.pin_to_sensor.get(gpio_pin)
+            if target:
+                self.sensor_interface.simulator.set_relay(target[0], target[1], on)
     
     def setup(self, gpio_pin: int):
         """Setup a mock GPIO pin."""
         self.pins[gpio_pin] = False
-        print(f"[MOCK] GPIO pin {gpio_pin} setup as output")
+        logger.debug("[MOCK] GPIO pin %s setup as output", gpio_pin)
+    
+    def setup_many(self, gpio_pins: list[int]):
+        """Setup several mock GPIO pins."""
+        for gpio_pin in gpio_pins:
+            self.pins[gpio_pin] = False
+        logger.info("[MOCK] %d GPIO pins setup as outputs", len(gpio_pins))
     
     def activate(self, gpio_pin: int):
         """Activate a mock relay."""
         if gpio_pin not in self.pins:
             self.setup(gpio_pin)
+        # Only report changes; the controller re-asserts every relay each tick
+        if not self.pins[gpio_pin]:
+            logger.debug("[MOCK] GPIO pin %s activated (ON)", gpio_pin)
         self.pins[gpio_pin] = True
-        print(f"[MOCK] GPIO pin {gpio_pin} activated (ON)")
     
     def deactivate(self, gpio_pin: int):
         """Deactivate a mock relay."""
         if gpio_pin not in self.pins:
             self.setup(gpio_pin)
+        if self.pins[gpio_pin]:
+            logger.debug("[MOCK] GPIO pin %s deactivated (OFF)", gpio_pin)
         self.pins[gpio_pin] = False
-        print(f"[MOCK] GPIO pin {gpio_pin} deactivated (OFF)")
+    
+    def apply(self, states: dict[int, bool]):
+        """Set several mock relays in one commit."""
+        for gpio_pin in states:
+            if gpio_pin not in self.pins:
+                self.setup(gpio_pin)
+        self.pins.update(states)
+        self.commits.append(dict(states))
+        self.commit_count += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            changes = ", ".join(f"{gpio_pin} {'ON' if on else 'OFF'}" for gpio_pin, on in states.items())
+            logger.debug("[MOCK] GPIO commit: %s", changes)
     
     def get_state(self, gpio_pin: int) -> bool:
         """Get current state of a mock relay."""
@@ -97,6 +97,6 @@ class MockRelayInterface(RelayInterface):
     def cleanup(self):
         """Clean up mock GPIO resources."""
         self.pins.clear()
-        print("[MOCK] GPIO cleanup complete")
+        logger.info("[MOCK] GPIO cleanup complete")
 
 
@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, Optional
+from ..config import settings
+
+EXPANDER_PINS = 16  # MCP23017: two 8-bit ports
+
+
+def expander_addresses() -> list[int]:
+    """I2C addresses of the configured GPIO expanders, in pin-number order."""
+    return [int(address, 0) for address in settings.gpio_expanders.split(",") if address.strip()]
+
+
+def split_pin(gpio_pin: int) -> tuple[Optional[int], int]:
+    """
+    Map a relay pin number to (expander index, pin on that expander).
+
+    Pins below EXPANDER_PIN_BASE are native GPIO and map to (None, pin).
+    From the base up, each expander takes 16 consecutive numbers, so with
+    the default base of 100 pin 117 is pin 1 (port A) of the second chip.
+    """
+    if gpio_pin < settings.expander_pin_base:
+        return None, gpio_pin
+    offset = gpio_pin - settings.expander_pin_base
+    return offset // EXPANDER_PINS, offset % EXPANDER_PINS
+
+
+class PinRegistry:
+    """
+    Owners of relay pins and sensors, with O(1) conflict lookups.
+
+    Keys include the controller node, since fermenters on different nodes
+    are wired to different boards and may reuse the same pin numbers.
+    """
+
+    def __init__(self):
+        self.pins: Dict[tuple, tuple] = {}  # (node_id, gpio_pin) -> (fermenter_id, relay_type)
+        self.sensors: Dict[tuple, int] = {}  # (node_id, sensor_id) -> fermenter_id
+        self.fermenter_ids: set[int] = set()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "PinRegistry":
+        """Build from (id, node_id, heater_gpio, chiller_gpio, sensor_id) rows."""
+        registry = cls()
+        for row in rows:
+            registry.add(*row)
+        return registry
+
+    def add(self, fermenter_id: int, node_id: Optional[str], heater_gpio: int, chiller_gpio: int, sensor_id: str):
+        """Register a fermenter's pins and sensor."""
+        self.fermenter_ids.add(fermenter_id)
+        self.pins[(node_id, heater_gpio)] = (fermenter_id, "heater")
+        self.pins[(node_id, chiller_gpio)] = (fermenter_id, "chiller")
+        self.sensors[(node_id, sensor_id)] = fermenter_id
+
+    def find_conflict(
+        self,
+        node_id: Optional[str],
+        heater_gpio: int,
+        chiller_gpio: int,
+        sensor_id: str,
+        exclude_id: Optional[int] = None
+    ) -> Optional[str]:
+        """Describe the first conflict with another fermenter, or None if the wiring is free."""
+        if heater_gpio == chiller_gpio:
+            return f"Heater and chiller cannot share GPIO pin {heater_gpio}"
+
+        for gpio_pin in (heater_gpio, chiller_gpio):
+            owner = self.pins.get((node_id, gpio_pin))
+            if owner and owner[0] != exclude_id:
+                return f"GPIO pin {gpio_pin} already in use by fermenter {owner[0]} ({owner[1]})"
+
+        owner_id = self.sensors.get((node_id, sensor_id))
+        if owner_id is not None and owner_id != exclude_id:
+            return f"Sensor {sensor_id} already in use by fermenter {owner_id}"
+        return None
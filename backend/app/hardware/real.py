@@ -1,7 +1,10 @@
 import os
-import glob
+import time
 from typing import Optional
+from ..config import settings
 from .base import SensorInterface, RelayInterface
+from .discovery import SensorDiscovery
+from ..logging_config import RateLimitedLogger, get_logger
 
 try:
     import RPi.GPIO as GPIO
@@ -9,16 +12,18 @@ try:
 except ImportError:
     GPIO_AVAILABLE = False
 
+logger = get_logger(__name__)
+errors = RateLimitedLogger(logger)  # a dead probe fails on every attempt
+
 
 class RealSensorInterface(SensorInterface):
     """Real DS18B20 1-wire sensor interface for Raspberry Pi."""
     
     def __init__(self):
-        self.base_dir = '/sys/bus/w1/devices/'
-        # Load kernel modules if not already loaded
-        if os.path.exists(self.base_dir):
-            os.system('modprobe w1-gpio')
-            os.system('modprobe w1-therm')
+        self.base_dir = settings.w1_base_dir
+        # Enumerates probes once, then follows hotplug; also loads kernel modules in the background
+        self.discovery = SensorDiscovery(self.base_dir, settings.w1_rescan_interval)
+        self.discovery.start()
     
     def _read_temp_raw(self, sensor_id: str) -> list[str]:
         """Read raw temperature data from sensor file."""
@@ -31,7 +36,7 @@ class RealSensorInterface(SensorInterface):
                 lines = f.readlines()
             return lines
         except Exception as e:
-            print(f"Error reading sensor {sensor_id}: {e}")
+            errors.error(("read", sensor_id), "Error reading sensor %s: %s", sensor_id, e, extra={"sensor_id": sensor_id})
             return []
     
     def read_temperature(self, sensor_id: str) -> Optional[float]:
@@ -55,14 +60,71 @@ class RealSensorInterface(SensorInterface):
         temp_c = float(temp_string) / 1000.0
         return round(temp_c, 2)
     
-    def get_all_sensors(self) -> list[str]:
-        """Get list of all connected DS18B20 sensors."""
-        if not os.path.exists(self.base_dir):
+    def _bulk_read_files(self) -> list[str]:
+        """therm_bulk_read attributes of all bus masters (kernel 5.10+)."""
+        if not settings.w1_bulk_read:
             return []
+        paths = [os.path.join(self.base_dir, master, 'therm_bulk_read') for master in self.discovery.bus_masters]
+        return [path for path in paths if os.path.exists(path)]
+    
+    def supports_bulk_read(self) -> bool:
+        return bool(self._bulk_read_files())
+    
+    def _read_temperature_file(self, sensor_id: str) -> Optional[float]:
+        """Read the w1_therm "temperature" attribute (millidegrees C)."""
+        try:
+            with open(os.path.join(self.base_dir, sensor_id, 'temperature'), 'r') as f:
+                return round(int(f.read().strip()) / 1000.0, 2)
+        except (OSError, ValueError):
+            return None
+    
+    def read_many(self, sensor_ids: list[str]) -> dict[str, Optional[float]]:
+        """
+        Convert every sensor on the bus at once, then read the results.
+        
+        Writing "trigger" to therm_bulk_read starts a conversion on all
+        probes; it reads -1 until they finish. The per-sensor temperature
+        files then return the converted values without a second wait, so a
+        full bus takes one conversion time instead of one per sensor.
+        """
+        bulk_files = self._bulk_read_files()
+        if not bulk_files:
+            return super().read_many(sensor_ids)
+        
+        triggered = []
+        for path in bulk_files:
+            try:
+                with open(path, 'w') as f:
+                    f.write('trigger\n')
+                triggered.append(path)
+            except OSError as e:
+                errors.error(("bulk_conversion", path), "Error starting bulk conversion on %s: %s", path, e)
         
-        # Find all directories that start with '28-' (DS18B20 family code)
-        sensor_folders = glob.glob(os.path.join(self.base_dir, '28-*'))
-        return [os.path.basename(folder) for folder in sensor_folders]
+        deadline = time.monotonic() + settings.w1_bulk_read_timeout
+        while triggered and time.monotonic() < deadline:
+            triggered = [path for path in triggered if self._conversion_pending(path)]
+            if triggered:
+                time.sleep(0.05)
+        
+        readings = {}
+        for sensor_id in sensor_ids:
+            temp = self._read_temperature_file(sensor_id)
+            if temp is None:
+                # Not on a bulk-capable master, or no temperature attribute
+                temp = self.read_temperature(sensor_id)
+            readings[sensor_id] = temp
+        return readings
+    
+    def _conversion_pending(self, path: str) -> bool:
+        try:
+            with open(path, 'r') as f:
+                return f.read().strip() == '-1'
+        except OSError:
+            return False
+    
+    def get_all_sensors(self) -> list[str]:
+        """Get list of all connected DS18B20 sensors (28- family code), kept current by discovery."""
+        return list(self.discovery.sensors)
 
 
 class RealRelayInterface(RelayInterface):
@@ -84,6 +146,12 @@ class RealRelayInterface(RelayInterface):
         GPIO.output(gpio_pin, GPIO.LOW)  # Start in off state
         self.pins[gpio_pin] = False
     
+    def setup_many(self, gpio_pins: list[int]):
+        """Setup several GPIO pins as outputs in one call, starting off."""
+        GPIO.setup(list(gpio_pins), GPIO.OUT, initial=GPIO.LOW)
+        for gpio_pin in gpio_pins:
+            self.pins[gpio_pin] = False
+    
     def activate(self, gpio_pin: int):
         """Activate a relay (turn on)."""
         if gpio_pin not in self.pins:
@@ -100,6 +168,16 @@ class RealRelayInterface(RelayInterface):
         GPIO.output(gpio_pin, GPIO.LOW)
         self.pins[gpio_pin] = False
     
+    def apply(self, states: dict[int, bool]):
+        """Set several relays with one GPIO.output call."""
+        new_pins = [gpio_pin for gpio_pin in states if gpio_pin not in self.pins]
+        if new_pins:
+            self.setup_many(new_pins)
+        
+        gpio_pins = list(states)
+        GPIO.output(gpio_pins, [GPIO.HIGH if states[gpio_pin] else GPIO.LOW for gpio_pin in gpio_pins])
+        self.pins.update(states)
+    
     def get_state(self, gpio_pin: int) -> bool:
         """Get current state of a relay."""
         return self.pins.get(gpio_pin, False)
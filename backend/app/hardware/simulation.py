@@ -0,0 +1,163 @@
+"""
+Thermal simulation of fermenters for mock mode.
+
+Each vessel is a lumped thermal mass (its liquid volume as water) coupled
+to ambient air, heated or cooled by its relays at their rated power, and
+warmed by fermentation itself. Over a step of length dt with constant
+power P, the temperature relaxes exactly towards its equilibrium:
+
+    T_eq = T_ambient + P / UA
+    T(t + dt) = T_eq + (T(t) - T_eq) * exp(-UA * dt / C)
+
+so steps can be arbitrarily long, which makes accelerated time
+(SIMULATION_TIME_SCALE) cheap. A step is a handful of float operations
+per vessel, so a plain loop over the few vessels is all it needs.
+"""
+import math
+import time
+import random
+import threading
+from typing import Dict, Optional
+from ..config import settings
+
+WATER_HEAT_CAPACITY = 4186.0  # J per kg K, 1 L of wort ~ 1 kg
+DS18B20_RESOLUTION = 0.0625  # 12-bit conversion step
+EXOTHERM_STEP = 600.0  # seconds; fermentation heat is held constant over this much simulated time
+
+
+def exotherm_watts(volume_liters: float, age_seconds: float) -> float:
+    """
+    Heat released by fermentation, a gamma-shaped curve peaking at
+    SIMULATION_EXOTHERM_PEAK_HOURS after pitching with
+    SIMULATION_EXOTHERM_WATTS_PER_LITER.
+    """
+    if age_seconds <= 0:
+        return 0.0
+    x = age_seconds / (settings.simulation_exotherm_peak_hours * 3600)
+    return settings.simulation_exotherm_watts_per_liter * volume_liters * x * math.exp(1 - x)
+
+
+class ThermalSimulator:
+    """Simulated vessels, indexed by the sensor that measures them."""
+
+    def __init__(self, time_scale: float = 1.0):
+        self.lock = threading.Lock()
+        self.time_scale = time_scale
+        self.sim_time = 0.0  # simulated seconds since start
+        self.last_real: Optional[float] = None
+        self.index: Dict[str, int] = {}  # sensor_id -> vessel index
+        self.temps: list[float] = []
+        self.capacity: list[float] = []  # J/K
+        self.ua: list[float] = []  # W/K to ambient
+        self.volume: list[float] = []
+        self.heater_watts: list[float] = []
+        self.chiller_watts: list[float] = []
+        self.heating: list[bool] = []
+        self.cooling: list[bool] = []
+        self.pitched_at: list[Optional[float]] = []  # sim time fermentation started
+
+    def add_vessel(self, sensor_id: str, temp: float, volume_liters: float = 20.0):
+        """Add an idle vessel (no relays, not fermenting) at temp."""
+        with self.lock:
+            if sensor_id in self.index:
+                return
+            self.index[sensor_id] = len(self.temps)
+            self.temps.append(temp)
+            self.capacity.append(0.0)
+            self.ua.append(0.0)
+            self.volume.append(0.0)
+            self.heater_watts.append(0.0)
+            self.chiller_watts.append(0.0)
+            self.heating.append(False)
+            self.cooling.append(False)
+            self.pitched_at.append(None)
+            self._set_volume(self.index[sensor_id], volume_liters)
+
+    def _set_volume(self, i: int, volume_liters: float):
+        self.volume[i] = volume_liters
+        self.capacity[i] = volume_liters * WATER_HEAT_CAPACITY
+        # Heat loss scales with surface area, ~ volume^(2/3)
+        self.ua[i] = settings.simulation_ua_factor * volume_liters ** (2 / 3)
+
+    def configure(self, sensor_id: str, volume_liters: float, heater_watts: float, chiller_watts: float):
+        """Set up a vessel for an active batch; fermentation starts the first time."""
+        self.add_vessel(sensor_id, settings.simulation_ambient_temp, volume_liters)
+        self.sync()
+        with self.lock:
+            i = self.index[sensor_id]
+            self._set_volume(i, volume_liters)
+            self.heater_watts[i] = heater_watts
+            self.chiller_watts[i] = chiller_watts
+            if self.pitched_at[i] is None:
+                self.pitched_at[i] = self.sim_time
+
+    def set_relay(self, sensor_id: str, relay_type: str, on: bool):
+        """Apply a relay change from now on."""
+        self.sync()
+        with self.lock:
+            i = self.index.get(sensor_id)
+            if i is None:
+                return
+            if relay_type == "heater":
+                self.heating[i] = on
+            else:
+                self.cooling[i] = on
+
+    def sync(self):
+        """Advance simulated time to match the real clock scaled by time_scale."""
+        now = time.monotonic()
+        with self.lock:
+            if self.last_real is not None:
+                self._advance((now - self.last_real) * self.time_scale)
+            self.last_real = now
+
+    def advance(self, seconds: float):
+        """Advance simulated time explicitly (for harnesses driving their own clock)."""
+        with self.lock:
+            self._advance(seconds)
+
+    def _advance(self, seconds: float):
+        # Exact for constant power; split only so the fermentation heat can follow its curve
+        while seconds > 0:
+            dt = min(seconds, EXOTHERM_STEP)
+            self._step(dt, self._powers())
+            self.sim_time += dt
+            seconds -= dt
+
+    def _powers(self) -> list[float]:
+        powers = []
+        for i in range(len(self.temps)):
+            power = 0.0
+            if self.heating[i]:
+                power += self.heater_watts[i]
+            if self.cooling[i]:
+                power -= self.chiller_watts[i]
+            if self.pitched_at[i] is not None:
+                power += exotherm_watts(self.volume[i], self.sim_time - self.pitched_at[i])
+            powers.append(power)
+        return powers
+
+    def _step(self, dt: float, powers: list[float]):
+        ambient = settings.simulation_ambient_temp
+        for i, temp in enumerate(self.temps):
+            equilibrium = ambient + powers[i] / self.ua[i]
+            self.temps[i] = equilibrium + (temp - equilibrium) * math.exp(-self.ua[i] * dt / self.capacity[i])
+
+    def read(self, sensor_id: str) -> Optional[float]:
+        """Current temperature with sensor noise and DS18B20 quantization, or None if unknown."""
+        self.sync()
+        with self.lock:
+            i = self.index.get(sensor_id)
+            if i is None:
+                return None
+            temp = self.temps[i]
+
+        if settings.simulation_noise:
+            temp += random.gauss(0, settings.simulation_noise)
+        return round(round(temp / DS18B20_RESOLUTION) * DS18B20_RESOLUTION, 4)
+
+    def get_true_temperature(self, sensor_id: str) -> Optional[float]:
+        """Noise-free temperature, for measuring control quality."""
+        with self.lock:
+            i = self.index.get(sensor_id)
+            return self.temps[i] if i is not None else None
@@ -3,7 +3,7 @@ Initialize database with default user and settings.
 Run this script once after first installation.
 """
 from sqlalchemy.orm import Session
-from .database import SessionLocal, engine, Base
+from .database import SessionLocal, init_db
 from . import models, auth
 
 
@@ -51,8 +51,8 @@ def initialize_database():
     """Initialize the database with all tables and default data."""
     print("Initializing BrewBuddy database...")
     
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Create or upgrade tables
+    init_db()
     print("[OK] Database tables created")
     
     # Create session
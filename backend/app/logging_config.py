@@ -0,0 +1,105 @@
+"""
+Application logging.
+
+Every module logs through get_logger(__name__). Records go onto an
+in-memory queue and a single listener thread formats and writes them, so
+the control loop never blocks on stdout. Level gating happens before a
+record is created: with LOG_LEVEL=INFO a debug call costs one comparison,
+provided arguments are passed %-style rather than pre-formatted.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Hashable, Optional
+from .config import settings
+
+ROOT_LOGGER = "app"
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with extra= and belongs in JSON output
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed with extra=."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        # The QueueHandler has already appended any traceback to the message
+        return json.dumps(entry, default=str)
+
+
+def setup_logging():
+    """Route the app's loggers through a queue to one writer thread. Safe to call repeatedly."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        records = queue.SimpleQueue()
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        _listener = QueueListener(records, stream)
+        _listener.start()
+        atexit.register(_listener.stop)  # drains whatever is still queued
+
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.setLevel(settings.log_level)
+        logger.addHandler(QueueHandler(records))
+        logger.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module under app/, with logging set up on first use."""
+    setup_logging()
+    return logging.getLogger(name)
+
+
+class RateLimitedLogger:
+    """
+    Logs an error that keeps repeating once per LOG_ERROR_REPEAT_INTERVAL.
+
+    The first occurrence of a key is logged straight away; repeats within
+    the interval are only counted, and the count is reported with the next
+    occurrence logged after it. A failing sensor or database then costs a
+    line every few minutes instead of one per tick.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.last_logged: Dict[Hashable, float] = {}  # key -> monotonic time
+        self.suppressed: Dict[Hashable, int] = {}
+
+    def error(self, key: Hashable, msg: str, *args, exc_info=None, **kwargs):
+        now = time.monotonic()
+        with self.lock:
+            last = self.last_logged.get(key)
+            if last is not None and now - last < settings.log_error_repeat_interval:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return
+            self.last_logged[key] = now
+            suppressed = self.suppressed.pop(key, 0)
+
+        if suppressed:
+            msg += " (%d repeats suppressed)"
+            args += (suppressed,)
+        self.logger.error(msg, *args, exc_info=exc_info, **kwargs)
@@ -1,9 +1,13 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-from .database import engine, Base
+from .database import init_db
 from .controllers.temperature_controller import temperature_controller
 from . import models
+from .metrics import CONTENT_TYPE, REGISTRY, RequestMetricsMiddleware, render
+from .profiler import RequestProfilerMiddleware
 from .routers import (
     auth,
     fermenters,
@@ -13,16 +17,13 @@ from .routers import (
     settings,
     system,
     alerts,
-    extras
+    extras,
+    nodes
 )
 from .config import settings as app_settings
+from .logging_config import get_logger
 
-
-# Create database tables
-def init_db():
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
-    print("Database initialized")
+logger = get_logger(__name__)
 
 
 # Lifecycle events
@@ -30,16 +31,18 @@ def init_db():
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
-    print("Starting BrewBuddy API...")
+    logger.info("Starting BrewBuddy API...")
     init_db()
+    logger.info("Database initialized")
     
-    # Start temperature controller
-    temperature_controller.start()
+    # Start temperature controller (in external mode it runs via app.controller_service)
+    if app_settings.controller_mode == "embedded":
+        temperature_controller.start()
     
     yield
     
     # Shutdown
-    print("Shutting down BrewBuddy API...")
+    logger.info("Shutting down BrewBuddy API...")
     temperature_controller.stop()
 
 
@@ -59,6 +62,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(RequestProfilerMiddleware)  # ?profile=true for admins, PROFILER_REQUEST_ENABLED only
 
 # Include routers
 app.include_router(auth.router)
@@ -70,6 +76,7 @@ app.include_router(settings.router)
 app.include_router(system.router)
 app.include_router(alerts.router)
 app.include_router(extras.router)
+app.include_router(nodes.router)
 
 
 @app.get("/")
@@ -89,6 +96,13 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics for the API and the control loop."""
+    families = REGISTRY.collect() + temperature_controller.get_metrics()
+    return PlainTextResponse(render(families), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,282 @@
+"""
+Prometheus metrics in the text exposition format.
+
+Hot paths only take a lock and add to a number; nothing is formatted until
+/metrics is scraped. Controller metrics live in their own registry so that,
+when the controller runs in another process (CONTROLLER_MODE=external), the
+API can serve the copy the controller publishes to shared memory instead.
+"""
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+# Seconds; suits everything from a cached read to a slow 1-wire conversion
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    """A set of metrics collected together."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def collect(self) -> list[dict]:
+        """Plain (JSON-safe) samples of every metric, the form published to shared memory."""
+        return [metric.collect() for metric in self.metrics]
+
+
+REGISTRY = Registry()  # this process: API requests, WebSockets
+CONTROLLER_REGISTRY = Registry()  # whichever process runs the control loop
+
+
+class Metric(ABC):
+    """A metric family; each set of label values is one child series."""
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.lock = threading.Lock()
+        self.children: Dict[tuple, object] = {}
+        registry.register(self)
+
+    def labels(self, *values):
+        """The series for these label values, created on first use."""
+        child = self.children.get(values)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh series holding this metric's value."""
+        pass
+
+    @abstractmethod
+    def _samples(self) -> list:
+        """[name, labels, value] of every series."""
+        pass
+
+    def collect(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.documentation,
+            "samples": self._samples(),
+        }
+
+
+class _Value:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self) -> list:
+        return [
+            [self.name + "_total", dict(zip(self.labelnames, values)), child.value]
+            for values, child in list(self.children.items())
+        ]
+
+
+class Gauge(Metric):
+    """A value that goes up and down; with a callback it is read at scrape time instead."""
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback: Optional[Callable[[], float]] = None
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, callback: Callable[[], float]):
+        self.callback = callback
+
+    def _samples(self) -> list:
+        if self.callback is not None:
+            return [[self.name, {}, float(self.callback())]]
+        return [
+            [self.name, dict(zip(self.labelnames, values)), child.value]
+            for values, child in list(self.children.items())
+        ]
+
+
+class _HistogramValue:
+    def __init__(self, buckets: tuple):
+        self.lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: tuple = DEFAULT_BUCKETS, **kwargs):
+        self.buckets = buckets
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self) -> list:
+        samples = []
+        for values, child in list(self.children.items()):
+            labels = dict(zip(self.labelnames, values))
+            with child.lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                samples.append([self.name + "_bucket", {**labels, "le": str(bound)}, cumulative])
+            samples.append([self.name + "_sum", labels, total])
+            samples.append([self.name + "_count", labels, cumulative])
+        return samples
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def render(families: list[dict]) -> str:
+    """Format collected metrics in the Prometheus text exposition format."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family['name']} {_escape(family['help'])}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for name, labels, value in family["samples"]:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}")
+            else:
+                lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each HTTP request by method and route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router records the matched route in the scope; templates keep the label set small
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], getattr(route, "path", "unmatched")).observe(
+                time.perf_counter() - started
+            )
+
+
+# API process
+HTTP_REQUEST_SECONDS = Histogram(
+    "brewbuddy_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route")
+)
+WEBSOCKET_SEND_SECONDS = Histogram(
+    "brewbuddy_websocket_send_duration_seconds",
+    "Time to send one dashboard update to one WebSocket client"
+)
+WEBSOCKET_CLIENTS = Gauge("brewbuddy_websocket_clients", "Connected dashboard WebSocket clients")
+
+# Controller process
+CONTROL_TICK_SECONDS = Histogram(
+    "brewbuddy_control_tick_duration_seconds",
+    "Duration of one control loop tick",
+    registry=CONTROLLER_REGISTRY
+)
+SENSOR_READ_SECONDS = Histogram(
+    "brewbuddy_sensor_read_duration_seconds",
+    "Latency of one physical sensor read attempt",
+    ("sensor",),
+    registry=CONTROLLER_REGISTRY
+)
+SENSOR_READ_FAILURES = Counter(
+    "brewbuddy_sensor_read_failures",
+    "Sensor read attempts that returned no temperature",
+    ("sensor",),
+    registry=CONTROLLER_REGISTRY
+)
+RELAY_TRANSITIONS = Counter(
+    "brewbuddy_relay_transitions",
+    "Relay state changes commanded by the controller",
+    ("relay_type", "state"),
+    registry=CONTROLLER_REGISTRY
+)
+DB_COMMIT_SECONDS = Histogram(
+    "brewbuddy_db_commit_duration_seconds",
+    "Latency of the controller's batched database commits",
+    ("operation",),
+    registry=CONTROLLER_REGISTRY
+)
+LOG_BUFFER_ROWS = Gauge(
+    "brewbuddy_log_buffer_rows",
+    "Temperature log rows waiting for the next batched write",
+    registry=CONTROLLER_REGISTRY
+)
+PENDING_SENSOR_READS = Gauge(
+    "brewbuddy_pending_sensor_reads",
+    "Sensor reads still in flight from earlier ticks",
+    registry=CONTROLLER_REGISTRY
+)
@@ -26,18 +26,51 @@ class Fermenter(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     size_liters = Column(Float, nullable=False)
-    heater_gpio = Column(Integer, nullable=False)
-    chiller_gpio = Column(Integer, nullable=False)
-    sensor_id = Column(String(100), nullable=False)
+    heater_gpio = Column(Integer, nullable=False, index=True)
+    chiller_gpio = Column(Integer, nullable=False, index=True)
+    sensor_id = Column(String(100), nullable=False, index=True)
     status = Column(String(20), default="clean")  # in_use, clean, needs_cleaning, maintenance
     last_maintenance = Column(DateTime(timezone=True))
     relay_cycle_count = Column(Integer, default=0)
+    heater_watts = Column(Float)  # falls back to DEFAULT_HEATER_WATTS when unset
+    chiller_watts = Column(Float)  # falls back to DEFAULT_CHILLER_WATTS when unset
+    control_mode = Column(String(20), default="hysteresis")  # hysteresis, pid
+    pid_kp = Column(Float)  # duty per degree C of error
+    pid_ki = Column(Float)  # duty per degree C second
+    pid_kd = Column(Float)  # duty per degree C per second
+    node_id = Column(String(50), index=True)  # controller node driving it; None: the API's own controller
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     batches = relationship("Batch", back_populates="fermenter")
     alert_rules = relationship("AlertRule", back_populates="fermenter", cascade="all, delete-orphan")
     maintenance_schedule = relationship("MaintenanceSchedule", back_populates="fermenter", cascade="all, delete-orphan")
+    relay_stats = relationship("RelayStats", back_populates="fermenter", cascade="all, delete-orphan")
+
+
+class RelayStats(Base):
+    __tablename__ = "relay_stats"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    fermenter_id = Column(Integer, ForeignKey("fermenters.id", ondelete="CASCADE"), nullable=False, index=True)
+    gpio_pin = Column(Integer, nullable=False)
+    relay_type = Column(String(20), nullable=False)  # heater, chiller
+    cycle_count = Column(Integer, default=0)  # off -> on transitions
+    on_seconds = Column(Float, default=0)  # cumulative time energized
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    fermenter = relationship("Fermenter", back_populates="relay_stats")
+
+
+class Node(Base):
+    __tablename__ = "nodes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    node_id = Column(String(50), unique=True, index=True, nullable=False)
+    address = Column(String(100))  # last address the node synced from
+    last_seen_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class BeerProfile(Base):
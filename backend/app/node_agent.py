@@ -0,0 +1,57 @@
+"""
+Run a controller node agent.
+
+A node agent drives only the fermenters assigned to it on the coordinator
+(PUT /api/nodes/fermenters/{id}) and has no database of its own: it pulls
+its active batches every NODE_SYNC_INTERVAL seconds and pushes buffered
+logs and relay counters back in compressed batches. Several agents can run
+on one host, each with its own NODE_ID. Run with:
+
+    NODE_ID=pi-1 NODE_TOKEN=... COORDINATOR_URL=http://brewery:8000 python -m app.node_agent
+"""
+import signal
+import sys
+import threading
+from .config import settings
+from .controllers.fleet import CoordinatorStore
+from .controllers.temperature_controller import temperature_controller
+from .logging_config import get_logger
+
+logger = get_logger("app.node_agent")  # __name__ is "__main__" under python -m
+
+
+def run_node_agent():
+    """Start the controller against the coordinator and block until SIGINT/SIGTERM."""
+    if not settings.node_id or not settings.node_token:
+        logger.error("NODE_ID and NODE_TOKEN must be set to run a node agent")
+        sys.exit(1)
+
+    # Keep the controller's lock, socket and shared memory apart from other agents on this host
+    settings.controller_lock_path = f"/tmp/brewbuddy-node-{settings.node_id}.lock"
+    settings.controller_socket_path = f"/tmp/brewbuddy-node-{settings.node_id}.sock"
+    settings.controller_shm_name = f"brewbuddy_node_{settings.node_id}"
+
+    store = CoordinatorStore(
+        settings.node_id,
+        settings.coordinator_url,
+        settings.node_token,
+        temperature_controller.get_node_status
+    )
+    temperature_controller.store = store
+
+    if not temperature_controller.start():
+        logger.error("Node %s is already running on this host, exiting", settings.node_id)
+        sys.exit(1)
+
+    shutdown = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: shutdown.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+
+    logger.info("Node agent %s reporting to %s, press Ctrl+C to stop", settings.node_id, settings.coordinator_url)
+    shutdown.wait()
+    temperature_controller.stop()
+    store.close()
+
+
+if __name__ == "__main__":
+    run_node_agent()
@@ -0,0 +1,199 @@
+"""
+Sampling profiler for diagnosing a slow Pi without restarting it.
+
+A background thread snapshots the stack of every thread in the process
+with sys._current_frames() at a fixed interval and counts identical
+stacks. Nothing is hooked into the profiled code, so overhead is one stack
+walk per thread per sample and stops completely when the session ends.
+Output is the collapsed-stack format ("thread;outer;inner count"), which
+flamegraph.pl, speedscope and inferno render directly.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse
+from .config import settings
+
+MAX_DEPTH = 128  # frames kept per stack, innermost first; deeper recursion is truncated
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(_APP_ROOT):
+        path = os.path.relpath(path, _APP_ROOT)
+    else:
+        path = os.path.basename(path)
+    # co_qualname is new in 3.11; ';' separates frames in the collapsed format
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """One profiling session over all threads of this process."""
+
+    def __init__(self, interval: float, duration: float):
+        self.interval = interval
+        self.duration = duration
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """End the session early; returns once the last sample is counted."""
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        deadline = self.started_at + self.duration
+        next_sample = self.started_at
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            self._sample(own_ident)
+            next_sample += self.interval
+            if next_sample < now:
+                next_sample = now  # fell behind (GIL contention); don't burst to catch up
+            self.stop_event.wait(next_sample - time.monotonic())
+        self.stopped_at = time.monotonic()
+
+    def _sample(self, own_ident: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels = []
+            while frame is not None and len(labels) < MAX_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """Counted stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def get_status(self) -> dict:
+        end = self.stopped_at if self.stopped_at is not None else time.monotonic()
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "duration": self.duration,
+            "elapsed_seconds": round(end - self.started_at, 2) if self.started_at is not None else 0,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+        }
+
+
+# One session at a time; the last one is kept until the next starts
+_lock = threading.Lock()
+_session: Optional[SamplingProfiler] = None
+
+
+def start_session(duration: float, interval: Optional[float] = None) -> Optional[SamplingProfiler]:
+    """Start a session stopping itself after duration seconds; None if one is already running."""
+    global _session
+    with _lock:
+        if _session is not None and _session.running:
+            return None
+        _session = SamplingProfiler(interval or settings.profiler_interval, duration)
+        _session.start()
+        return _session
+
+
+def get_session() -> Optional[SamplingProfiler]:
+    """The running or most recently finished session."""
+    return _session
+
+
+def _is_admin(authorization: str) -> bool:
+    """Whether an Authorization header carries a valid admin bearer token."""
+    # Imported here so the sampler itself stays usable without the auth stack
+    from . import auth
+    from .database import SessionLocal
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    db = SessionLocal()
+    try:
+        return auth.get_current_admin_user(auth.get_current_user(token, db)) is not None
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+class RequestProfilerMiddleware:
+    """
+    ASGI middleware for PROFILER_REQUEST_ENABLED: ?profile=true from an
+    admin samples the process while that request runs and replies with the
+    collapsed stacks instead of the normal body, keeping its status code.
+    Anyone else gets the normal response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not settings.profiler_request_enabled
+            or scope["type"] != "http"
+            or parse_qs(scope.get("query_string", b"").decode()).get("profile") != ["true"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if not await run_in_threadpool(_is_admin, authorization):
+            await self.app(scope, receive, send)
+            return
+
+        session = start_session(settings.profiler_max_seconds)
+        if session is None:
+            response = PlainTextResponse("Another profiling session is running", status_code=409)
+            await response(scope, receive, send)
+            return
+
+        status = {}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            # Joins the sampler thread; keep that wait off the event loop
+            await run_in_threadpool(session.stop)
+        code = status.get("code", 500)
+        response = PlainTextResponse(
+            session.collapsed(),
+            status_code=code,
+            headers={"X-Profiled-Status": str(code), "X-Profile-Samples": str(session.samples)}
+        )
+        await response(scope, receive, send)
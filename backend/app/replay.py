@@ -0,0 +1,284 @@
+"""
+Replay fermentation profiles against the simulated hardware, faster than real time.
+
+Drives the temperature controller tick by tick on a ManualClock, with no
+database, IPC or control thread, while the mock thermal simulation moves
+in step. A 3-week profile takes seconds to minutes instead of 3 weeks.
+Reports control quality per fermenter (error against target measured on
+the simulated true temperature, time in band, relay cycles, energy) and
+controller throughput. Mock mode only. Run with:
+
+    HARDWARE_MODE=mock python -m app.replay --fermenters 8 --control-mode pid
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from .clock import ManualClock
+from .config import settings
+from .controllers.registry import ActiveBatchRecord, ActiveBatchRegistry, PhaseRecord
+from .controllers.temperature_controller import TemperatureController
+from .hardware.manager import hardware_manager
+from .hardware.simulation import ThermalSimulator
+from .logging_config import ROOT_LOGGER, setup_logging
+
+# Primary at 18, free rise to 19, diacetyl rest at 21, then conditioning at 12: 21 days
+DEFAULT_PHASES = "120:18,72:19,48:21,264:12"
+
+
+class MemoryStore:
+    """Controller store serving a fixed set of batches; persisted output is only counted."""
+
+    reconcile_interval = math.inf
+
+    def __init__(self, records: Dict[int, ActiveBatchRecord]):
+        self.records = records
+        self.log_rows = 0
+        self.relay_cycles: Dict[int, int] = {}  # gpio_pin -> cycles flushed so far
+        self.energy_costs: Dict[int, float] = {}
+
+    def reconcile(self, registry: ActiveBatchRegistry):
+        registry.replace_all(self.records)
+
+    def refresh(self, registry: ActiveBatchRegistry, kind: str, entity_id: int):
+        pass
+
+    def load_relay_pins(self) -> List[int]:
+        return [gpio_pin for record in self.records.values() for gpio_pin in (record.heater_gpio, record.chiller_gpio)]
+
+    def load_energy(self, batch_id: int) -> float:
+        return 0.0
+
+    def save_energy_costs(self, costs: Dict[int, float]):
+        self.energy_costs.update(costs)
+
+    def save_logs(self, rows: List[dict]):
+        self.log_rows += len(rows)
+
+    def save_relay_stats(self, pending: Dict[int, tuple]):
+        for gpio_pin, (_, _, cycles, _) in pending.items():
+            self.relay_cycles[gpio_pin] = self.relay_cycles.get(gpio_pin, 0) + cycles
+
+
+def parse_phases(spec: str) -> tuple[PhaseRecord, ...]:
+    """Parse "hours:temp,hours:temp,..." into profile phases."""
+    phases = []
+    for part in spec.split(","):
+        hours, temp = part.split(":")
+        phases.append(PhaseRecord(duration_hours=float(hours), target_temp=float(temp)))
+    return tuple(phases)
+
+
+def build_records(
+    clock: ManualClock,
+    fermenters: int,
+    phases: tuple[PhaseRecord, ...],
+    control_mode: str = "hysteresis",
+    size_liters: float = 20.0
+) -> Dict[int, ActiveBatchRecord]:
+    """One batch per simulated fermenter, all following the same profile."""
+    return {
+        i: ActiveBatchRecord(
+            batch_id=i,
+            batch_number=f"REPLAY-{i}",
+            profile_id=1,
+            fermenter_id=i,
+            sensor_id=f"28-{i:08d}",
+            heater_gpio=2 * i,
+            chiller_gpio=2 * i + 1,
+            size_liters=size_liters,
+            heater_watts=settings.default_heater_watts,
+            chiller_watts=settings.default_chiller_watts,
+            control_mode=control_mode,
+            pid_kp=None,
+            pid_ki=None,
+            pid_kd=None,
+            start_time=clock.utcnow(),
+            phases=phases,
+        )
+        for i in range(1, fermenters + 1)
+    }
+
+
+def create_controller(clock: ManualClock, records: Dict[int, ActiveBatchRecord]) -> tuple[TemperatureController, MemoryStore]:
+    """A controller on clock serving records from memory, ready for tick() without start()."""
+    store = MemoryStore(records)
+    controller = TemperatureController(store=store, clock=clock)
+    controller.read_pool = ThreadPoolExecutor(
+        max_workers=settings.sensor_read_workers,
+        thread_name_prefix="sensor-read"
+    )
+    hardware_manager.setup_relays(store.load_relay_pins())
+    # The simulation follows the replay clock only, via advance()
+    get_simulator().time_scale = 0
+    return controller, store
+
+
+def get_simulator() -> ThermalSimulator:
+    return hardware_manager.mock_relay.sensor_interface.simulator
+
+
+def advance(clock: ManualClock, seconds: float):
+    """Move the clock and the simulated fermenters forward together."""
+    clock.advance(seconds)
+    get_simulator().advance(seconds)
+
+
+class QualityTracker:
+    """Error of the simulated true temperature against target, for one batch."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.in_band_ticks = 0
+        self.settled_ticks = 0
+        self.error_sum = 0.0
+        self.squared_error_sum = 0.0
+        self.max_error = 0.0
+        self.last_target = None
+        self.target_changed_at = 0.0
+
+    def record(self, true_temp: float, target_temp: float, now: float, band: float, settle_seconds: float):
+        if target_temp != self.last_target:
+            self.last_target = target_temp
+            self.target_changed_at = now
+
+        error = abs(true_temp - target_temp)
+        self.ticks += 1
+        if error <= band:
+            self.in_band_ticks += 1
+        # Ramping to a new target is not a control error; measure once it has had time to get there
+        if now - self.target_changed_at >= settle_seconds:
+            self.settled_ticks += 1
+            self.error_sum += error
+            self.squared_error_sum += error * error
+            self.max_error = max(self.max_error, error)
+
+    def to_dict(self) -> dict:
+        settled = self.settled_ticks
+        return {
+            "time_in_band_pct": round(self.in_band_ticks / self.ticks * 100, 2) if self.ticks else None,
+            "mean_abs_error": round(self.error_sum / settled, 3) if settled else None,
+            "rms_error": round(math.sqrt(self.squared_error_sum / settled), 3) if settled else None,
+            "max_settled_error": round(self.max_error, 3),
+        }
+
+
+def run_replay(args) -> dict:
+    """Run the profile to its end and return the metrics."""
+    clock = ManualClock()
+    records = build_records(clock, args.fermenters, parse_phases(args.phases), args.control_mode, args.size_liters)
+    controller, store = create_controller(clock, records)
+    simulator = get_simulator()
+
+    tick_seconds = args.tick_seconds or settings.control_loop_interval
+    total_seconds = sum(phase.duration_hours for phase in records[1].phases) * 3600
+    ticks = int(total_seconds / tick_seconds)
+    quality = {batch_id: QualityTracker() for batch_id in records}
+    durations = []
+
+    started = time.perf_counter()
+    try:
+        for _ in range(ticks):
+            tick_started = time.perf_counter()
+            controller.tick()
+            durations.append(time.perf_counter() - tick_started)
+
+            now = clock.monotonic()
+            for batch_id, state in controller.active_batches.items():
+                if state.target_temp is not None:
+                    true_temp = simulator.get_true_temperature(state.record.sensor_id)
+                    quality[batch_id].record(true_temp, state.target_temp, now, args.band, args.settle_hours * 3600)
+
+            advance(clock, tick_seconds)
+    finally:
+        controller.read_pool.shutdown(wait=False, cancel_futures=True)
+    wall_seconds = time.perf_counter() - started
+
+    batches = {}
+    for batch_id, record in records.items():
+        relay_cycles = {
+            relay_type: store.relay_cycles.get(gpio_pin, 0) + controller.relay_stats.get_pending(gpio_pin)['cycles']
+            for relay_type, gpio_pin in (("heater", record.heater_gpio), ("chiller", record.chiller_gpio))
+        }
+        batches[batch_id] = {
+            **quality[batch_id].to_dict(),
+            "heater_cycles": relay_cycles["heater"],
+            "chiller_cycles": relay_cycles["chiller"],
+            **(controller.energy.get_totals(batch_id) or {}),
+        }
+
+    durations.sort()
+    return {
+        "simulated_hours": round(ticks * tick_seconds / 3600, 2),
+        "tick_seconds": tick_seconds,
+        "control_mode": args.control_mode,
+        "throughput": {
+            "ticks": ticks,
+            "wall_seconds": round(wall_seconds, 3),
+            "ticks_per_second": round(ticks / wall_seconds, 1) if wall_seconds else None,
+            "speedup": round(ticks * tick_seconds / wall_seconds, 1) if wall_seconds else None,
+            "mean_tick_ms": round(sum(durations) / ticks * 1000, 4) if ticks else None,
+            "p99_tick_ms": round(durations[int(ticks * 0.99)] * 1000, 4) if ticks else None,
+            "max_tick_ms": round(durations[-1] * 1000, 4) if ticks else None,
+        },
+        "log_rows": store.log_rows + controller.log_buffer.pending_count(),
+        "batches": batches,
+    }
+
+
+def print_report(report: dict):
+    throughput = report["throughput"]
+    print(
+        f"Replayed {report['simulated_hours']} h ({throughput['ticks']} ticks of {report['tick_seconds']} s, "
+        f"{report['control_mode']}) in {throughput['wall_seconds']} s"
+    )
+    print(
+        f"  {throughput['ticks_per_second']} ticks/s, {throughput['speedup']}x real time, "
+        f"tick mean {throughput['mean_tick_ms']} ms / p99 {throughput['p99_tick_ms']} ms / max {throughput['max_tick_ms']} ms"
+    )
+    print(f"  {report['log_rows']} log rows")
+    print(f"{'batch':>5} {'in band %':>9} {'mae':>7} {'rms':>7} {'max':>7} {'heat cyc':>8} {'chill cyc':>9} {'Wh':>9}")
+    for batch_id, batch in report["batches"].items():
+        print(
+            f"{batch_id:>5} {batch['time_in_band_pct']!s:>9} {batch['mean_abs_error']!s:>7} {batch['rms_error']!s:>7} "
+            f"{batch['max_settled_error']!s:>7} {batch['heater_cycles']:>8} {batch['chiller_cycles']:>9} "
+            f"{batch.get('energy_wh', 0):>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay fermentation profiles on simulated hardware")
+    parser.add_argument("--fermenters", type=int, default=4)
+    parser.add_argument("--phases", default=DEFAULT_PHASES, help='profile as "hours:temp,..." (default: 3 weeks)')
+    parser.add_argument("--control-mode", default="hysteresis", choices=["hysteresis", "pid"])
+    parser.add_argument("--size-liters", type=float, default=20.0)
+    parser.add_argument("--tick-seconds", type=float, default=None, help="default: CONTROL_LOOP_INTERVAL")
+    parser.add_argument("--band", type=float, default=0.5, help="in-band tolerance, degrees C")
+    parser.add_argument("--settle-hours", type=float, default=6.0, help="ignore errors this long after a target change")
+    parser.add_argument("--json", action="store_true", help="print the metrics as JSON")
+    parser.add_argument("--verbose", action="store_true", help="log controller and mock hardware activity at DEBUG")
+    args = parser.parse_args()
+
+    if settings.hardware_mode != "mock":
+        print("Replay runs against the simulated hardware only, set HARDWARE_MODE=mock")
+        sys.exit(1)
+
+    if args.verbose:
+        # Logs go to stderr, so the report on stdout stays readable either way
+        setup_logging()
+        logging.getLogger(ROOT_LOGGER).setLevel(logging.DEBUG)
+
+    report = run_replay(args)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from .. import models, schemas, auth
 from ..database import get_db
+from ..clock import SystemClock, get_clock
 from ..controllers.temperature_controller import temperature_controller
+from ..controllers.energy import energy_cost
 
 router = APIRouter(prefix="/api/batches", tags=["batches"])
 
@@ -112,13 +115,15 @@ def update_batch(
     
     db.commit()
     db.refresh(db_batch)
+    temperature_controller.notify_batch_changed(db, db_batch.id)
     return db_batch
 
 
 @router.post("/{batch_id}/start")
 def start_batch(
     batch_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    clock: SystemClock = Depends(get_clock)
 ):
     """Start a batch (begin fermentation)."""
     batch = db.query(models.Batch).filter(models.Batch.id == batch_id).first()
@@ -133,7 +138,7 @@ def start_batch(
     
     # Update batch status
     batch.status = "active"
-    batch.start_time = datetime.utcnow()
+    batch.start_time = clock.utcnow()
     
     # Update fermenter status
     fermenter = db.query(models.Fermenter).filter(models.Fermenter.id == batch.fermenter_id).first()
@@ -141,13 +146,15 @@ def start_batch(
         fermenter.status = "in_use"
     
     db.commit()
+    temperature_controller.notify_batch_changed(db, batch.id)
     return {"message": "Batch started successfully", "batch_number": batch.batch_number}
 
 
 @router.post("/{batch_id}/stop")
 def stop_batch(
     batch_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    clock: SystemClock = Depends(get_clock)
 ):
     """Stop a batch (complete fermentation)."""
     batch = db.query(models.Batch).filter(models.Batch.id == batch_id).first()
@@ -159,7 +166,7 @@ def stop_batch(
     
     # Update batch status
     batch.status = "complete"
-    batch.end_time = datetime.utcnow()
+    batch.end_time = clock.utcnow()
     
     # Update fermenter status
     fermenter = db.query(models.Fermenter).filter(models.Fermenter.id == batch.fermenter_id).first()
@@ -167,6 +174,7 @@ def stop_batch(
         fermenter.status = "needs_cleaning"
     
     db.commit()
+    temperature_controller.notify_batch_changed(db, batch.id)
     return {"message": "Batch stopped successfully", "batch_number": batch.batch_number}
 
 
@@ -175,19 +183,46 @@ def get_batch_logs(
     batch_id: int,
     limit: int = Query(1000, le=10000),
     hours: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    clock: SystemClock = Depends(get_clock)
 ):
     """Get temperature logs for a batch."""
     query = db.query(models.TemperatureLog).filter(models.TemperatureLog.batch_id == batch_id)
     
     if hours:
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        cutoff = clock.utcnow() - timedelta(hours=hours)
         query = query.filter(models.TemperatureLog.timestamp >= cutoff)
     
     logs = query.order_by(models.TemperatureLog.timestamp.desc()).limit(limit).all()
     return list(reversed(logs))  # Return in chronological order
 
 
+@router.get("/{batch_id}/energy")
+def get_batch_energy(
+    batch_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get estimated energy consumption and cost for a batch."""
+    batch = db.query(models.Batch).filter(models.Batch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    # Active batches are served from the controller's running totals
+    totals = temperature_controller.get_batch_energy(batch_id)
+    if totals:
+        return {"batch_id": batch_id, "live": True, **totals}
+    
+    energy_wh = db.query(func.sum(models.TemperatureLog.power_consumed_wh)).filter(
+        models.TemperatureLog.batch_id == batch_id
+    ).scalar() or 0.0
+    return {
+        "batch_id": batch_id,
+        "live": False,
+        "energy_wh": round(energy_wh, 3),
+        "cost": batch.cost_energy if batch.cost_energy is not None else round(energy_cost(energy_wh), 4)
+    }
+
+
 @router.delete("/{batch_id}")
 def delete_batch(
     batch_id: int,
@@ -5,10 +5,13 @@ from datetime import datetime, timedelta
 import json
 import asyncio
 from .. import models, schemas, auth
-from ..database import get_db, SessionLocal
+from ..database import get_db
 from ..controllers.temperature_controller import temperature_controller
+from ..metrics import WEBSOCKET_CLIENTS, WEBSOCKET_SEND_SECONDS
+from ..logging_config import get_logger
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+logger = get_logger(__name__)
 
 
 def calculate_current_phase(batch: models.Batch, db: Session) -> tuple:
@@ -44,12 +47,12 @@ def get_dashboard(
         models.Batch.status == "active"
     ).all()
     
+    # Live values come from the controller's in-memory snapshot
+    live_states = {state["batch_id"]: state for state in temperature_controller.get_live_state()}
+    
     result = []
     for batch in active_batches:
-        # Get most recent temperature log
-        recent_log = db.query(models.TemperatureLog).filter(
-            models.TemperatureLog.batch_id == batch.id
-        ).order_by(models.TemperatureLog.timestamp.desc()).first()
+        live = live_states.get(batch.id)
         
         # Get recent logs for chart (last hour)
         cutoff = datetime.utcnow() - timedelta(hours=1)
@@ -58,20 +61,22 @@ def get_dashboard(
             models.TemperatureLog.timestamp >= cutoff
         ).order_by(models.TemperatureLog.timestamp.asc()).all()
         
-        # Calculate current phase
-        current_phase, phase_progress = calculate_current_phase(batch, db)
-        
-        # Calculate elapsed time
-        elapsed_hours = None
-        if batch.start_time:
-            elapsed = datetime.utcnow() - batch.start_time
-            elapsed_hours = elapsed.total_seconds() / 3600
+        if live:
+            current_phase, phase_progress = live["current_phase"], live["phase_progress"]
+            elapsed_hours = live["elapsed_hours"]
+        else:
+            # Not picked up by the controller yet
+            current_phase, phase_progress = calculate_current_phase(batch, db)
+            elapsed_hours = None
+            if batch.start_time:
+                elapsed = datetime.utcnow() - batch.start_time
+                elapsed_hours = elapsed.total_seconds() / 3600
         
         status = schemas.DashboardBatchStatus(
             batch=batch,
-            current_temp=recent_log.actual_temp if recent_log else None,
-            target_temp=recent_log.target_temp if recent_log else None,
-            control_state=recent_log.control_state if recent_log else None,
+            current_temp=live["current_temp"] if live else None,
+            target_temp=live["target_temp"] if live else None,
+            control_state=live["control_state"] if live else None,
             current_phase=current_phase,
             phase_progress=phase_progress,
             elapsed_hours=elapsed_hours,
@@ -82,6 +87,12 @@ def get_dashboard(
     return result
 
 
+@router.get("/live")
+def get_live_state():
+    """Get live controller state for all active batches (served from memory)."""
+    return temperature_controller.get_live_state()
+
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -103,6 +114,28 @@ class ConnectionManager:
 
 
 manager = ConnectionManager()
+WEBSOCKET_CLIENTS.set_function(lambda: len(manager.active_connections))
+
+
+async def send_update(websocket: WebSocket):
+    """Send one dashboard update to a client, straight from the controller's snapshot."""
+    timestamp = datetime.utcnow().isoformat()
+    updates = []
+    for live in temperature_controller.get_live_state():
+        updates.append({
+            "batch_id": live["batch_id"],
+            "batch_number": live["batch_number"],
+            "current_temp": live["current_temp"],
+            "target_temp": live["target_temp"],
+            "control_state": live["control_state"],
+            "current_phase": live["current_phase"],
+            "phase_progress": live["phase_progress"],
+            "elapsed_hours": live["elapsed_hours"],
+            "timestamp": timestamp
+        })
+    
+    with WEBSOCKET_SEND_SECONDS.time():
+        await websocket.send_json({"type": "update", "data": updates})
 
 
 @router.websocket("/ws")
@@ -113,47 +146,12 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             # Send updates every 5 seconds
-            db = SessionLocal()
-            try:
-                # Get dashboard data
-                active_batches = db.query(models.Batch).filter(
-                    models.Batch.status == "active"
-                ).all()
-                
-                updates = []
-                for batch in active_batches:
-                    recent_log = db.query(models.TemperatureLog).filter(
-                        models.TemperatureLog.batch_id == batch.id
-                    ).order_by(models.TemperatureLog.timestamp.desc()).first()
-                    
-                    current_phase, phase_progress = calculate_current_phase(batch, db)
-                    
-                    elapsed_hours = None
-                    if batch.start_time:
-                        elapsed = datetime.utcnow() - batch.start_time
-                        elapsed_hours = elapsed.total_seconds() / 3600
-                    
-                    updates.append({
-                        "batch_id": batch.id,
-                        "batch_number": batch.batch_number,
-                        "current_temp": recent_log.actual_temp if recent_log else None,
-                        "target_temp": recent_log.target_temp if recent_log else None,
-                        "control_state": recent_log.control_state if recent_log else None,
-                        "current_phase": current_phase,
-                        "phase_progress": phase_progress,
-                        "elapsed_hours": elapsed_hours,
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                
-                await websocket.send_json({"type": "update", "data": updates})
-            finally:
-                db.close()
-            
+            await send_update(websocket)
             await asyncio.sleep(5)
     
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
         manager.disconnect(websocket)
 
@@ -1,12 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, or_, text
+from typing import List, Optional
 from .. import models, schemas, auth
 from ..database import get_db
+from ..config import settings
+from ..hardware.pins import PinRegistry
+from ..controllers.temperature_controller import temperature_controller
 
 router = APIRouter(prefix="/api/fermenters", tags=["fermenters"])
 
 
+# pg_advisory_xact_lock key serializing fermenter wiring changes across API workers
+FERMENTER_LOCK_KEY = 0x62726577
+
+
+def lock_fermenter_writes(db: Session):
+    """
+    Serialize fermenter creation and rewiring until the transaction ends.
+    
+    SQLite already does this: the first write of a transaction takes its
+    database-wide write lock, so callers flush their change before
+    checking limits and conflicts. PostgreSQL needs an explicit lock.
+    """
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": FERMENTER_LOCK_KEY})
+
+
+def find_wiring_conflict(
+    db: Session,
+    node_id: Optional[str],
+    heater_gpio: int,
+    chiller_gpio: int,
+    sensor_id: str,
+    exclude_id: Optional[int] = None
+) -> Optional[str]:
+    """Describe a clash with another fermenter on the same node, loading only fermenters that could clash."""
+    gpio_pins = (heater_gpio, chiller_gpio)
+    rows = db.query(
+        models.Fermenter.id,
+        models.Fermenter.node_id,
+        models.Fermenter.heater_gpio,
+        models.Fermenter.chiller_gpio,
+        models.Fermenter.sensor_id
+    ).filter(
+        models.Fermenter.node_id == node_id,
+        or_(
+            models.Fermenter.heater_gpio.in_(gpio_pins),
+            models.Fermenter.chiller_gpio.in_(gpio_pins),
+            models.Fermenter.sensor_id == sensor_id
+        )
+    ).all()
+    return PinRegistry.from_rows(rows).find_conflict(node_id, heater_gpio, chiller_gpio, sensor_id, exclude_id)
+
+
 @router.get("/", response_model=List[schemas.Fermenter])
 def list_fermenters(
     db: Session = Depends(get_db)
@@ -32,28 +79,35 @@ def create_fermenter(
     fermenter: schemas.FermenterCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new fermenter (max 4)."""
+    """Create a new fermenter (max MAX_FERMENTERS)."""
+    # Insert first and check in the same transaction, so concurrent creates cannot both pass
+    lock_fermenter_writes(db)
+    db_fermenter = models.Fermenter(**fermenter.model_dump(), status="clean")
+    db.add(db_fermenter)
+    db.flush()
+    
     # Check limit
-    count = db.query(models.Fermenter).count()
-    if count >= 4:
+    count = db.query(func.count(models.Fermenter.id)).scalar()
+    if count > settings.max_fermenters:
+        db.rollback()
         raise HTTPException(
             status_code=400,
-            detail="Maximum of 4 fermenters allowed. Delete one to add another."
+            detail=f"Maximum of {settings.max_fermenters} fermenters allowed. Delete one to add another."
         )
     
-    # Check for duplicate GPIO pins
-    existing = db.query(models.Fermenter).filter(
-        (models.Fermenter.heater_gpio == fermenter.heater_gpio) |
-        (models.Fermenter.chiller_gpio == fermenter.chiller_gpio) |
-        (models.Fermenter.heater_gpio == fermenter.chiller_gpio) |
-        (models.Fermenter.chiller_gpio == fermenter.heater_gpio)
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="GPIO pin already in use")
+    # Check for GPIO pins or sensor already in use (new fermenters start on the API's own controller)
+    conflict = find_wiring_conflict(
+        db,
+        None,
+        fermenter.heater_gpio,
+        fermenter.chiller_gpio,
+        fermenter.sensor_id,
+        exclude_id=db_fermenter.id
+    )
+    if conflict:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=conflict)
     
-    db_fermenter = models.Fermenter(**fermenter.model_dump(), status="clean")
-    db.add(db_fermenter)
     db.commit()
     db.refresh(db_fermenter)
     
@@ -83,13 +137,33 @@ def update_fermenter(
             detail="Cannot modify fermenter while batch is active"
         )
     
-    # Update fields
     update_data = fermenter_update.model_dump(exclude_unset=True)
+    rewired = update_data.keys() & {"heater_gpio", "chiller_gpio", "sensor_id"}
+    if rewired:
+        lock_fermenter_writes(db)
+    
+    # Update fields
     for field, value in update_data.items():
         setattr(db_fermenter, field, value)
     
+    # Write first and check new wiring in the same transaction, like create_fermenter
+    if rewired:
+        db.flush()
+        conflict = find_wiring_conflict(
+            db,
+            db_fermenter.node_id,
+            db_fermenter.heater_gpio,
+            db_fermenter.chiller_gpio,
+            db_fermenter.sensor_id,
+            exclude_id=fermenter_id
+        )
+        if conflict:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=conflict)
+    
     db.commit()
     db.refresh(db_fermenter)
+    temperature_controller.notify_fermenter_changed(db, fermenter_id)
     
     return db_fermenter
 
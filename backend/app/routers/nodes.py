@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Optional
+from datetime import datetime, timedelta
+import secrets
+from .. import models
+from ..database import get_db
+from ..config import settings
+from ..controllers.fleet import decode_payload, node_live_state
+from ..controllers.registry import load_records, record_to_dict
+from ..controllers.store import DatabaseStore
+from ..controllers.temperature_controller import temperature_controller
+from .fermenters import find_wiring_conflict, lock_fermenter_writes
+
+router = APIRouter(prefix="/api/nodes", tags=["nodes"])
+
+store = DatabaseStore()
+
+
+def verify_node_token(x_node_token: str = Header("")):
+    """Node endpoints require the shared NODE_TOKEN."""
+    if not settings.node_token:
+        raise HTTPException(status_code=403, detail="Node agents are disabled (NODE_TOKEN not set)")
+    if not secrets.compare_digest(x_node_token, settings.node_token):
+        raise HTTPException(status_code=403, detail="Invalid node token")
+
+
+async def read_payload(request: Request) -> dict:
+    """
+    The decoded message body of a node push.
+
+    Read in this async dependency so the endpoints themselves can be plain
+    functions: their database work then runs in the threadpool instead of
+    blocking every other request and WebSocket on the event loop.
+    """
+    return decode_payload(await request.body(), request.headers.get("content-encoding"))
+
+
+def node_batch_ids(db: Session, node_id: str) -> set:
+    """Ids of all batches on fermenters assigned to a node."""
+    rows = db.query(models.Batch.id).join(
+        models.Fermenter, models.Fermenter.id == models.Batch.fermenter_id
+    ).filter(models.Fermenter.node_id == node_id).all()
+    return set(batch_id for (batch_id,) in rows)
+
+
+@router.get("/")
+def list_nodes(
+    db: Session = Depends(get_db)
+):
+    """Get all known nodes and the fermenters assigned to them."""
+    online_after = datetime.utcnow() - timedelta(seconds=settings.node_sync_interval * 3)
+    fermenters = db.query(models.Fermenter).filter(models.Fermenter.node_id.isnot(None)).all()
+
+    result = []
+    for node in db.query(models.Node).order_by(models.Node.node_id).all():
+        last_seen = node.last_seen_at.replace(tzinfo=None) if node.last_seen_at else None
+        result.append({
+            "node_id": node.node_id,
+            "address": node.address,
+            "last_seen_at": node.last_seen_at,
+            "online": last_seen is not None and last_seen >= online_after,
+            "fermenter_ids": [f.id for f in fermenters if f.node_id == node.node_id],
+            "last_report": node_live_state.get_node(node.node_id)
+        })
+    return result
+
+
+@router.put("/fermenters/{fermenter_id}")
+def assign_fermenter(
+    fermenter_id: int,
+    node_id: Optional[str] = Body(None, embed=True),
+    db: Session = Depends(get_db)
+):
+    """Assign a fermenter to a node, or back to this API's controller with node_id null."""
+    fermenter = db.query(models.Fermenter).filter(models.Fermenter.id == fermenter_id).first()
+    if not fermenter:
+        raise HTTPException(status_code=404, detail="Fermenter not found")
+
+    active_batch = db.query(models.Batch).filter(
+        models.Batch.fermenter_id == fermenter_id,
+        models.Batch.status == "active"
+    ).first()
+
+    if active_batch:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot reassign fermenter while batch is active"
+        )
+
+    # Pin numbers only have to be unique among fermenters on the same node;
+    # write first and check in the same transaction, like create_fermenter
+    lock_fermenter_writes(db)
+    fermenter.node_id = node_id or None
+    db.flush()
+    conflict = find_wiring_conflict(
+        db,
+        fermenter.node_id,
+        fermenter.heater_gpio,
+        fermenter.chiller_gpio,
+        fermenter.sensor_id,
+        exclude_id=fermenter_id
+    )
+    if conflict:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=conflict)
+
+    db.commit()
+    temperature_controller.notify_fermenter_changed(db, fermenter_id)
+
+    return {"fermenter_id": fermenter_id, "node_id": fermenter.node_id}
+
+
+@router.post("/{node_id}/sync", dependencies=[Depends(verify_node_token)])
+def sync_node(
+    node_id: str,
+    request: Request,
+    status: dict = Depends(read_payload),
+    db: Session = Depends(get_db)
+):
+    """Record a node's live state and return the active batches it should drive."""
+    node_live_state.update(node_id, status)
+
+    node = db.query(models.Node).filter(models.Node.node_id == node_id).first()
+    if not node:
+        node = models.Node(node_id=node_id)
+        db.add(node)
+    node.address = request.client.host if request.client else None
+    node.last_seen_at = datetime.utcnow()
+    db.commit()
+
+    records = load_records(db, node_id)
+    # Energy already logged per batch, used by the node to seed its running totals
+    energy = db.query(
+        models.TemperatureLog.batch_id, func.sum(models.TemperatureLog.power_consumed_wh)
+    ).filter(
+        models.TemperatureLog.batch_id.in_(list(records))
+    ).group_by(models.TemperatureLog.batch_id).all() if records else []
+    return {
+        "records": [record_to_dict(record) for record in records.values()],
+        "energy": {batch_id: energy_wh or 0.0 for batch_id, energy_wh in energy}
+    }
+
+
+@router.get("/{node_id}/pins", dependencies=[Depends(verify_node_token)])
+def get_node_pins(
+    node_id: str,
+    db: Session = Depends(get_db)
+):
+    """Relay pins of every fermenter assigned to a node, set up in bulk when it starts."""
+    rows = db.query(models.Fermenter.heater_gpio, models.Fermenter.chiller_gpio).filter(
+        models.Fermenter.node_id == node_id
+    ).all()
+    return {"pins": [gpio_pin for row in rows for gpio_pin in row]}
+
+
+@router.post("/{node_id}/readings", dependencies=[Depends(verify_node_token)])
+def ingest_readings(
+    node_id: str,
+    data: dict = Depends(read_payload),
+    db: Session = Depends(get_db)
+):
+    """Store a batch of temperature logs, relay counters and energy costs from a node."""
+    # Nodes may only write to batches and fermenters assigned to them
+    batch_ids = node_batch_ids(db, node_id)
+    fermenter_ids = set(
+        fermenter_id for (fermenter_id,) in
+        db.query(models.Fermenter.id).filter(models.Fermenter.node_id == node_id).all()
+    )
+
+    logs = [
+        {**row, 'timestamp': datetime.fromisoformat(row['timestamp'])}
+        for row in data.get('logs', [])
+        if row['batch_id'] in batch_ids
+    ]
+    if logs:
+        store.save_logs(logs)
+
+    relay_stats = {
+        int(gpio_pin): tuple(values)
+        for gpio_pin, values in data.get('relay_stats', {}).items()
+        if values[0] in fermenter_ids
+    }
+    if relay_stats:
+        store.save_relay_stats(relay_stats)
+
+    costs = {
+        int(batch_id): cost
+        for batch_id, cost in data.get('energy_costs', {}).items()
+        if int(batch_id) in batch_ids
+    }
+    store.save_energy_costs(costs)
+
+    return {"logs": len(logs), "relay_stats": len(relay_stats), "energy_costs": len(costs)}
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas, auth
 from ..database import get_db
+from ..controllers.temperature_controller import temperature_controller
 
 router = APIRouter(prefix="/api/profiles", tags=["profiles"])
 
@@ -120,6 +121,7 @@ def add_phase(
     db.add(db_phase)
     db.commit()
     db.refresh(db_phase)
+    temperature_controller.notify_profile_changed(db, profile_id)
     
     return db_phase
 
@@ -141,6 +143,7 @@ def delete_phase(
     
     db.delete(phase)
     db.commit()
+    temperature_controller.notify_profile_changed(db, profile_id)
     
     return {"message": "Phase deleted successfully"}
 
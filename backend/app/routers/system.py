@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import Dict, Optional
 import os
 import time
 import psutil
 from datetime import datetime
 from .. import models, schemas, auth
+from ..config import settings
 from ..database import get_db
 from ..hardware.manager import hardware_manager
 from ..controllers.temperature_controller import temperature_controller
+from ..profiler import get_session, start_session
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
@@ -42,36 +45,47 @@ def get_system_health(
     if os.path.exists('brewbuddy.db'):
         database_size_mb = os.path.getsize('brewbuddy.db') / (1024 * 1024)
     
-    # Count active batches
-    active_batches = db.query(models.Batch).filter(models.Batch.status == "active").count()
+    # Active batches and their sensors come from the controller's live snapshot
+    live_states = temperature_controller.get_live_state()
+    active_batches = len(live_states)
     
     # Get sensor status
     sensor_status = {}
-    all_sensors = hardware_manager.get_all_sensors()
-    for sensor_id in all_sensors:
-        temp = hardware_manager.read_temperature(sensor_id)
+    for live in live_states:
+        sensor_status[live["sensor_id"]] = {
+            "connected": live["current_temp"] is not None,
+            "last_reading": live["last_reading"],
+            "temperature": live["current_temp"],
+            "age_seconds": live["sensor_age_seconds"]
+        }
+    
+    # Sensors not driving a batch come from the shared reading cache
+    for sensor_id in hardware_manager.get_all_sensors():
+        if sensor_id in sensor_status:
+            continue
+        temp = hardware_manager.get_temperature(sensor_id)
         sensor_status[sensor_id] = {
             "connected": temp is not None,
             "last_reading": datetime.utcnow().isoformat() if temp is not None else None,
             "temperature": temp
         }
     
-    # Get relay status
+    # Get relay status (persisted stats plus counters not yet flushed)
     relay_status = {}
     fermenters = db.query(models.Fermenter).all()
+    stats_rows = db.query(models.RelayStats).all()
+    stats = {(row.fermenter_id, row.gpio_pin): row for row in stats_rows}
     for fermenter in fermenters:
-        relay_status[fermenter.heater_gpio] = {
-            "fermenter": fermenter.name,
-            "type": "heater",
-            "cycles": fermenter.relay_cycle_count,
-            "current_state": hardware_manager.get_relay_state(fermenter.heater_gpio)
-        }
-        relay_status[fermenter.chiller_gpio] = {
-            "fermenter": fermenter.name,
-            "type": "chiller",
-            "cycles": fermenter.relay_cycle_count,
-            "current_state": hardware_manager.get_relay_state(fermenter.chiller_gpio)
-        }
+        for relay_type, gpio_pin in (("heater", fermenter.heater_gpio), ("chiller", fermenter.chiller_gpio)):
+            row = stats.get((fermenter.id, gpio_pin))
+            pending = temperature_controller.get_relay_pending(gpio_pin)
+            relay_status[gpio_pin] = {
+                "fermenter": fermenter.name,
+                "type": relay_type,
+                "cycles": (row.cycle_count if row else 0) + pending["cycles"],
+                "on_seconds": round((row.on_seconds if row else 0.0) + pending["on_seconds"], 1),
+                "current_state": temperature_controller.get_relay_state(gpio_pin)
+            }
     
     return schemas.SystemHealth(
         uptime_seconds=uptime_seconds,
@@ -107,10 +121,14 @@ def manual_control_heater(
             detail="Cannot manual control fermenter with active batch"
         )
     
-    if state:
-        hardware_manager.activate_relay(fermenter.heater_gpio)
-    else:
-        hardware_manager.deactivate_relay(fermenter.heater_gpio)
+    if fermenter.node_id:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Fermenter is driven by node {fermenter.node_id}"
+        )
+    
+    if not temperature_controller.set_manual_relay(fermenter.heater_gpio, state):
+        raise HTTPException(status_code=503, detail="Temperature controller is not running")
     return {"message": f"Heater {'activated' if state else 'deactivated'}"}
 
 
@@ -137,13 +155,35 @@ def manual_control_chiller(
             detail="Cannot manual control fermenter with active batch"
         )
     
-    if state:
-        hardware_manager.activate_relay(fermenter.chiller_gpio)
-    else:
-        hardware_manager.deactivate_relay(fermenter.chiller_gpio)
+    if fermenter.node_id:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Fermenter is driven by node {fermenter.node_id}"
+        )
+    
+    if not temperature_controller.set_manual_relay(fermenter.chiller_gpio, state):
+        raise HTTPException(status_code=503, detail="Temperature controller is not running")
     return {"message": f"Chiller {'activated' if state else 'deactivated'}"}
 
 
+@router.get("/control-loop")
+def get_control_loop_stats():
+    """Get control loop tick jitter and overrun statistics."""
+    return temperature_controller.get_loop_stats()
+
+
+@router.get("/sensor-filters")
+def get_sensor_filter_stats():
+    """Get accepted and rejected (bad value, out of range, rate limited) sample counts per sensor."""
+    return temperature_controller.get_sensor_filter_stats()
+
+
+@router.get("/sensor-health")
+def get_sensor_health():
+    """Get read success rate, latency histogram and backoff state per sensor."""
+    return temperature_controller.get_sensor_health()
+
+
 @router.get("/sensors")
 def list_sensors(
     current_user: models.User = Depends(auth.get_current_user)
@@ -153,7 +193,7 @@ def list_sensors(
     sensor_data = []
     
     for sensor_id in sensors:
-        temp = hardware_manager.read_temperature(sensor_id)
+        temp = hardware_manager.get_temperature(sensor_id)
         sensor_data.append({
             "id": sensor_id,
             "temperature": temp,
@@ -163,3 +203,54 @@ def list_sensors(
     return sensor_data
 
 
+@router.post("/profiler/start")
+def start_profiler(
+    seconds: float = Query(30.0, gt=0),
+    interval_ms: Optional[float] = Query(None, ge=1),
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Start sampling every thread of the API process (and an embedded controller) for a bounded time."""
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiling is limited to {settings.profiler_max_seconds:g} seconds"
+        )
+    
+    session = start_session(seconds, interval_ms / 1000 if interval_ms else None)
+    if session is None:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    return session.get_status()
+
+
+@router.post("/profiler/stop")
+def stop_profiler(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Stop the running profiling session early."""
+    session = get_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    session.stop()
+    return session.get_status()
+
+
+@router.get("/profiler")
+def get_profiler_status(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Status of the running or last profiling session."""
+    session = get_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    return session.get_status()
+
+
+@router.get("/profiler/stacks", response_class=PlainTextResponse)
+def get_profiler_stacks(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Collapsed stacks of the running or last session, for flamegraph.pl or speedscope."""
+    session = get_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    return PlainTextResponse(session.collapsed())
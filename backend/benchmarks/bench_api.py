@@ -0,0 +1,105 @@
+"""API cost as history and the number of active batches grow."""
+import asyncio
+
+import pytest
+
+from app.controllers.temperature_controller import temperature_controller
+from app.routers.dashboard import send_update
+
+from conftest import create_batch, insert_logs
+
+LOG_ROWS = [10_000, 100_000, pytest.param(1_000_000, marks=pytest.mark.slow)]
+
+
+@pytest.mark.parametrize("rows", LOG_ROWS)
+@pytest.mark.parametrize("hours", [None, 24])
+def bench_get_batch_logs(benchmark, client, batch_with_logs, rows, hours):
+    batch_id = batch_with_logs(rows)
+    params = {"limit": 10_000}
+    if hours:
+        params["hours"] = hours
+
+    response = benchmark(client.get, f"/api/batches/{batch_id}/logs", params=params)
+    assert response.status_code == 200
+    benchmark.extra_info["rows_in_batch"] = rows
+    benchmark.extra_info["rows_returned"] = len(response.json())
+
+
+@pytest.fixture(scope="module")
+def active_batches(db):
+    """active_batches(count) ensures at least count active batches, each with an hour of logs."""
+    batch_ids = []
+
+    def ensure(count: int):
+        while len(batch_ids) < count:
+            batch = create_batch(db)
+            insert_logs(db, batch.id, 60)
+            batch_ids.append(batch.id)
+
+    return ensure
+
+
+@pytest.mark.parametrize("batches", [1, 10, 50])
+def bench_get_dashboard(benchmark, client, db, active_batches, batches):
+    active_batches(batches)
+
+    response = benchmark(client.get, "/api/dashboard/")
+    assert response.status_code == 200
+    benchmark.extra_info["active_batches"] = len(response.json())
+
+
+@pytest.mark.parametrize("rows", LOG_ROWS)
+def bench_export_csv(benchmark, client, batch_with_logs, rows):
+    batch_id = batch_with_logs(rows)
+
+    response = benchmark(client.get, f"/api/export/batch/{batch_id}/csv")
+    assert response.status_code == 200
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["bytes"] = len(response.content)
+
+
+class FakeWebSocket:
+    """Stands in for a connected client; only the send path is exercised."""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_json(self, message: dict):
+        self.sent += 1
+
+
+@pytest.fixture
+def live_batches(monkeypatch):
+    """A running controller snapshot with 20 active batches, as each /ws loop reads it."""
+    snapshot = {
+        i: {
+            "batch_id": i,
+            "batch_number": f"BENCH-{i}",
+            "current_temp": 19.0,
+            "target_temp": 19.0,
+            "control_state": "idle",
+            "current_phase": 0,
+            "phase_progress": 50.0,
+            "elapsed_hours": 12.0,
+            "last_reading_at": temperature_controller.clock.monotonic(),
+        }
+        for i in range(20)
+    }
+    monkeypatch.setattr(temperature_controller, "running", True)
+    monkeypatch.setattr(temperature_controller, "snapshot", snapshot)
+
+
+@pytest.mark.parametrize("clients", [10, 100, 1000])
+def bench_websocket_updates(benchmark, live_batches, clients):
+    """One round of the per-client /ws loops: each builds its update from live state and sends it."""
+    websockets = [FakeWebSocket() for _ in range(clients)]
+    loop = asyncio.new_event_loop()
+
+    async def send_all():
+        for websocket in websockets:
+            await send_update(websocket)
+
+    benchmark(lambda: loop.run_until_complete(send_all()))
+    loop.close()
+    assert websockets[0].sent > 0
+    benchmark.extra_info["clients"] = clients
@@ -0,0 +1,75 @@
+"""Control loop cost: one tick across many fermenters, and the log write path."""
+import pytest
+
+from app.clock import ManualClock
+from app.config import settings
+from app.controllers.store import DatabaseStore
+from app.replay import DEFAULT_PHASES, advance, build_records, create_controller, parse_phases
+
+from conftest import create_batch
+
+
+@pytest.fixture
+def replay_controller():
+    """replay_controller(fermenters) -> (controller, clock), torn down after the benchmark."""
+    controllers = []
+
+    def make(fermenters: int, control_mode: str = "hysteresis"):
+        clock = ManualClock()
+        records = build_records(clock, fermenters, parse_phases(DEFAULT_PHASES), control_mode)
+        controller, _ = create_controller(clock, records)
+        controllers.append(controller)
+        controller.tick()  # first tick loads the batches and sets up relays
+        return controller, clock
+
+    yield make
+    for controller in controllers:
+        controller.read_pool.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.mark.parametrize("control_mode", ["hysteresis", "pid"])
+@pytest.mark.parametrize("fermenters", [1, 10, 50, 200])
+def bench_controller_tick(benchmark, replay_controller, fermenters, control_mode):
+    controller, clock = replay_controller(fermenters, control_mode)
+
+    def tick():
+        advance(clock, settings.control_loop_interval)
+        controller.tick()
+
+    benchmark(tick)
+    benchmark.extra_info["fermenters"] = fermenters
+
+
+@pytest.mark.parametrize("batches", [1, 50])
+def bench_log_temperature(benchmark, replay_controller, batches):
+    """Sampling and buffering one tick's worth of log rows, without the database write."""
+    controller, clock = replay_controller(batches)
+
+    def log_all():
+        advance(clock, settings.log_interval)
+        for batch_id in controller.active_batches:
+            controller._log_temperature(batch_id, 19.0, 19.0, "idle")
+
+    benchmark(log_all)
+    benchmark.extra_info["rows_per_round"] = batches
+
+
+@pytest.mark.parametrize("rows", [100, 1000, 10_000])
+def bench_log_flush(benchmark, db, rows):
+    """Writing a persist interval's buffered rows in one commit."""
+    batch = create_batch(db)
+    store = DatabaseStore()
+    buffered = [
+        {
+            'batch_id': batch.id,
+            'timestamp': batch.start_time,
+            'actual_temp': 19.0,
+            'target_temp': 19.0,
+            'control_state': "idle",
+            'power_consumed_wh': 0.0,
+        }
+        for _ in range(rows)
+    ]
+
+    benchmark(store.save_logs, buffered)
+    benchmark.extra_info["rows"] = rows
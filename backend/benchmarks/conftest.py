@@ -0,0 +1,101 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Benchmarks run against mock hardware and a throwaway SQLite database, both
+configured here before the app is imported. Datasets are built once per
+session and shared by every benchmark that needs the same size.
+"""
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="brewbuddy-bench-")
+os.environ.setdefault("HARDWARE_MODE", "mock")
+os.environ.setdefault("DEBUG", "false")  # SQL echo would dominate the timings
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+os.environ.setdefault("CONTROLLER_LOCK_PATH", f"{_workdir}/controller.lock")
+os.environ.setdefault("CONTROLLER_SOCKET_PATH", f"{_workdir}/controller.sock")
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.database import Base, SessionLocal, engine
+from seed_data import bulk_insert, temperature_log_rows
+
+LOG_INTERVAL_SECONDS = 60
+CHUNK_SIZE = 100_000
+PHASES = [(504, 19.0)]
+
+
+@pytest.fixture(scope="session")
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    profile = models.BeerProfile(name="Benchmark Ale")
+    session.add(profile)
+    session.flush()
+    session.add(models.ProfilePhase(profile_id=profile.id, sequence_order=1, duration_hours=PHASES[0][0], target_temp_celsius=PHASES[0][1]))
+    session.commit()
+    yield session
+    session.close()
+
+
+def create_batch(db, status: str = "active") -> models.Batch:
+    """A batch on its own fermenter, started three weeks ago."""
+    fermenter_count = db.query(models.Fermenter).count()
+    fermenter = models.Fermenter(
+        name=f"Bench {fermenter_count + 1}",
+        size_liters=20.0,
+        heater_gpio=1000 + 2 * fermenter_count,
+        chiller_gpio=1001 + 2 * fermenter_count,
+        sensor_id=f"28-{fermenter_count + 1:08d}",
+    )
+    db.add(fermenter)
+    db.flush()
+    batch = models.Batch(
+        batch_number=f"BENCH-{fermenter.id}",
+        name=f"Bench batch {fermenter.id}",
+        profile_id=db.query(models.BeerProfile.id).scalar(),
+        fermenter_id=fermenter.id,
+        status=status,
+        start_time=datetime.utcnow() - timedelta(days=21),
+    )
+    db.add(batch)
+    db.commit()
+    return batch
+
+
+def insert_logs(db, batch_id: int, rows: int):
+    """Insert rows of realistic temperature history ending now, one per LOG_INTERVAL_SECONDS."""
+    start = datetime.utcnow() - timedelta(seconds=rows * LOG_INTERVAL_SECONDS)
+    for first in range(0, rows, CHUNK_SIZE):
+        bulk_insert(
+            "temperature_logs",
+            ("batch_id", "timestamp", "actual_temp", "target_temp", "control_state", "power_consumed_wh"),
+            temperature_log_rows(batch_id, start, first, min(CHUNK_SIZE, rows - first), LOG_INTERVAL_SECONDS, PHASES),
+        )
+
+
+@pytest.fixture(scope="session")
+def batch_with_logs(db):
+    """batch_with_logs(rows) -> id of a completed batch holding that many log rows."""
+    batches = {}
+
+    def get(rows: int) -> int:
+        if rows not in batches:
+            batch = create_batch(db, status="complete")
+            insert_logs(db, batch.id, rows)
+            batches[rows] = batch.id
+        return batches[rows]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # Not entered as a context manager: the lifespan (and with it the control loop) never starts
+    return TestClient(app)
@@ -1,11 +1,36 @@
 """
 Seed database with fake data for testing.
 Run this after initializing the database.
+
+    python seed_data.py                      # small demo dataset
+    python seed_data.py --large --fermenters 20 --batches 200 --months 12 --log-interval 60
+
+--large bulk-loads months of realistic history (temperature logs, gravity
+readings, alerts) for benchmarks and retention tests.
 """
-from app.database import SessionLocal
+import argparse
+import csv
+import io
+import math
+import random
+import time
+from app.database import SessionLocal, engine
 from app import models
 from datetime import datetime, timedelta
 
+# Profiles used by the large generator: (name, beer type, [(hours, target C), ...])
+LOAD_PROFILES = [
+    ("American IPA", "IPA", [(168, 19.0), (72, 20.0), (96, 18.0)]),
+    ("German Lager", "Lager", [(240, 10.0), (48, 15.0), (336, 2.0)]),
+    ("Belgian Saison", "Saison", [(48, 22.0), (72, 26.0), (96, 23.0)]),
+    ("English Bitter", "Bitter", [(120, 18.0), (48, 20.0), (72, 12.0)]),
+]
+PITCH_TEMP = 20.0  # wort temperature when a batch starts
+CYCLE_SECONDS = 2400  # period of the simulated hysteresis swing around target
+RAMP_SECONDS = 7200  # time constant for reaching a new phase target
+HEATER_WATTS = 50.0
+CHILLER_WATTS = 120.0
+
 def seed_data():
     db = SessionLocal()
     
@@ -289,7 +314,262 @@ def seed_data():
         db.close()
 
 
+def bulk_insert(table, columns, rows, chunk_size=100_000):
+    """
+    Insert row tuples straight through the DB driver in chunks.
+    
+    Uses COPY on PostgreSQL and a plain executemany elsewhere, skipping the
+    ORM entirely. SQLite timestamps must already be formatted as strings.
+    """
+    if not rows:
+        return
+    column_list = ", ".join(columns)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset:offset + chunk_size]
+            if engine.dialect.name == "postgresql":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(chunk)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:
+                placeholder = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+                placeholders = ", ".join([placeholder] * len(columns))
+                cursor.executemany(f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})", chunk)
+            connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def format_timestamp(value: datetime):
+    """Bind value for a DateTime column, in the format SQLAlchemy itself stores in SQLite."""
+    if engine.dialect.name == "sqlite":
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return value
+
+
+def temperature_log_rows(batch_id, start, first, count, interval, phases):
+    """
+    Log rows first .. first + count - 1 of a batch, one every interval seconds.
+    
+    The temperature ramps from the previous phase target to the current one,
+    swings around it like a hysteresis controller does, and carries sensor
+    noise; heater/chiller state and energy follow from it.
+    """
+    bounds = []
+    total = 0
+    for hours, _ in phases:
+        total += hours * 3600
+        bounds.append(total)
+    targets = [target for _, target in phases]
+    previous = [PITCH_TEMP] + targets[:-1]
+    starts = [0] + bounds[:-1]
+    heater_wh = HEATER_WATTS * interval / 3600
+    chiller_wh = CHILLER_WATTS * interval / 3600
+    
+    rows = []
+    phase = 0
+    for i in range(first, first + count):
+        second = i * interval
+        while phase < len(phases) - 1 and second >= bounds[phase]:
+            phase += 1
+        target = targets[phase]
+        offset = (previous[phase] - target) * math.exp(-(second - starts[phase]) / RAMP_SECONDS)
+        actual = target + offset + 0.3 * math.sin(2 * math.pi * second / CYCLE_SECONDS + batch_id)
+        actual = round(actual + random.gauss(0, 0.05), 2)
+        if actual < target - 0.2:
+            state, power = "heating", heater_wh
+        elif actual > target + 0.2:
+            state, power = "cooling", chiller_wh
+        else:
+            state, power = "idle", 0.0
+        rows.append((batch_id, format_timestamp(start + timedelta(seconds=second)), actual, target, state, power))
+    return rows
+
+
+def gravity_rows(batch_id, start, hours, phases):
+    """Daily gravity readings falling from OG towards FG as fermentation slows."""
+    original = random.uniform(1.040, 1.070)
+    final = original - (original - 1) * random.uniform(0.72, 0.80)
+    rows = []
+    for day in range(int(hours // 24) + 1):
+        elapsed = day * 24
+        progress = 1 - math.exp(-elapsed / 36)
+        target = phases[-1][1]
+        cumulative = 0
+        for phase_hours, phase_target in phases:
+            cumulative += phase_hours
+            if elapsed < cumulative:
+                target = phase_target
+                break
+        rows.append((
+            batch_id,
+            format_timestamp(start + timedelta(hours=elapsed)),
+            round(original - (original - final) * progress, 3),
+            target,
+            "Original gravity" if day == 0 else None
+        ))
+    return rows
+
+
+def alert_rows(batch_id, batch_number, start, hours, high_rule_id, low_rule_id, now):
+    """About one temperature excursion alert per four days of fermentation."""
+    rows = []
+    for _ in range(int(hours / 96) + random.randint(0, 1)):
+        triggered = start + timedelta(hours=random.uniform(0, hours))
+        if random.random() < 0.5:
+            rule_id, message = high_rule_id, f"Temperature {random.uniform(0.6, 2.0):.1f}°C above target on {batch_number}"
+        else:
+            rule_id, message = low_rule_id, f"Temperature {random.uniform(0.6, 2.0):.1f}°C below target on {batch_number}"
+        # Anything older than a day has been seen
+        rows.append((rule_id, batch_id, format_timestamp(triggered), message, (now - triggered).days >= 1))
+    return rows
+
+
+def seed_large(fermenters=10, batches=60, months=6, log_interval=60, chunk_size=100_000, seed=None):
+    """
+    Bulk-load a large synthetic history.
+    
+    Each fermenter runs its share of the batches back to back over the last
+    `months` months; the last one may still be active and logging. Fermenters,
+    profiles and batches go through the ORM, the bulk rows through bulk_insert.
+    """
+    random.seed(seed)
+    
+    db = SessionLocal()
+    started = time.monotonic()
+    now = datetime.utcnow()
+    window = timedelta(days=30 * months)
+    counts = {"temperature_logs": 0, "gravity_readings": 0, "alert_history": 0}
+    
+    try:
+        print(f"Generating {batches} batches on {fermenters} fermenters over {months} months"
+              f" (log every {log_interval} s)")
+        
+        profiles = []
+        for name, beer_type, phases in LOAD_PROFILES:
+            profile = models.BeerProfile(name=name, beer_type=beer_type, description="Generated for load testing")
+            db.add(profile)
+            db.flush()
+            for order, (hours, target) in enumerate(phases):
+                db.add(models.ProfilePhase(
+                    profile_id=profile.id,
+                    sequence_order=order,
+                    duration_hours=hours,
+                    target_temp_celsius=target
+                ))
+            profiles.append((profile, phases))
+        
+        existing = db.query(models.Fermenter).count()
+        for f in range(fermenters):
+            number = existing + f + 1
+            fermenter = models.Fermenter(
+                name=f"Load Fermenter {number}",
+                size_liters=random.choice([20.0, 25.0, 30.0, 50.0]),
+                heater_gpio=1000 + 2 * number,
+                chiller_gpio=1001 + 2 * number,
+                sensor_id=f"28-{number:08d}",
+                heater_watts=HEATER_WATTS,
+                chiller_watts=CHILLER_WATTS,
+                status="clean",
+            )
+            db.add(fermenter)
+            db.flush()
+            high_rule = models.AlertRule(fermenter_id=fermenter.id, rule_type="temp_high", threshold=1.0)
+            low_rule = models.AlertRule(fermenter_id=fermenter.id, rule_type="temp_low", threshold=1.0)
+            db.add_all([high_rule, low_rule])
+            db.flush()
+            
+            # Spread this fermenter's batches evenly over the window (back to back if they don't fit),
+            # ending with one that is part way through fermentation now
+            share = batches // fermenters + (1 if f < batches % fermenters else 0)
+            if not share:
+                continue
+            plan = [random.choice(profiles) for _ in range(share)]
+            durations = [timedelta(hours=sum(hours for hours, _ in phases)) for _, phases in plan]
+            gap = max(timedelta(days=1), (window - sum(durations, timedelta(0))) / share)
+            last_start = now - durations[-1] * random.uniform(0.1, 0.9)
+            slot_start = last_start - sum(durations[:-1], timedelta(0)) - gap * (share - 1)
+            
+            for i, (profile, phases) in enumerate(plan):
+                hours = sum(phase_hours for phase_hours, _ in phases)
+                batch_start = slot_start
+                batch_end = batch_start + timedelta(hours=hours)
+                slot_start = batch_end + gap
+                active = batch_end > now
+                
+                batch = models.Batch(
+                    batch_number=f"LOAD-{fermenter.id:04d}-{i + 1:04d}",
+                    name=f"{profile.name} #{i + 1}",
+                    profile_id=profile.id,
+                    fermenter_id=fermenter.id,
+                    start_time=batch_start,
+                    end_time=None if active else batch_end,
+                    status="active" if active else "complete",
+                    cost_ingredients=round(random.uniform(25, 60), 2),
+                )
+                db.add(batch)
+                db.flush()
+                if active:
+                    fermenter.status = "in_use"
+                db.commit()
+                
+                logged_hours = min(hours, (now - batch_start).total_seconds() / 3600)
+                log_count = int(logged_hours * 3600 // log_interval)
+                for first in range(0, log_count, chunk_size):
+                    rows = temperature_log_rows(
+                        batch.id, batch_start, first, min(chunk_size, log_count - first), log_interval, phases
+                    )
+                    bulk_insert(
+                        "temperature_logs",
+                        ("batch_id", "timestamp", "actual_temp", "target_temp", "control_state", "power_consumed_wh"),
+                        rows,
+                        chunk_size
+                    )
+                counts["temperature_logs"] += log_count
+                
+                rows = gravity_rows(batch.id, batch_start, logged_hours, phases)
+                bulk_insert("gravity_readings", ("batch_id", "timestamp", "gravity_sg", "temperature", "notes"), rows)
+                counts["gravity_readings"] += len(rows)
+                
+                rows = alert_rows(batch.id, batch.batch_number, batch_start, logged_hours, high_rule.id, low_rule.id, now)
+                bulk_insert("alert_history", ("alert_rule_id", "batch_id", "triggered_at", "message", "acknowledged"), rows)
+                counts["alert_history"] += len(rows)
+            
+            print(f"   Fermenter {f + 1}/{fermenters}: {counts['temperature_logs']} log rows so far")
+        
+        db.commit()
+        elapsed = time.monotonic() - started
+        total = sum(counts.values())
+        print(f"[SUCCESS] Inserted {total} rows in {elapsed:.1f} s ({total / elapsed:.0f} rows/s)")
+        for table, count in counts.items():
+            print(f"  • {count} {table}")
+    
+    except Exception as e:
+        print(f"Error seeding database: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    seed_data()
+    parser = argparse.ArgumentParser(description="Seed the database with test data")
+    parser.add_argument("--large", action="store_true", help="bulk-load a large synthetic history instead of the demo data")
+    parser.add_argument("--fermenters", type=int, default=10)
+    parser.add_argument("--batches", type=int, default=60)
+    parser.add_argument("--months", type=float, default=6)
+    parser.add_argument("--log-interval", type=int, default=60, help="seconds between temperature log rows")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per insert round trip")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a reproducible dataset")
+    args = parser.parse_args()
+    
+    if args.large:
+        seed_large(args.fermenters, args.batches, args.months, args.log_interval, args.chunk_size, args.seed)
+    else:
+        seed_data()
 
 
@@ -0,0 +1,75 @@
+"""
+Test configuration.
+
+Tests run against mock hardware and a throwaway SQLite database, both set
+up here before any app module is imported.
+"""
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="brewbuddy-test-")
+os.environ.setdefault("HARDWARE_MODE", "mock")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/test.db")
+os.environ.setdefault("CONTROLLER_LOCK_PATH", f"{_workdir}/controller.lock")
+os.environ.setdefault("CONTROLLER_SOCKET_PATH", f"{_workdir}/controller.sock")
+os.environ.setdefault("CONTROLLER_SHM_NAME", f"brewbuddy_test_{os.getpid()}")
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.database import Base, SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped again after the test."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def make_batch(db):
+    """make_batch(status, phases, node_id, **fermenter_fields) -> a batch on its own new fermenter."""
+
+    def make(status="active", phases=((48.0, 19.0),), node_id=None, started_hours_ago=1.0, **fermenter_fields):
+        count = db.query(models.Fermenter).count()
+        profile = models.BeerProfile(name=f"Profile {count + 1}")
+        db.add(profile)
+        db.flush()
+        for order, (hours, temp) in enumerate(phases, start=1):
+            db.add(models.ProfilePhase(
+                profile_id=profile.id,
+                sequence_order=order,
+                duration_hours=hours,
+                target_temp_celsius=temp
+            ))
+        fermenter = models.Fermenter(**{
+            "name": f"Fermenter {count + 1}",
+            "size_liters": 20.0,
+            "heater_gpio": 100 + 2 * count,
+            "chiller_gpio": 101 + 2 * count,
+            "sensor_id": f"28-{count + 1:08d}",
+            "node_id": node_id,
+            **fermenter_fields,
+        })
+        db.add(fermenter)
+        db.flush()
+        batch = models.Batch(
+            batch_number=f"T-{fermenter.id}",
+            name=f"Test batch {fermenter.id}",
+            profile_id=profile.id,
+            fermenter_id=fermenter.id,
+            status=status,
+            start_time=datetime.utcnow() - timedelta(hours=started_hours_ago),
+        )
+        db.add(batch)
+        db.commit()
+        return batch
+
+    return make
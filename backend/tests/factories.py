@@ -0,0 +1,31 @@
+"""Plain objects shared by several test modules."""
+from dataclasses import replace
+from datetime import datetime
+
+from app.controllers.registry import ActiveBatchRecord, PhaseRecord
+
+
+def make_record(batch_id: int = 1) -> ActiveBatchRecord:
+    return ActiveBatchRecord(
+        batch_id=batch_id,
+        batch_number=f"B-{batch_id}",
+        profile_id=1,
+        fermenter_id=batch_id,
+        sensor_id=f"28-{batch_id:08d}",
+        heater_gpio=2 * batch_id,
+        chiller_gpio=2 * batch_id + 1,
+        size_liters=20.0,
+        heater_watts=100.0,
+        chiller_watts=150.0,
+        control_mode="hysteresis",
+        pid_kp=None,
+        pid_ki=None,
+        pid_kd=None,
+        start_time=datetime(2026, 1, 1),
+        phases=(PhaseRecord(48.0, 19.0),),
+    )
+
+
+def with_phases(record: ActiveBatchRecord, *phases) -> ActiveBatchRecord:
+    """A copy of record following (duration_hours, target_temp) phases."""
+    return replace(record, phases=tuple(PhaseRecord(*phase) for phase in phases))
@@ -0,0 +1,122 @@
+from dataclasses import replace
+
+import pytest
+
+from app.clock import ManualClock
+from app.config import settings
+from app.hardware.manager import hardware_manager
+from app.replay import advance, build_records, create_controller, parse_phases
+
+
+@pytest.fixture
+def replay():
+    """replay(fermenters, phases) -> (controller, store, clock) on the simulated hardware."""
+    controllers = []
+
+    def make(fermenters: int = 2, phases: str = "48:25", control_mode: str = "hysteresis"):
+        clock = ManualClock()
+        records = build_records(clock, fermenters, parse_phases(phases), control_mode)
+        controller, store = create_controller(clock, records)
+        controllers.append(controller)
+        return controller, store, clock
+
+    yield make
+    for controller in controllers:
+        controller.read_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def tick(controller, clock, seconds: float = None):
+    advance(clock, seconds or settings.control_loop_interval)
+    controller.tick()
+
+
+class FailingCosts(Exception):
+    pass
+
+
+def test_stopped_batches_are_all_switched_off_when_saving_costs_fails(replay, monkeypatch):
+    controller, store, clock = replay(fermenters=3)
+    tick(controller, clock)
+    heaters = [record.heater_gpio for record in store.records.values()]
+    assert all(hardware_manager.get_relay_state(gpio_pin) for gpio_pin in heaters)
+
+    def fail(costs):
+        raise FailingCosts("database is locked")
+
+    monkeypatch.setattr(store, "save_energy_costs", fail)
+    controller.registry.replace_all({})
+    tick(controller, clock)
+
+    assert not any(hardware_manager.get_relay_state(gpio_pin) for gpio_pin in heaters)
+    assert controller.active_batches == {}
+    assert set(controller.unsaved_costs) == set(store.records)
+    assert not controller.energy.get_all_totals()
+
+    monkeypatch.undo()
+    controller._flush_stats()
+    assert controller.unsaved_costs == {}
+    assert set(store.energy_costs) == set(store.records)
+
+
+def test_stopping_a_batch_logs_its_last_interval(replay, monkeypatch):
+    monkeypatch.setattr(settings, "log_interval", 3600)
+    monkeypatch.setattr(settings, "persist_interval", 3600)
+    controller, store, clock = replay(fermenters=1)
+    for _ in range(6):
+        tick(controller, clock)
+    rows = list(controller.log_buffer.rows)
+    assert len(rows) == 1  # only the first tick was sampled
+
+    final_totals = {}
+    stop_batch = controller.energy.stop_batch
+
+    def recording_stop(batch_id):
+        final_totals[batch_id] = stop_batch(batch_id)
+        return final_totals[batch_id]
+
+    monkeypatch.setattr(controller.energy, "stop_batch", recording_stop)
+    controller.registry.replace_all({})
+    tick(controller, clock)
+
+    rows = controller.log_buffer.rows
+    assert len(rows) == 2
+    assert rows[-1]['control_state'] == "idle"
+    assert rows[-1]['power_consumed_wh'] > 0
+    logged_wh = sum(row['power_consumed_wh'] for row in rows)
+    assert logged_wh == pytest.approx(final_totals[1]['energy_wh'], abs=1e-3)
+
+
+def test_relays_are_committed_at_most_once_per_tick(replay):
+    controller, store, clock = replay(fermenters=4)
+    first = hardware_manager.mock_relay.commit_count
+
+    for _ in range(10):
+        before = hardware_manager.mock_relay.commit_count
+        tick(controller, clock)
+        assert hardware_manager.mock_relay.commit_count - before <= 1
+    assert hardware_manager.mock_relay.commit_count > first
+
+
+def test_profile_edits_keep_control_state(replay):
+    controller, store, clock = replay(fermenters=1, control_mode="pid")
+    for _ in range(3):
+        tick(controller, clock)
+    state = controller.active_batches[1]
+    strategy = state.strategy
+    window_start, integral = strategy.window_start, strategy.integral
+    assert window_start is not None
+
+    # A phase edit refreshes the record but must not restart the PID window
+    record = controller.registry.snapshot()[1]
+    controller.registry.replace_all({1: replace(record, phases=record.phases + record.phases)})
+    controller._sync_batches()
+
+    assert controller.active_batches[1] is state
+    assert state.record is not record
+    assert state.strategy is strategy
+    assert (strategy.window_start, strategy.integral) == (window_start, integral)
+    assert state.actual_temp is not None
+
+    controller.registry.replace_all({1: replace(state.record, pid_kp=5.0)})
+    controller._sync_batches()
+    assert state.strategy is not strategy
@@ -0,0 +1,37 @@
+from sqlalchemy import inspect, text
+
+from app import models
+from app.database import Base, SessionLocal, engine, init_db
+
+
+def test_init_db_upgrades_an_existing_fermenters_table():
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        # fermenters as created before the energy, PID and fleet columns existed
+        conn.execute(text(
+            "CREATE TABLE fermenters (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "size_liters FLOAT NOT NULL, heater_gpio INTEGER NOT NULL, chiller_gpio INTEGER NOT NULL, "
+            "sensor_id VARCHAR(100) NOT NULL, status VARCHAR(20), last_maintenance DATETIME, "
+            "relay_cycle_count INTEGER, created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO fermenters (name, size_liters, heater_gpio, chiller_gpio, sensor_id) "
+            "VALUES ('FV1', 20, 17, 27, '28-1')"
+        ))
+
+    try:
+        init_db()
+        init_db()  # a second start finds nothing left to do
+
+        schema = inspect(engine)
+        columns = {column['name'] for column in schema.get_columns("fermenters")}
+        assert {"heater_watts", "chiller_watts", "control_mode", "pid_kp", "node_id"} <= columns
+        indexes = {index['name'] for index in schema.get_indexes("fermenters")}
+        assert "ix_fermenters_node_id" in indexes
+
+        db = SessionLocal()
+        fermenter = db.query(models.Fermenter).filter(models.Fermenter.node_id.is_(None)).one()
+        assert fermenter.name == "FV1" and fermenter.heater_watts is None
+        db.close()
+    finally:
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,44 @@
+import pytest
+
+from app.clock import ManualClock
+from app.config import settings
+from app.controllers.energy import EnergyAccumulator
+
+
+def test_interval_is_charged_at_the_state_held_during_it(monkeypatch):
+    monkeypatch.setattr(settings, "energy_cost_per_kwh", 0.30)
+    clock = ManualClock()
+    energy = EnergyAccumulator(clock)
+    energy.start_batch(1, energy_wh=10.0)
+
+    assert energy.integrate(1, 100.0, 200.0, heating=True, cooling=False) == 0.0
+    clock.advance(1800)
+    assert energy.integrate(1, 100.0, 200.0, heating=False, cooling=True) == pytest.approx(50.0)
+    clock.advance(900)
+    assert energy.integrate(1, 100.0, 200.0, heating=False, cooling=False) == pytest.approx(50.0)
+    clock.advance(3600)
+    energy.integrate(1, 100.0, 200.0, heating=False, cooling=False)
+
+    assert energy.get_totals(1) == {"energy_wh": 110.0, "cost": 0.033}
+
+
+def test_pending_energy_is_taken_once():
+    clock = ManualClock()
+    energy = EnergyAccumulator(clock)
+    energy.start_batch(1)
+    energy.integrate(1, 100.0, 0.0, heating=True, cooling=False)
+    clock.advance(36)
+    energy.integrate(1, 100.0, 0.0, heating=True, cooling=False)
+
+    assert energy.take_pending(1) == pytest.approx(1.0)
+    assert energy.take_pending(1) == 0.0
+
+
+def test_untracked_batches():
+    energy = EnergyAccumulator(ManualClock())
+    energy.start_batch(1)
+
+    assert energy.stop_batch(1) == {"energy_wh": 0.0, "cost": 0.0}
+    assert not energy.is_tracking(1)
+    assert energy.integrate(1, 100.0, 0.0, heating=True, cooling=False) == 0.0
+    assert energy.get_totals(1) is None
@@ -0,0 +1,66 @@
+
+from app.config import settings
+from app.hardware.filters import SensorFilter, SensorFilterBank
+
+
+def test_bad_and_out_of_range_values_are_rejected():
+    sensor_filter = SensorFilter(window=3, max_rate=0, ema_alpha=0)
+
+    assert sensor_filter.process(85.0, 0) is None
+    assert sensor_filter.process(-127.0, 1) is None
+    assert sensor_filter.process(130.0, 2) is None
+    assert sensor_filter.process(19.0, 3) == 19.0
+    assert sensor_filter.counters == {"accepted": 1, "bad_value": 2, "out_of_range": 1, "rate_limited": 0}
+
+
+def test_median_drops_a_single_outlier():
+    sensor_filter = SensorFilter(window=3, max_rate=0, ema_alpha=0)
+
+    results = [sensor_filter.process(value, now) for now, value in enumerate((19.0, 19.1, 24.0, 19.2))]
+
+    assert results == [19.0, 19.05, 19.1, 19.2]
+
+
+def test_spike_is_rate_limited():
+    sensor_filter = SensorFilter(window=3, max_rate=0.1, ema_alpha=0)
+    sensor_filter.process(19.0, 0)
+
+    assert sensor_filter.process(25.0, 10) is None
+    assert sensor_filter.process(19.1, 20) == 19.05
+    assert sensor_filter.counters["rate_limited"] == 1
+
+
+def test_persistent_step_is_accepted_after_a_window():
+    sensor_filter = SensorFilter(window=3, max_rate=0.1, ema_alpha=0)
+    sensor_filter.process(19.0, 0)
+
+    assert sensor_filter.process(25.0, 10) is None
+    assert sensor_filter.process(25.0, 20) is None
+    # Third sample in a row at the new level: history restarts from it
+    assert sensor_filter.process(25.0, 30) == 25.0
+    assert list(sensor_filter.samples) == [25.0]
+
+
+def test_exponential_smoothing():
+    sensor_filter = SensorFilter(window=1, max_rate=0, ema_alpha=0.5)
+
+    assert sensor_filter.process(18.0, 0) == 18.0
+    assert sensor_filter.process(20.0, 1) == 19.0
+    assert sensor_filter.process(20.0, 2) == 19.5
+
+
+def test_bank_keeps_one_filter_per_sensor(monkeypatch):
+    monkeypatch.setattr(settings, "sensor_filter_window", 3)
+    monkeypatch.setattr(settings, "sensor_max_rate", 0)
+    monkeypatch.setattr(settings, "sensor_ema_alpha", 0)
+    bank = SensorFilterBank()
+
+    assert bank.process("a", None, 0) is None
+    bank.process("a", 18.0, 0)
+    bank.process("b", 22.0, 0)
+    assert bank.process("a", 20.0, 1) == 19.0
+    assert bank.get_stats()["b"]["accepted"] == 1
+
+    bank.forget("a")
+    assert bank.process("a", 20.0, 2) == 20.0
+    assert set(bank.get_stats()) == {"a", "b"}
@@ -0,0 +1,173 @@
+import gzip
+import json
+import threading
+from datetime import datetime
+
+import httpx
+
+from app.clock import ManualClock
+from app.config import settings
+from app.controllers.fleet import CoordinatorStore, NodeLiveState, decode_payload, encode_payload
+from app.controllers.registry import ActiveBatchRegistry, record_to_dict
+
+from tests.factories import make_record
+
+
+def test_payload_round_trip():
+    data = {"logs": [{"batch_id": 1, "timestamp": datetime(2026, 1, 1, 12)}]}
+    body = encode_payload(data)
+    assert json.loads(gzip.decompress(body)) == {"logs": [{"batch_id": 1, "timestamp": "2026-01-01T12:00:00"}]}
+    assert decode_payload(body, "gzip") == json.loads(gzip.decompress(body))
+    assert decode_payload(b'{"a": 1}', None) == {"a": 1}
+    assert decode_payload(b"", None) == {}
+
+
+class Coordinator:
+    """Records requests and answers like the /api/nodes endpoints."""
+
+    def __init__(self, records=(), fail=False, energy=None):
+        self.records = [record_to_dict(record) for record in records]
+        self.energy = energy or {}
+        self.fail = fail
+        self.requests = []
+        self.release = None  # set to an Event to hold every request until it is set
+        self.waiting = threading.Event()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.release is not None:
+            self.waiting.set()
+            self.release.wait()
+        if self.fail:
+            raise httpx.ConnectError("coordinator down")
+        self.requests.append(request)
+        if request.url.path.endswith("/sync"):
+            return httpx.Response(200, json={"records": self.records, "energy": self.energy})
+        return httpx.Response(200, json={})
+
+
+def make_store(coordinator: Coordinator) -> CoordinatorStore:
+    store = CoordinatorStore("pi-1", "http://coordinator", "secret", lambda: {"batches": []})
+    store.client = httpx.Client(
+        base_url="http://coordinator",
+        headers=store.client.headers,
+        transport=httpx.MockTransport(coordinator)
+    )
+    return store
+
+
+def test_sync_replaces_assignments_and_energy():
+    registry = ActiveBatchRegistry()
+    store = make_store(Coordinator([make_record(1), make_record(2)], energy={"1": 12.5}))
+
+    store.sync(registry)
+
+    assert set(registry.snapshot()) == {1, 2}
+    assert registry.snapshot()[1] == make_record(1)
+    assert store.load_energy(1) == 12.5
+    assert store.load_energy(2) == 0.0
+
+
+def test_sync_keeps_last_assignments_when_coordinator_is_down():
+    registry = ActiveBatchRegistry()
+    registry.replace_all({1: make_record(1)})
+    store = make_store(Coordinator(fail=True))
+
+    store.sync(registry)
+
+    assert set(registry.snapshot()) == {1}
+
+
+def test_unchanged_records_keep_identity():
+    registry = ActiveBatchRegistry()
+    store = make_store(Coordinator([make_record(1)]))
+    store.sync(registry)
+    first = registry.snapshot()[1]
+    version = registry.version
+
+    store.sync(registry)
+
+    assert registry.snapshot()[1] is first
+    assert registry.version == version
+
+
+def test_tick_calls_never_wait_for_the_coordinator():
+    clock = ManualClock()
+    registry = ActiveBatchRegistry(clock)
+    coordinator = Coordinator([make_record(1)])
+    coordinator.release = threading.Event()
+    store = make_store(coordinator)
+    clock.advance(60)
+
+    try:
+        # The coordinator hangs; both calls return straight away
+        store.reconcile(registry)
+        store.save_logs([{"batch_id": 1}])
+
+        # Retried after a full interval, not on every tick
+        assert registry.last_reconcile == 60
+        assert not registry.reconcile_due(30)
+        assert registry.snapshot() == {}
+        assert coordinator.waiting.wait(5)
+    finally:
+        coordinator.release.set()
+        store.close()
+
+    assert set(registry.snapshot()) == {1}
+    assert [request.url.path for request in coordinator.requests] == [
+        "/api/nodes/pi-1/sync", "/api/nodes/pi-1/readings"
+    ]
+
+
+def test_pushes_are_gzipped_and_authenticated():
+    coordinator = Coordinator()
+    store = make_store(coordinator)
+
+    store.save_logs([{"batch_id": 1, "timestamp": datetime(2026, 1, 1), "actual_temp": 19.0}])
+    store.close()
+
+    request = coordinator.requests[-1]
+    assert request.url.path == "/api/nodes/pi-1/readings"
+    assert request.headers["X-Node-Token"] == "secret"
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert decode_payload(request.content, "gzip")["logs"][0]["timestamp"] == "2026-01-01T00:00:00"
+
+
+def test_failed_push_is_kept_for_the_next_attempt():
+    coordinator = Coordinator(fail=True)
+    store = make_store(coordinator)
+    store.outbox.extend([{"logs": [{"batch_id": 1}]}, {"relay_stats": {}}])
+
+    assert not store.push()
+    assert len(store.outbox) == 2
+
+    coordinator.fail = False
+    assert store.push()
+    assert not store.outbox
+    assert [decode_payload(request.content, "gzip") for request in coordinator.requests] == [
+        {"logs": [{"batch_id": 1}]}, {"relay_stats": {}}
+    ]
+
+
+def test_outbox_drops_oldest_past_the_limit(monkeypatch):
+    monkeypatch.setattr(settings, "node_outbox_limit", 2)
+    coordinator = Coordinator()
+    coordinator.release = threading.Event()
+    store = make_store(coordinator)
+    # Leave the sync thread parked so the outbox is only filled here
+    monkeypatch.setattr(store, "_start", lambda: None)
+
+    for batch_id in (1, 2, 3):
+        store.save_logs([{"batch_id": batch_id}])
+
+    assert [payload["logs"][0]["batch_id"] for payload in store.outbox] == [2, 3]
+
+
+def test_live_state_only_reports_fresh_nodes():
+    live = NodeLiveState()
+    live.update("pi-1", {"batches": [{"batch_id": 7}], "energy": {"7": {"energy_wh": 1.0}}})
+
+    assert [entry["batch_id"] for entry in live.get_batches()] == [7]
+    assert live.get_energy(7) == {"energy_wh": 1.0}
+
+    live.nodes["pi-1"]["received_at"] -= 10_000
+    assert live.get_batches() == []
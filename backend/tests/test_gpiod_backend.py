@@ -0,0 +1,98 @@
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+
+from app.hardware import gpiod_backend
+from app.hardware.gpiod_backend import GpiodRelayInterface
+
+
+class Direction(Enum):
+    OUTPUT = "output"
+
+
+class Value(Enum):
+    INACTIVE = 0
+    ACTIVE = 1
+
+
+class FakeLineRequest:
+    def __init__(self, config):
+        self.values = {gpio_pin: settings.output_value for gpio_pin, settings in config.items()}
+        self.set_calls = []
+        self.released = False
+
+    def set_values(self, values):
+        assert not self.released
+        assert set(values) <= set(self.values)
+        self.set_calls.append(dict(values))
+        self.values.update(values)
+
+    def release(self):
+        self.released = True
+
+
+class FakeGpiod:
+    """Stands in for the gpiod module: request_lines and LineSettings."""
+
+    def __init__(self):
+        self.requests = []
+
+    def LineSettings(self, direction, output_value):
+        return SimpleNamespace(direction=direction, output_value=output_value)
+
+    def request_lines(self, path, consumer, config):
+        request = FakeLineRequest(config)
+        self.requests.append(request)
+        return request
+
+
+@pytest.fixture
+def gpiod(monkeypatch):
+    fake = FakeGpiod()
+    monkeypatch.setattr(gpiod_backend, "GPIOD_AVAILABLE", True)
+    monkeypatch.setattr(gpiod_backend, "gpiod", fake, raising=False)
+    monkeypatch.setattr(gpiod_backend, "Direction", Direction, raising=False)
+    monkeypatch.setattr(gpiod_backend, "Value", Value, raising=False)
+    return fake
+
+
+def test_apply_sets_all_lines_with_one_call(gpiod):
+    relays = GpiodRelayInterface("/dev/gpiochip0")
+    relays.setup_many([17, 27, 22])
+    (request,) = gpiod.requests
+
+    relays.apply({27: False, 17: True, 22: True})
+
+    assert request.set_calls == [{27: Value.INACTIVE, 17: Value.ACTIVE, 22: Value.ACTIVE}]
+    assert relays.get_state(17) and not relays.get_state(27)
+
+
+def test_adding_pins_leaves_active_lines_requested(gpiod):
+    relays = GpiodRelayInterface("/dev/gpiochip0")
+    relays.setup_many([17, 27])
+    relays.apply({17: True})
+    first = gpiod.requests[0]
+
+    relays.setup(22)
+    relays.apply({5: True})
+
+    assert not first.released
+    assert first.values[17] == Value.ACTIVE
+    assert len(first.set_calls) == 1
+    # New lines are driven to their state by the request itself
+    second, third = gpiod.requests[1:]
+    assert second.values == {22: Value.INACTIVE}
+    assert third.values == {5: Value.ACTIVE} and third.set_calls == []
+
+
+def test_cleanup_switches_off_and_releases_every_request(gpiod):
+    relays = GpiodRelayInterface("/dev/gpiochip0")
+    relays.setup_many([17, 27])
+    relays.apply({17: True, 5: True})
+
+    relays.cleanup()
+
+    assert all(request.released for request in gpiod.requests)
+    assert all(value == Value.INACTIVE for request in gpiod.requests for value in request.values.values())
+    assert not relays.get_state(17)
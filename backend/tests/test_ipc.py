@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.controllers import ipc
+from app.controllers.ipc import (
+    HEADER,
+    LeaderLock,
+    NotificationListener,
+    SharedStateReader,
+    SharedStateWriter,
+    send_notification,
+)
+
+
+@pytest.fixture
+def shm_name():
+    return f"brewbuddy_test_{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def writer(shm_name, monkeypatch):
+    # Readers here share the writer's process; keep them from dropping its cleanup registration
+    monkeypatch.setattr(ipc, "resource_tracker", SimpleNamespace(unregister=lambda name, rtype: None))
+    writer = SharedStateWriter(shm_name, 4096)
+    yield writer
+    writer.close()
+
+
+def test_reader_sees_latest_published_state(shm_name, writer):
+    reader = SharedStateReader(shm_name)
+    assert reader.read() is None
+
+    assert writer.publish({"ticks": 1})
+    assert writer.publish({"ticks": 2, "batches": {"1": 19.5}})
+
+    state = reader.read()
+    assert state.pop("published_at") > 0
+    assert state == {"ticks": 2, "batches": {"1": 19.5}}
+    assert writer.sequence == 4
+
+
+def test_reader_without_segment():
+    assert SharedStateReader(f"brewbuddy_test_missing_{os.getpid()}").read() is None
+
+
+def test_oversized_state_is_not_published(shm_name, writer):
+    writer.publish({"ticks": 1})
+
+    assert not writer.publish({"pad": "x" * 5000})
+    assert SharedStateReader(shm_name).read()["ticks"] == 1
+
+
+def test_reader_gives_up_while_a_write_is_in_progress(shm_name, writer):
+    writer.publish({"ticks": 1})
+    HEADER.pack_into(writer.shm.buf, 0, writer.sequence + 1, 0)  # odd: writer stalled mid-update
+
+    assert SharedStateReader(shm_name).read(retries=2) is None
+
+
+def test_reopened_segment_continues_the_sequence(shm_name, writer):
+    writer.publish({"ticks": 1})
+
+    restarted = SharedStateWriter(shm_name, 4096)
+    assert SharedStateReader(shm_name).read(retries=1) is None  # stale state is hidden
+    restarted.publish({"ticks": 2})
+
+    assert restarted.sequence == 6
+    assert SharedStateReader(shm_name).read()["ticks"] == 2
+    restarted.shm.close()
+
+
+def test_reader_follows_a_restarted_writer(shm_name, writer):
+    reader = SharedStateReader(shm_name)
+    writer.publish({"v": 1})
+    assert reader.read()["v"] == 1
+
+    writer.close()
+    assert reader.read() is None
+    restarted = SharedStateWriter(shm_name, 4096)
+    restarted.publish({"v": 2})
+    assert reader.read()["v"] == 2
+
+    restarted.close()
+    assert reader.read() is None
+
+
+def test_stale_state_counts_as_absent(shm_name, writer, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ipc, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=time.sleep))
+    reader = SharedStateReader(shm_name)
+    writer.publish({"v": 1})
+
+    now[0] += 30
+    assert reader.read(max_age=30) == {"v": 1, "published_at": 100.0}
+    now[0] += 1
+    assert reader.read(max_age=30) is None
+    assert reader.read()["v"] == 1
+
+
+def _publish_forever(name, stop):
+    writer = SharedStateWriter(name, 4096)
+    n = 0
+    while not stop.is_set():
+        n += 1
+        writer.publish({"n": n, "pad": "x" * (n % 997)})
+    writer.shm.close()
+
+
+def test_concurrent_writer_never_yields_a_torn_state(shm_name, writer):
+    writer.publish({"n": 0, "pad": ""})
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(target=_publish_forever, args=(shm_name, stop))
+    process.start()
+    try:
+        reader = SharedStateReader(shm_name)
+        seen = set()
+        deadline = time.monotonic() + 10
+        while len(seen) < 200 and time.monotonic() < deadline:
+            state = reader.read(retries=50)
+            if state is not None:
+                assert len(state["pad"]) == state["n"] % 997
+                seen.add(state["n"])
+    finally:
+        stop.set()
+        process.join(timeout=5)
+    assert len(seen) == 200
+
+
+def test_only_one_leader(tmp_path):
+    first, second = LeaderLock(str(tmp_path / "lock")), LeaderLock(str(tmp_path / "lock"))
+
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_notifications_reach_the_listener(tmp_path):
+    received = threading.Event()
+    messages = []
+
+    def handler(kind, entity_id, value):
+        messages.append((kind, entity_id, value))
+        received.set()
+
+    path = str(tmp_path / "controller.sock")
+    listener = NotificationListener(path, handler)
+    listener.start()
+    try:
+        assert send_notification(path, "batch", 7, {"status": "active"})
+        assert received.wait(2)
+    finally:
+        listener.stop()
+
+    assert messages == [("batch", 7, {"status": "active"})]
+    assert not send_notification(path, "batch", 7)
@@ -0,0 +1,63 @@
+from app.clock import ManualClock
+from app.config import settings
+from app.controllers.log_buffer import LogBuffer, LogSampler
+
+
+def test_fixed_mode_logs_once_per_interval(monkeypatch):
+    monkeypatch.setattr(settings, "log_mode", "fixed")
+    monkeypatch.setattr(settings, "log_interval", 60)
+    sampler = LogSampler()
+
+    assert sampler.should_log(1, 19.0, 19.0, "idle", 0.0)
+    sampler.mark_logged(1, 19.0, 19.0, "idle", 0.0)
+    assert not sampler.should_log(1, 25.0, 19.0, "cooling", 59.0)
+    assert sampler.should_log(1, 19.0, 19.0, "idle", 60.0)
+    assert sampler.should_log(2, 19.0, 19.0, "idle", 1.0)  # batches are sampled independently
+
+
+def test_adaptive_mode_logs_changes(monkeypatch):
+    monkeypatch.setattr(settings, "log_mode", "adaptive")
+    monkeypatch.setattr(settings, "log_deadband_temp", 0.1)
+    monkeypatch.setattr(settings, "log_max_interval", 300)
+    sampler = LogSampler()
+    sampler.mark_logged(1, 19.0, 19.0, "idle", 0.0)
+
+    assert not sampler.should_log(1, 19.05, 19.0, "idle", 10.0)
+    assert sampler.should_log(1, 19.2, 19.0, "idle", 10.0)
+    assert sampler.should_log(1, 19.0, 19.0, "heating", 10.0)
+    assert sampler.should_log(1, 19.0, 20.0, "idle", 10.0)
+    assert sampler.should_log(1, 19.0, 19.0, "idle", 300.0)
+
+
+def test_forget_starts_the_batch_afresh():
+    sampler = LogSampler()
+    sampler.mark_logged(1, 19.0, 19.0, "idle", 0.0)
+    sampler.forget(1)
+    assert sampler.should_log(1, 19.0, 19.0, "idle", 1.0)
+
+
+def test_buffer_flush_timing_and_restore_order():
+    clock = ManualClock()
+    buffer = LogBuffer(clock)
+    buffer.add(1, 19.0, 19.0, "idle", 0.0)
+    assert not buffer.flush_due(30)
+    clock.advance(30)
+    assert buffer.flush_due(30)
+
+    taken = buffer.take()
+    assert [row['batch_id'] for row in taken] == [1]
+    assert not buffer.flush_due(30)
+
+    buffer.add(2, 19.0, 19.0, "idle", 0.0)
+    buffer.restore(taken)  # the failed write goes back ahead of newer rows
+    assert [row['batch_id'] for row in buffer.take()] == [1, 2]
+
+
+def test_rows_are_stamped_when_added():
+    clock = ManualClock()
+    buffer = LogBuffer(clock)
+    buffer.add(1, 19.0, 19.0, "idle", 0.0)
+    clock.advance(120)
+    buffer.add(1, 19.0, 19.0, "idle", 0.0)
+    first, second = buffer.take()
+    assert (second['timestamp'] - first['timestamp']).total_seconds() == 120
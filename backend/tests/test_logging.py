@@ -0,0 +1,56 @@
+import json
+import logging
+from types import SimpleNamespace
+
+from app import logging_config
+from app.config import settings
+from app.logging_config import JsonFormatter, RateLimitedLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_logger(name: str) -> tuple[RateLimitedLogger, ListHandler]:
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return RateLimitedLogger(logger), handler
+
+
+def test_repeats_are_counted_not_logged(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(logging_config, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(settings, "log_error_repeat_interval", 300)
+    errors, handler = make_logger("tests.rate_limited")
+
+    errors.error("sensor-a", "Sensor %s failed", "a")
+    for _ in range(4):
+        now[0] += 10
+        errors.error("sensor-a", "Sensor %s failed", "a")
+    errors.error("sensor-b", "Sensor %s failed", "b")
+    now[0] = 301
+    errors.error("sensor-a", "Sensor %s failed", "a")
+
+    assert [record.getMessage() for record in handler.records] == [
+        "Sensor a failed",
+        "Sensor b failed",
+        "Sensor a failed (4 repeats suppressed)",
+    ]
+
+
+def test_json_lines_include_extra_fields():
+    record = logging.LogRecord("app.test", logging.WARNING, __file__, 1, "Read %s", ("28-a",), None)
+    record.sensor_id = "28-a"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Read 28-a"
+    assert entry["level"] == "WARNING"
+    assert entry["sensor_id"] == "28-a"
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.metrics import Counter, Gauge, Histogram, Metric, Registry, RequestMetricsMiddleware, render
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        Metric("brewbuddy_test", "Test", registry=Registry())
+
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    relays = Counter("brewbuddy_test_relays", "Relay \"changes\"", ("state",), registry=registry)
+    clients = Gauge("brewbuddy_test_clients", "Clients", registry=registry)
+    relays.labels("on").inc()
+    relays.labels("on").inc(2)
+    clients.set_function(lambda: 3)
+
+    assert render(registry.collect()) == (
+        '# HELP brewbuddy_test_relays Relay \\"changes\\"\n'
+        "# TYPE brewbuddy_test_relays counter\n"
+        'brewbuddy_test_relays_total{state="on"} 3.0\n'
+        "# HELP brewbuddy_test_clients Clients\n"
+        "# TYPE brewbuddy_test_clients gauge\n"
+        "brewbuddy_test_clients 3.0\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = Histogram("brewbuddy_test_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+
+    (family,) = registry.collect()
+    samples = {(name, labels.get("le")): value for name, labels, value in family["samples"]}
+    assert samples[("brewbuddy_test_seconds_bucket", "0.1")] == 2
+    assert samples[("brewbuddy_test_seconds_bucket", "1.0")] == 3
+    assert samples[("brewbuddy_test_seconds_bucket", "+Inf")] == 4
+    assert samples[("brewbuddy_test_seconds_count", None)] == 4
+    assert samples[("brewbuddy_test_seconds_sum", None)] == pytest.approx(2.65)
+
+
+def test_middleware_labels_requests_by_route_template(monkeypatch):
+    from app import metrics
+
+    registry = Registry()
+    requests = Histogram("brewbuddy_test_http_seconds", "Requests", ("method", "route"), registry=registry)
+    monkeypatch.setattr(metrics, "HTTP_REQUEST_SECONDS", requests)
+
+    class Route:
+        path = "/api/batches/{batch_id}"
+
+    async def app(scope, receive, send):
+        scope["route"] = Route()
+
+    middleware = RequestMetricsMiddleware(app)
+    asyncio.run(middleware({"type": "http", "method": "GET"}, None, None))
+
+    assert list(requests.children) == [("GET", "/api/batches/{batch_id}")]
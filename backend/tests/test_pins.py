@@ -0,0 +1,26 @@
+from app.config import settings
+from app.hardware.pins import PinRegistry, split_pin
+
+
+def test_split_pin(monkeypatch):
+    monkeypatch.setattr(settings, "expander_pin_base", 100)
+
+    assert split_pin(17) == (None, 17)
+    assert split_pin(100) == (0, 0)
+    assert split_pin(117) == (1, 1)
+
+
+def test_conflicts_are_per_node():
+    pins = PinRegistry.from_rows([(1, None, 17, 27, "28-a"), (2, "pi-1", 22, 23, "28-b")])
+
+    assert pins.find_conflict(None, 22, 23, "28-b") is None
+    assert pins.find_conflict("pi-1", 17, 27, "28-a") is None
+    assert pins.find_conflict(None, 27, 5, "28-c") == "GPIO pin 27 already in use by fermenter 1 (chiller)"
+    assert pins.find_conflict("pi-1", 5, 6, "28-b") == "Sensor 28-b already in use by fermenter 2"
+
+
+def test_conflict_ignores_the_fermenter_being_rewired():
+    pins = PinRegistry.from_rows([(1, None, 17, 27, "28-a")])
+
+    assert pins.find_conflict(None, 27, 17, "28-a", exclude_id=1) is None
+    assert pins.find_conflict(None, 5, 5, "28-c") == "Heater and chiller cannot share GPIO pin 5"
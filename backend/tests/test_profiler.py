@@ -0,0 +1,93 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import profiler
+from app.config import settings
+
+
+def spin_until(event):
+    while not event.is_set():
+        sum(range(1000))
+
+
+def test_samples_running_threads():
+    done = threading.Event()
+    worker = threading.Thread(target=spin_until, args=(done,), name="busy")
+    worker.start()
+    session = profiler.SamplingProfiler(interval=0.002, duration=0.2)
+    session.start()
+    session.thread.join()
+    done.set()
+    worker.join()
+
+    assert session.samples > 10
+    busy = [line for line in session.collapsed().splitlines() if line.startswith("busy;")]
+    assert any("spin_until" in line for line in busy)
+
+
+def test_frame_label_without_qualname():
+    # Code objects before Python 3.11 have no co_qualname
+    code = SimpleNamespace(co_filename="/usr/lib/python3.9/json/decoder.py", co_name="decode", co_firstlineno=332)
+    assert profiler._frame_label(SimpleNamespace(f_code=code)) == "decode (decoder.py:332)"
+
+
+def test_one_session_at_a_time():
+    first = profiler.start_session(5.0, 0.01)
+    try:
+        assert first is not None
+        assert profiler.start_session(5.0, 0.01) is None
+    finally:
+        first.stop()
+    assert not first.running
+    second = profiler.start_session(0.05, 0.01)
+    assert second is not None
+    second.stop()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow():
+        time.sleep(0.05)
+        return {"ok": True}
+
+    @app.get("/forbidden", status_code=403)
+    def forbidden():
+        return {"detail": "no"}
+
+    app.add_middleware(profiler.RequestProfilerMiddleware)
+    monkeypatch.setattr(profiler, "_is_admin", lambda authorization: authorization == "Bearer admin")
+    return TestClient(app)
+
+
+def test_request_profiling_off_by_default(client):
+    assert settings.profiler_request_enabled is False
+    response = client.get("/slow?profile=true", headers={"Authorization": "Bearer admin"})
+    assert response.json() == {"ok": True}
+
+
+def test_request_profiling_requires_admin(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiler_request_enabled", True)
+    assert client.get("/slow?profile=true").json() == {"ok": True}
+    assert client.get("/slow?profile=true", headers={"Authorization": "Bearer user"}).json() == {"ok": True}
+
+
+def test_request_profiling_returns_stacks_with_original_status(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiler_request_enabled", True)
+    headers = {"Authorization": "Bearer admin"}
+
+    response = client.get("/slow?profile=true", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    assert "slow" in response.text
+
+    response = client.get("/forbidden?profile=true", headers=headers)
+    assert response.status_code == 403
+    assert response.headers["X-Profiled-Status"] == "403"
@@ -0,0 +1,130 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from app.clock import ManualClock
+from app.controllers import registry as registry_module
+from app.controllers.registry import ActiveBatchRegistry, load_records
+
+from tests.factories import make_record, with_phases
+
+START = datetime(2026, 1, 1)
+
+
+def record_with(*phases):
+    return with_phases(make_record(), *phases)
+
+
+def test_current_phase_and_target():
+    record = record_with((24, 18.0), (48, 20.0))
+
+    assert record.current_phase(START + timedelta(hours=12)) == (0, 50.0)
+    assert record.current_phase(START + timedelta(hours=48)) == (1, 50.0)
+    assert record.target_temperature(START + timedelta(hours=48)) == 20.0
+    assert record.current_phase(START + timedelta(hours=500)) == (1, 100)
+
+
+def test_zero_length_phase_is_skipped():
+    record = record_with((24, 18.0), (0, 25.0), (48, 20.0))
+
+    assert record.current_phase(START + timedelta(hours=24)) == (0, 100.0)
+    assert record.current_phase(START + timedelta(hours=30)) == (2, 12.5)
+    assert record.target_temperature(START + timedelta(hours=30)) == 20.0
+
+
+def test_only_zero_length_phases():
+    record = record_with((0, 18.0), (0, 21.0))
+
+    assert record.current_phase(START + timedelta(hours=1)) == (1, 100)
+    assert record.target_temperature(START) == 21.0
+
+
+def test_no_start_time_or_phases():
+    assert record_with().current_phase(START) == (None, 0)
+    assert replace(make_record(), start_time=None).target_temperature(START) is None
+
+
+def test_load_records_only_loads_active_batches_of_the_node(db, make_batch):
+    active = make_batch()
+    make_batch(status="complete")
+    on_node = make_batch(node_id="pi-1")
+
+    assert set(load_records(db)) == {active.id}
+    assert set(load_records(db, "pi-1")) == {on_node.id}
+
+
+def test_reconcile_picks_up_changes_made_without_notification(db, make_batch):
+    first = make_batch()
+    registry = ActiveBatchRegistry()
+    registry.reconcile(db)
+    assert set(registry.snapshot()) == {first.id}
+    unchanged = registry.snapshot()[first.id]
+
+    second = make_batch()
+    first.status = "complete"
+    db.commit()
+    registry.reconcile(db)
+
+    assert set(registry.snapshot()) == {second.id}
+
+    first.status = "active"
+    db.commit()
+    registry.reconcile(db)
+    assert registry.snapshot()[first.id] == unchanged
+
+
+def test_refresh_batch_reloads_one_record(db, make_batch):
+    batch = make_batch(phases=((48.0, 19.0),))
+    registry = ActiveBatchRegistry()
+    registry.refresh_batch(db, batch.id)
+    assert registry.snapshot()[batch.id].phases[0].target_temp == 19.0
+
+    batch.fermenter.size_liters = 30.0
+    db.commit()
+    registry.refresh_fermenter(db, batch.fermenter_id)
+    assert registry.snapshot()[batch.id].size_liters == 30.0
+
+    batch.status = "complete"
+    db.commit()
+    registry.refresh_batch(db, batch.id)
+    assert batch.id not in registry.snapshot()
+
+
+def test_refresh_keeps_identity_of_unchanged_records(db, make_batch):
+    batch = make_batch()
+    registry = ActiveBatchRegistry()
+    registry.refresh_batch(db, batch.id)
+    first = registry.snapshot()[batch.id]
+    version = registry.version
+
+    registry.refresh_batch(db, batch.id)
+
+    assert registry.snapshot()[batch.id] is first
+    assert registry.version == version
+
+
+def test_stale_reconcile_does_not_overwrite_a_notification(db, make_batch, monkeypatch):
+    batch = make_batch()
+    registry = ActiveBatchRegistry()
+    original = registry_module._active_batch_ids
+
+    def racing_query(session, node_id):
+        ids = original(session, node_id)
+        registry.refresh_batch(db, batch.id)  # a notification lands mid-reconcile
+        return ids - {batch.id}
+
+    monkeypatch.setattr(registry_module, "_active_batch_ids", racing_query)
+    registry.reconcile(db)
+
+    assert batch.id in registry.snapshot()
+
+
+def test_reconcile_interval_follows_the_registry_clock(db):
+    clock = ManualClock()
+    registry = ActiveBatchRegistry(clock)
+    assert registry.reconcile_due(30)
+
+    registry.reconcile(db)
+    clock.advance(29)
+    assert not registry.reconcile_due(30)
+    clock.advance(1)
+    assert registry.reconcile_due(30)
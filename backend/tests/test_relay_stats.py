@@ -0,0 +1,45 @@
+from app.clock import ManualClock
+from app.controllers.relay_stats import RelayStatsTracker
+
+
+def test_cycles_and_on_time_since_last_flush():
+    clock = ManualClock()
+    stats = RelayStatsTracker(clock)
+
+    stats.record(1, 17, "heater", True)
+    clock.advance(30)
+    stats.record(1, 17, "heater", True)
+    clock.advance(30)
+    stats.record(1, 17, "heater", False)
+    stats.record(1, 17, "heater", True)
+    clock.advance(15)
+
+    assert stats.get_pending(17) == {"cycles": 2, "on_seconds": 75.0}
+    assert stats.take_pending() == {17: (1, "heater", 2, 75.0)}
+
+    clock.advance(5)
+    assert stats.take_pending() == {17: (1, "heater", 0, 5.0)}  # still on, no new cycle
+
+
+def test_idle_relays_are_not_flushed():
+    clock = ManualClock()
+    stats = RelayStatsTracker(clock)
+    stats.record(1, 27, "chiller", False)
+    clock.advance(60)
+
+    assert stats.take_pending() == {}
+    assert stats.flush_due(60) is False
+    clock.advance(60)
+    assert stats.flush_due(60)
+
+
+def test_failed_flush_is_restored():
+    clock = ManualClock()
+    stats = RelayStatsTracker(clock)
+    stats.record(1, 17, "heater", True)
+    clock.advance(10)
+    stats.record(1, 17, "heater", False)
+
+    stats.restore(stats.take_pending())
+
+    assert stats.take_pending() == {17: (1, "heater", 1, 10.0)}
@@ -0,0 +1,85 @@
+from app.config import settings
+from app.hardware.base import RelayInterface
+from app.hardware.expander import MCP23017, ExpanderRelayInterface, MockI2CBus
+from app.hardware.manager import HardwareManager
+
+
+class RecordingRelays(RelayInterface):
+    """Keeps relay states and every write, in order."""
+
+    def __init__(self):
+        self.pins = {}
+        self.writes = []  # (gpio_pin, on) in the order they reached the pins
+        self.applies = []
+
+    def setup(self, gpio_pin: int):
+        self.pins[gpio_pin] = False
+
+    def activate(self, gpio_pin: int):
+        self.pins[gpio_pin] = True
+        self.writes.append((gpio_pin, True))
+
+    def deactivate(self, gpio_pin: int):
+        self.pins[gpio_pin] = False
+        self.writes.append((gpio_pin, False))
+
+    def apply(self, states: dict[int, bool]):
+        self.applies.append(dict(states))
+        super().apply(states)
+
+    def get_state(self, gpio_pin: int) -> bool:
+        return self.pins.get(gpio_pin, False)
+
+    def cleanup(self):
+        self.pins.clear()
+
+
+def make_manager() -> tuple[HardwareManager, RecordingRelays]:
+    manager = HardwareManager()
+    manager.relay_interface = relays = RecordingRelays()
+    manager.mock_relay = None
+    return manager, relays
+
+
+def test_switch_offs_are_written_before_switch_ons():
+    manager, relays = make_manager()
+    manager.apply_relays({17: True, 27: False})
+
+    # Fermenter flips from heating to cooling: heater 17 off, chiller 27 on
+    manager.apply_relays({27: True, 17: False})
+
+    assert relays.applies[-1] == {17: False, 27: True}
+    assert list(relays.applies[-1]) == [17, 27]
+    assert relays.writes[-2:] == [(17, False), (27, True)]
+
+
+def test_only_changed_relays_are_written():
+    manager, relays = make_manager()
+    manager.apply_relays({17: True, 27: False, 22: False})
+    assert relays.applies == [{27: False, 22: False, 17: True}]
+
+    manager.apply_relays({17: True, 27: False, 22: True})
+    manager.apply_relays({17: True, 27: False, 22: True})
+
+    assert relays.applies[1:] == [{22: True}]
+    assert manager.setup_pins == {17, 22, 27}
+
+
+def test_expanders_are_written_once_per_apply(monkeypatch):
+    monkeypatch.setattr(settings, "expander_pin_base", 100)
+    bus = MockI2CBus()
+    native = RecordingRelays()
+    relays = ExpanderRelayInterface(native, [MCP23017(bus, 0x20), MCP23017(bus, 0x21)])
+    relays.setup_many([17, 100, 101, 116])
+    writes = bus.writes
+
+    relays.apply({100: False, 17: True, 101: True, 116: True})
+
+    assert bus.writes - writes == 2  # one latch write per expander
+    assert native.applies == [{17: True}]
+    assert bus.registers[(0x20, 0x14)] == 0b10
+    assert bus.registers[(0x21, 0x14)] == 0b1
+    assert relays.get_state(101) and not relays.get_state(100)
+
+    relays.apply({101: True})
+    assert bus.writes - writes == 2  # unchanged latches are not rewritten
@@ -0,0 +1,51 @@
+from app.clock import ManualClock
+from app.controllers.scheduler import TickScheduler
+
+
+def start(interval=1.0):
+    clock = ManualClock()
+    scheduler = TickScheduler(interval, clock)
+    scheduler.start()
+    return scheduler, clock
+
+
+def test_ticks_follow_absolute_deadlines():
+    scheduler, clock = start()
+
+    assert scheduler.wait_for_tick()
+    clock.advance(0.3)
+    assert scheduler.end_tick() == 0
+    assert scheduler.next_deadline == 1.0
+
+    clock.advance(0.75)  # woke up 50 ms late
+    assert scheduler.wait_for_tick()
+    clock.advance(0.1)
+    scheduler.end_tick()
+
+    stats = scheduler.get_stats()
+    assert scheduler.next_deadline == 2.0
+    assert stats["ticks"] == 2
+    assert stats["last_jitter_ms"] == 50.0
+    assert stats["max_duration_ms"] == 300.0
+
+
+def test_overrun_skips_missed_ticks():
+    scheduler, clock = start()
+
+    scheduler.wait_for_tick()
+    clock.advance(3.5)
+
+    assert scheduler.end_tick() == 3
+    assert scheduler.next_deadline == 4.0
+    assert scheduler.get_stats()["overruns"] == 1
+    assert scheduler.get_stats()["skipped_ticks"] == 3
+
+
+def test_stop_ends_the_wait():
+    scheduler, clock = start(interval=60.0)
+    scheduler.wait_for_tick()
+    scheduler.end_tick()
+
+    scheduler.stop()
+
+    assert not scheduler.wait_for_tick()
@@ -0,0 +1,89 @@
+import threading
+from typing import Optional
+
+import pytest
+
+from app.config import settings
+from app.hardware.base import SensorInterface
+from app.hardware.manager import HardwareManager
+
+
+class BlockingSensors(SensorInterface):
+    """Reads block until `release` is set, returning `value`."""
+
+    def __init__(self, value: Optional[float] = 19.0):
+        self.value = value
+        self.reading = threading.Event()
+        self.release = threading.Event()
+        self.reads = 0
+
+    def read_temperature(self, sensor_id: str) -> Optional[float]:
+        self.reads += 1
+        self.reading.set()
+        self.release.wait(5)
+        return self.value
+
+    def get_all_sensors(self) -> list[str]:
+        return ["a"]
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setattr(settings, "sensor_read_retries", 0)
+    monkeypatch.setattr(settings, "sensor_cache_ttl", 60.0)
+    monkeypatch.setattr(settings, "sensor_read_timeout", 5.0)
+
+
+def make_manager(sensors: SensorInterface) -> HardwareManager:
+    manager = HardwareManager()
+    manager.sensor_interface = sensors
+    return manager
+
+
+def read_concurrently(manager: HardwareManager, sensors: BlockingSensors, callers: int) -> list:
+    results = []
+    leader = threading.Thread(target=lambda: results.append(manager.get_temperature("a")))
+    leader.start()
+    assert sensors.reading.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(manager.get_temperature("a")))
+        for _ in range(callers - 1)
+    ]
+    for thread in followers:
+        thread.start()
+    sensors.release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_misses_share_one_read():
+    sensors = BlockingSensors()
+    manager = make_manager(sensors)
+
+    assert read_concurrently(manager, sensors, 8) == [19.0] * 8
+    assert sensors.reads == 1
+    assert not manager.inflight_reads
+
+
+def test_followers_get_a_failed_read_too():
+    sensors = BlockingSensors(value=None)
+    manager = make_manager(sensors)
+
+    assert read_concurrently(manager, sensors, 4) == [None] * 4
+    assert sensors.reads == 1
+
+
+def test_cached_reading_is_used_until_too_old():
+    sensors = BlockingSensors()
+    sensors.release.set()
+    manager = make_manager(sensors)
+
+    assert manager.get_temperature("a") == 19.0
+    assert manager.get_temperature("a") == 19.0
+    assert sensors.reads == 1
+
+    sensors.value = 20.0
+    assert manager.get_temperature("a", max_age=0) == 20.0
+    assert manager.get_temperature("a") == 20.0
+    assert sensors.reads == 2
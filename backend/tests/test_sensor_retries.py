@@ -0,0 +1,112 @@
+from typing import Optional
+
+import pytest
+
+from app.config import settings
+from app.hardware.base import SensorInterface
+from app.hardware.manager import HardwareManager
+
+
+class FlakySensors(SensorInterface):
+    """Each sensor fails its first `failures[sensor_id]` reads, then returns 19.0."""
+
+    def __init__(self, failures: dict, bulk: bool = False):
+        self.failures = dict(failures)
+        self.bulk = bulk
+        self.reads = []  # sensor ids in read order
+        self.bulk_reads = 0
+
+    def read_temperature(self, sensor_id: str) -> Optional[float]:
+        self.reads.append(sensor_id)
+        if self.failures.get(sensor_id, 0) > 0:
+            self.failures[sensor_id] -= 1
+            return None
+        return 19.0
+
+    def get_all_sensors(self) -> list[str]:
+        return list(self.failures)
+
+    def supports_bulk_read(self) -> bool:
+        return self.bulk
+
+    def read_many(self, sensor_ids):
+        self.bulk_reads += 1
+        return {sensor_id: self.read_temperature(sensor_id) for sensor_id in sensor_ids}
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "sensor_retry_delay", 0.001)
+    monkeypatch.setattr(settings, "sensor_read_retries", 2)
+    monkeypatch.setattr(settings, "sensor_read_timeout", 1.0)
+    monkeypatch.setattr(settings, "sensor_backoff_after", 3)
+
+
+def make_manager(sensors: SensorInterface) -> HardwareManager:
+    manager = HardwareManager()
+    manager.sensor_interface = sensors
+    return manager
+
+
+def test_failed_read_is_retried():
+    sensors = FlakySensors({"a": 2})
+    manager = make_manager(sensors)
+
+    assert manager.read_temperature("a") == 19.0
+    assert sensors.reads == ["a", "a", "a"]
+    assert manager.sensor_health.get_stats()["a"]["failures"] == 2
+
+
+def test_retries_are_bounded():
+    sensors = FlakySensors({"a": 10})
+    manager = make_manager(sensors)
+
+    assert manager.read_temperature("a") is None
+    assert len(sensors.reads) == settings.sensor_read_retries + 1
+
+
+def test_no_retry_when_budget_is_spent(monkeypatch):
+    monkeypatch.setattr(settings, "sensor_read_timeout", 0.0)
+    sensors = FlakySensors({"a": 1})
+    manager = make_manager(sensors)
+
+    assert manager.read_temperature("a") is None
+    assert sensors.reads == ["a"]
+
+
+def test_bulk_read_retries_only_failed_sensors():
+    sensors = FlakySensors({"a": 0, "b": 1, "c": 0}, bulk=True)
+    manager = make_manager(sensors)
+
+    readings = manager.read_temperatures(["a", "b", "c"])
+
+    assert readings == {"a": 19.0, "b": 19.0, "c": 19.0}
+    assert sensors.bulk_reads == 1
+    assert sensors.reads == ["a", "b", "c", "b"]
+    assert manager.get_temperature("b") == 19.0  # the retried value is cached
+
+
+def test_dead_sensor_backs_off():
+    sensors = FlakySensors({"a": 100})
+    manager = make_manager(sensors)
+
+    manager.read_temperature("a")  # three failed attempts reach SENSOR_BACKOFF_AFTER
+    assert manager.sensor_health.in_backoff("a")
+    reads = len(sensors.reads)
+
+    assert manager.read_temperature("a") is None
+    assert manager.read_temperatures(["a"]) == {"a": None}
+    assert len(sensors.reads) == reads
+    assert manager.sensor_health.get_stats()["a"]["backoff_seconds"] > 0
+
+
+def test_success_clears_backoff():
+    sensors = FlakySensors({"a": 3})
+    manager = make_manager(sensors)
+    manager.read_temperature("a")
+    assert manager.sensor_health.in_backoff("a")
+
+    manager.sensor_health.sensors["a"].backoff_until = 0  # backoff expired
+    assert manager.read_temperature("a") == 19.0
+    assert not manager.sensor_health.in_backoff("a")
+    assert manager.sensor_health.get_stats()["a"]["consecutive_failures"] == 0
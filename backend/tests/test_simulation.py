@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from app.config import settings
+from app.hardware.simulation import ThermalSimulator, exotherm_watts
+
+
+@pytest.fixture(autouse=True)
+def no_noise(monkeypatch):
+    monkeypatch.setattr(settings, "simulation_noise", 0.0)
+    monkeypatch.setattr(settings, "simulation_ambient_temp", 20.0)
+
+
+def test_idle_vessel_relaxes_to_ambient():
+    sim = ThermalSimulator()
+    sim.add_vessel("28-a", 10.0, volume_liters=8.0)
+    ua = settings.simulation_ua_factor * 8.0 ** (2 / 3)
+    capacity = 8.0 * 4186.0
+
+    sim.advance(3600)
+
+    expected = 20.0 + (10.0 - 20.0) * math.exp(-ua * 3600 / capacity)
+    assert sim.get_true_temperature("28-a") == pytest.approx(expected)
+
+
+def test_long_steps_match_short_ones():
+    coarse, fine = ThermalSimulator(), ThermalSimulator()
+    for sim in (coarse, fine):
+        sim.add_vessel("28-a", 18.0)
+        sim.configure("28-a", 20.0, heater_watts=100.0, chiller_watts=0.0)
+        sim.set_relay("28-a", "heater", True)
+        sim.add_vessel("28-b", 25.0, volume_liters=40.0)
+
+    coarse.advance(6 * 3600)
+    for _ in range(6 * 60):
+        fine.advance(60)
+
+    for sensor_id in ("28-a", "28-b"):
+        # Only the fermentation heat, held for EXOTHERM_STEP at a time, differs
+        assert coarse.get_true_temperature(sensor_id) == pytest.approx(fine.get_true_temperature(sensor_id), abs=0.01)
+
+
+def test_chiller_cools_below_ambient():
+    sim = ThermalSimulator()
+    sim.configure("28-a", 20.0, heater_watts=0.0, chiller_watts=150.0)
+    sim.set_relay("28-a", "chiller", True)
+
+    sim.advance(24 * 3600)
+
+    assert sim.get_true_temperature("28-a") < 15.0
+
+
+def test_exotherm_peaks_at_the_configured_age():
+    peak = settings.simulation_exotherm_peak_hours * 3600
+
+    assert exotherm_watts(20.0, 0) == 0.0
+    assert exotherm_watts(20.0, peak) == pytest.approx(settings.simulation_exotherm_watts_per_liter * 20.0)
+    assert exotherm_watts(20.0, peak / 2) < exotherm_watts(20.0, peak) > exotherm_watts(20.0, peak * 2)
+
+
+def test_read_quantizes_to_sensor_resolution():
+    sim = ThermalSimulator()
+    sim.add_vessel("28-a", 19.03)
+
+    assert sim.read("28-a") == 19.0
+    assert sim.read("28-unknown") is None
@@ -0,0 +1,83 @@
+import pytest
+
+from app.controllers.strategies import HysteresisStrategy, PIDStrategy, create_strategy
+
+
+def run(pid: PIDStrategy, actual: float, target: float, start: float, seconds: float, step: float = 10.0) -> float:
+    now = start
+    while now < start + seconds:
+        pid.compute(actual, target, now)
+        now += step
+    return now
+
+
+def test_hysteresis_deadband():
+    strategy = HysteresisStrategy(0.5)
+
+    assert strategy.compute(18.4, 19.0, 0) == (True, False)
+    assert strategy.compute(18.6, 19.0, 0) == (False, False)
+    assert strategy.compute(19.6, 19.0, 0) == (False, True)
+
+
+def test_integral_does_not_wind_up_while_saturated():
+    pid = PIDStrategy(kp=0.5, ki=0.001, kd=0.0, window_seconds=600)
+
+    # 5 degrees cold for an hour: P alone saturates the output
+    now = run(pid, 14.0, 19.0, 0, 3600)
+    assert pid.integral == 0.0
+
+    # Close to target the output follows P instead of an hour of stored integral
+    assert pid._update_output(18.9, 19.0, now) == pytest.approx(0.05 + 0.001 * 0.1 * 10)
+
+
+def test_integral_accumulates_and_is_clamped_when_unsaturated():
+    pid = PIDStrategy(kp=0.1, ki=0.0001, kd=0.0, window_seconds=600)
+
+    run(pid, 18.0, 19.0, 0, 1000)
+    assert pid.integral == pytest.approx(0.0001 * 1.0 * 990)
+
+    run(pid, 18.0, 19.0, 1000, 100000)
+    assert pid.integral <= 0.9 + 1e-9  # stops where P + I reaches full output
+
+
+def test_integral_unwinds_when_the_error_reverses():
+    pid = PIDStrategy(kp=0.5, ki=0.001, kd=0.0, window_seconds=600)
+    pid.integral = 1.0
+    pid.last_time = 0.0
+
+    pid._update_output(19.5, 19.0, 100)  # output 0.75, not saturated
+
+    assert pid.integral == pytest.approx(1.0 - 0.001 * 0.5 * 100)
+
+
+def test_target_step_does_not_kick_the_derivative():
+    pid = PIDStrategy(kp=0.0, ki=0.0, kd=100.0, window_seconds=600)
+    pid._update_output(19.0, 19.0, 0)
+
+    assert pid._update_output(19.0, 22.0, 10) == 0.0
+    assert pid._update_output(18.9, 22.0, 20) == pytest.approx(1.0)
+
+
+def test_duty_is_time_proportioned_within_a_window():
+    pid = PIDStrategy(kp=0.25, ki=0.0, kd=0.0, window_seconds=600)
+
+    assert pid.compute(18.0, 19.0, 0) == (True, False)
+    assert pid.compute(18.0, 19.0, 149) == (True, False)
+    assert pid.compute(18.0, 19.0, 150) == (False, False)
+    assert pid.compute(20.0, 19.0, 599) == (False, False)  # duty is latched for the window
+    assert pid.compute(20.0, 19.0, 600) == (False, True)
+
+
+def test_short_pulses_are_skipped():
+    pid = PIDStrategy(kp=0.01, ki=0.0, kd=0.0, window_seconds=600, min_on_seconds=30)
+
+    assert pid.compute(18.0, 19.0, 0) == (False, False)
+    assert pid.duty == 0.0
+
+
+def test_create_strategy_uses_fermenter_gains():
+    pid = create_strategy("pid", kp=1.0, ki=0.5, kd=0.25)
+
+    assert isinstance(pid, PIDStrategy)
+    assert (pid.kp, pid.ki, pid.kd) == (1.0, 0.5, 0.25)
+    assert isinstance(create_strategy(None), HysteresisStrategy)
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.hardware import real
+from app.hardware.discovery import SensorDiscovery
+from app.hardware.real import RealSensorInterface
+
+W1_SLAVE = "72 01 4b 46 7f ff 0e 10 57 : crc=57 {crc}\n72 01 4b 46 7f ff 0e 10 57 t={millidegrees}\n"
+
+
+class W1Bus:
+    """
+    A temporary w1 sysfs tree. Writing "trigger" to therm_bulk_read makes it
+    read -1 until `conversion_polls` sleeps of the reader have passed, then 1,
+    the way the kernel reports a bulk conversion in progress and done.
+    """
+
+    def __init__(self, base_dir, conversion_polls):
+        self.base_dir = base_dir
+        self.conversion_polls = conversion_polls
+        self.master = base_dir / "w1_bus_master1"
+        self.master.mkdir()
+        (self.master / "therm_bulk_read").write_text("0\n")
+        self.triggers = 0
+        self.polls_left = None
+        self.now = 0.0
+
+    def add_sensor(self, sensor_id, temperature=None, w1_slave=None):
+        device = self.base_dir / sensor_id
+        device.mkdir()
+        if temperature is not None:
+            (device / "temperature").write_text(f"{temperature}\n")
+        if w1_slave is not None:
+            (device / "w1_slave").write_text(w1_slave)
+
+    def open(self, path, mode="r", *args, **kwargs):
+        if str(path).endswith("therm_bulk_read") and "w" in mode:
+            self.triggers += 1
+            self.polls_left = self.conversion_polls
+            (self.master / "therm_bulk_read").write_text("-1\n")
+            return open("/dev/null", mode)
+        return open(path, mode, *args, **kwargs)
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        if self.polls_left is not None:
+            self.polls_left -= 1
+            if self.polls_left == 0:
+                (self.master / "therm_bulk_read").write_text("1\n")
+
+
+@pytest.fixture
+def make_sensors(tmp_path, monkeypatch):
+    """make_sensors(conversion_polls) -> (RealSensorInterface on a fresh w1 tree, its W1Bus)."""
+    # Scan the tree once; no watcher thread or modprobe
+    monkeypatch.setattr(SensorDiscovery, "start", SensorDiscovery.rescan)
+    monkeypatch.setattr(settings, "w1_base_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "w1_bulk_read", True)
+    monkeypatch.setattr(settings, "w1_bulk_read_timeout", 1.5)
+
+    def make(conversion_polls=3):
+        bus = W1Bus(tmp_path, conversion_polls)
+        monkeypatch.setattr(real, "open", bus.open, raising=False)
+        monkeypatch.setattr(real, "time", SimpleNamespace(monotonic=bus.monotonic, sleep=bus.sleep))
+        bus.add_sensor("28-000000000001", temperature=19125)
+        bus.add_sensor("28-000000000002", w1_slave=W1_SLAVE.format(crc="YES", millidegrees=20500))
+        bus.add_sensor("28-000000000003", w1_slave=W1_SLAVE.format(crc="NO", millidegrees=85000))
+        return RealSensorInterface(), bus
+
+    return make
+
+
+def test_bulk_read_waits_for_the_conversion(make_sensors):
+    sensors, bus = make_sensors(conversion_polls=3)
+
+    assert sensors.supports_bulk_read()
+    assert sensors.get_all_sensors() == ["28-000000000001", "28-000000000002", "28-000000000003"]
+    readings = sensors.read_many(["28-000000000001"])
+
+    assert readings == {"28-000000000001": 19.12}
+    assert bus.triggers == 1
+    assert bus.polls_left == 0
+    assert bus.now < settings.w1_bulk_read_timeout
+
+
+def test_falls_back_to_w1_slave_and_rejects_failed_crc(make_sensors):
+    sensors, _ = make_sensors()
+
+    readings = sensors.read_many(sensors.get_all_sensors())
+
+    assert readings == {
+        "28-000000000001": 19.12,
+        "28-000000000002": 20.5,
+        "28-000000000003": None,
+    }
+
+
+def test_bulk_conversion_times_out(make_sensors):
+    sensors, bus = make_sensors(conversion_polls=-1)
+
+    readings = sensors.read_many(["28-000000000001", "28-000000000002"])
+
+    assert (bus.master / "therm_bulk_read").read_text() == "-1\n"
+    assert settings.w1_bulk_read_timeout <= bus.now < settings.w1_bulk_read_timeout + 0.1
+    assert readings == {"28-000000000001": 19.12, "28-000000000002": 20.5}
+
+
+def test_reads_sensors_one_by_one_without_bulk_read(make_sensors, monkeypatch):
+    monkeypatch.setattr(settings, "w1_bulk_read", False)
+    sensors, bus = make_sensors()
+
+    assert not sensors.supports_bulk_read()
+    assert sensors.read_many(["28-000000000002", "28-000000000003"]) == {
+        "28-000000000002": 20.5,
+        "28-000000000003": None,
+    }
+    assert bus.triggers == 0